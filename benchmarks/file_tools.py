@@ -0,0 +1,293 @@
+"""Benchmark the file tools on large files and directories.
+
+Every file tool is run against synthetic files of growing size, and
+`list_directory` against directories of growing entry counts, reporting the ops
+per second, the peak Python memory and the bytes written per op:
+
+    python benchmarks/file_tools.py
+    python benchmarks/file_tools.py --sizes 1KB,10MB --entries 10,10k -o new.json
+    python benchmarks/file_tools.py --compare old.json
+
+The bytes written are read from `/proc/self/io`, so they're only reported on
+Linux. A tool refusing a file is reported as refused rather than timed. The file
+tools share the file cache, whose hit rate is reported last.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import itertools
+import json
+import logging
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from speech_cli.config import app_config
+from speech_cli.core.file_cache import get_file_cache
+from speech_cli.core.tools import (
+    delete_file_content,
+    insert_file_content,
+    list_directory,
+    read_file,
+    update_file_content,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = "1KB,100KB,1MB,10MB,100MB,500MB"
+DEFAULT_ENTRIES = "10,1k,10k,100k"
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+_COUNTS = {"": 1, "K": 1000, "M": 1000**2}
+_LINE = "{:08d} the quick brown fox jumps over the lazy dog, while speech builds\n"
+# Every op of a file tool is applied to this line, away from either end.
+_MARKER = "marker line"
+# Lines written at once, generating a benchmark file.
+_WRITE_BATCH = 10_000
+
+
+@dataclass
+class Result:
+    """The measurements of an op, on a file or directory of a given size."""
+
+    op: str
+    size: str
+    ops_per_sec: float | None = None
+    peak_memory: int | None = None
+    """The peak Python memory of a single op, in bytes."""
+
+    bytes_written: int | None = None
+    """The bytes written by a single op."""
+
+    refused: str | None = None
+    """The tool's error, when it refused the op."""
+
+
+def _parse(value: str, units: dict[str, int]) -> int:
+    value = value.strip().upper().removesuffix("B")
+    number = value.rstrip("".join(units))
+    return int(float(number) * units[value[len(number) :]])
+
+
+def _written_bytes() -> int | None:
+    """Return the bytes written by the process so far, or None off Linux."""
+    try:
+        io = Path("/proc/self/io").read_text(encoding="utf-8")
+    except OSError:
+        return None
+    return next(
+        int(line.split()[1]) for line in io.splitlines() if line.startswith("wchar")
+    )
+
+
+def measure(op: str, size: str, call: Callable[[], tuple[bool, str]], min_time: float):
+    """Time `call()` for at least `min_time` seconds, then trace a single call."""
+    success, message = call()
+    if not success:
+        return Result(op, size, refused=message.splitlines()[0])
+
+    runs, written = 0, _written_bytes()
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < min_time or not runs:
+        call()
+        runs += 1
+
+    bytes_written = None
+    if written is not None:
+        bytes_written = (_written_bytes() - written) // runs
+
+    tracemalloc.start()
+    try:
+        call()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Result(op, size, runs / elapsed, peak_memory, bytes_written)
+
+
+def _alternate(
+    *calls: Callable[[], tuple[bool, str]],
+) -> Callable[[], tuple[bool, str]]:
+    """Return a call running each of `calls` in turn."""
+    turns = itertools.cycle(calls)
+
+    def call() -> tuple[bool, str]:
+        return next(turns)()
+
+    return call
+
+
+def _paired(
+    first: Callable[[], tuple[bool, str]], second: Callable[[], tuple[bool, str]]
+) -> Callable[[], tuple[bool, str]]:
+    """Return a call running `first` then `second`, failing if either fails."""
+
+    def call() -> tuple[bool, str]:
+        success, message = first()
+        return second() if success else (success, message)
+
+    return call
+
+
+def make_file(path: Path, size: int) -> int:
+    """Write a file of about `size` bytes, with a marker line in its middle.
+
+    Returns:
+        int: The row of the marker line.
+
+    """
+    lines = max(3, size // len(_LINE.format(0)))
+    marker_row = lines // 2
+    with path.open("w", encoding="utf-8") as file:
+        batch = []
+        for number in range(lines):
+            line = _MARKER + "\n" if number == marker_row else _LINE.format(number)
+            batch.append(line)
+            if len(batch) == _WRITE_BATCH:
+                file.write("".join(batch))
+                batch.clear()
+        file.write("".join(batch))
+    return marker_row
+
+
+def bench_file(directory: Path, label: str, size: int, min_time: float) -> list[Result]:
+    """Benchmark the file tools on a file of `size` bytes."""
+    path = directory / f"file-{label}.txt"
+    row = make_file(path, size)
+    file = str(path)
+
+    ops = {
+        "read_file": lambda: read_file(file),
+        "read_file[rows]": lambda: read_file(file, row, row + 50),
+        "update_file_content[row]": lambda: update_file_content(file, _MARKER, row=row),
+        # Every replacement is undone by the next one, so each op changes the file.
+        "update_file_content[substring]": _alternate(
+            lambda: update_file_content(file, "MARKER", row=row, substring="marker"),
+            lambda: update_file_content(file, "marker", row=row, substring="MARKER"),
+        ),
+        # Every insert is paired with the delete of the inserted line, so the file
+        # size stays stable, whatever the iteration count.
+        "insert_file_content+delete_file_content": _paired(
+            lambda: insert_file_content(file, _MARKER, row=row),
+            lambda: delete_file_content(file, row=row),
+        ),
+    }
+    try:
+        return [measure(op, label, call, min_time) for op, call in ops.items()]
+    finally:
+        path.unlink()
+
+
+def bench_directory(
+    directory: Path, label: str, entries: int, min_time: float
+) -> list[Result]:
+    """Benchmark `list_directory` on a directory of `entries` entries, 10% dirs."""
+    path = directory / f"dir-{label}"
+    path.mkdir()
+    for number in range(entries):
+        entry = path / f"entry-{number:07d}"
+        if number % 10:
+            entry.touch()
+        else:
+            entry.mkdir()
+
+    call = functools.partial(list_directory, str(path))
+    return [measure("list_directory", label, call, min_time)]
+
+
+def report(results: list[Result], baseline: list[Result] | None = None):
+    """Print the results, with their speedup over a baseline."""
+    previous = {(result.op, result.size): result for result in baseline or []}
+    header = f"{'op':<40}{'size':>8}{'ops/sec':>12}{'peak MB':>10}{'written MB':>12}"
+    print(header + ("  vs baseline" if baseline else ""))  # noqa: T201
+
+    for result in results:
+        if result.refused:
+            line = f"{result.op:<40}{result.size:>8}  refused: {result.refused}"
+            print(line)  # noqa: T201
+            continue
+
+        written = (
+            f"{result.bytes_written / 1024**2:>12.2f}"
+            if result.bytes_written is not None
+            else f"{'-':>12}"
+        )
+        line = (
+            f"{result.op:<40}{result.size:>8}{result.ops_per_sec:>12.2f}"
+            f"{result.peak_memory / 1024**2:>10.2f}{written}"
+        )
+        if (old := previous.get((result.op, result.size))) and old.ops_per_sec:
+            line += f"  {result.ops_per_sec / old.ops_per_sec:.2f}x"
+        print(line)  # noqa: T201
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks.
+
+    Returns:
+        int: The exit code.
+
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the file tools.")
+    parser.add_argument(
+        "--sizes",
+        default=DEFAULT_SIZES,
+        help=f"comma separated file sizes (default: {DEFAULT_SIZES})",
+    )
+    parser.add_argument(
+        "--entries",
+        default=DEFAULT_ENTRIES,
+        help=f"comma separated directory entry counts (default: {DEFAULT_ENTRIES})",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=1.0,
+        help="minimum time spent timing every op, in seconds (default: 1)",
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="write the results to this JSON file"
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="compare to the results of an earlier run"
+    )
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.compare:
+        data = json.loads(args.compare.read_text(encoding="utf-8"))
+        baseline = [Result(**result) for result in data]
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix="speech-bench-") as directory:
+        for label in filter(None, args.sizes.split(",")):
+            size = _parse(label, _UNITS)
+            results += bench_file(Path(directory), label, size, args.min_time)
+        for label in filter(None, args.entries.split(",")):
+            entries = _parse(label, _COUNTS)
+            results += bench_directory(Path(directory), label, entries, args.min_time)
+
+    report(results, baseline)
+    stats = get_file_cache(app_config.file_cache_mb).stats()
+    print(  # noqa: T201
+        f"\nfile cache: {stats['hits']} hits, {stats['misses']} misses,"
+        f" {stats['hit_rate']:.1%} hit rate"
+    )
+    if args.output:
+        args.output.write_text(
+            json.dumps([asdict(result) for result in results], indent=2),
+            encoding="utf-8",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
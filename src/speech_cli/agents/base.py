@@ -2,19 +2,36 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import traceback
+import uuid
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Annotated
 
-from langchain_core.messages import AnyMessage, HumanMessage
-from langgraph.checkpoint.memory import InMemorySaver
+from langchain_core.messages import (
+    AIMessageChunk,
+    AnyMessage,
+    HumanMessage,
+    message_chunk_to_message,
+)
+from langchain_core.messages.tool import tool_call_chunk
+from langchain_core.messages.utils import count_tokens_approximately
+from langgraph.config import get_stream_writer
+from langgraph.constants import TAG_NOSTREAM
 from langgraph.graph import StateGraph, add_messages
 from langgraph.types import Command
 from pydantic import BaseModel, Field
 
-from speech_cli.core.llm import LLM
-from speech_cli.core.utils import connected_to_internet
+from speech_cli.config import app_config
+from speech_cli.core.checkpoint import SQLiteSaver
+from speech_cli.core.context import ContextManager
+from speech_cli.core.health import CircuitOpenError
+from speech_cli.core.hlc import HLCError
+from speech_cli.core.llm import LLM, step_kind
+from speech_cli.core.response_cache import get_response_cache, request_key
+from speech_cli.core.tracing import TraceHandler, get_trace_exporter
+from speech_cli.core.workdir import START_DIRECTORY
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator, Callable, Hashable
@@ -22,9 +39,8 @@ if TYPE_CHECKING:
     from typing import Any
 
     from langchain_core.language_models.base import LanguageModelInput
-    from langchain_core.messages import BaseMessage
+    from langchain_core.messages import AIMessage, BaseMessage
     from langchain_core.runnables import Runnable
-    from langgraph.checkpoint.memory import InMemorySaver
     from langgraph.graph.state import CompiledStateGraph
 
 logger = logging.getLogger(__name__)
@@ -66,8 +82,21 @@ class BaseAgent(ABC):
     overall_state = None
     tools: list[Callable] | None = None
 
+    context_budget: int = 32_000
+    """The token budget of the messages sent to the llm, overridable per agent
+    through the `context_budgets` config."""
+
+    stream_tokens: bool = True
+    """Whether the llm response tokens are streamed to the user, turned off for
+    agents running concurrently, whose responses would interleave."""
+
+    cache_responses: bool = True
+    """Whether the agent's llm responses are cached, when the response cache is
+    enabled. Can be overridden through the `response_cache_agents` config."""
+
     def __init_subclass__(
         cls: BaseAgent,
+        *,
         sub_agent: bool = False,
         start_node: bool = False,
         next_node: str | Callable | None = None,
@@ -89,6 +118,10 @@ class BaseAgent(ABC):
 
         """
         super().__init_subclass__()
+        if getattr(cls.nodes, "__isabstractmethod__", False):
+            # Abstract agents, like BaseSubAgent, have no graph to build.
+            return
+
         builder = StateGraph(cls.overall_state)
 
         for node_name, node in cls.nodes():
@@ -117,18 +150,25 @@ class BaseAgent(ABC):
 
         if not sub_agent:
             cls._add_to_agents_graph(
-                graph_name, start_node, next_node, graph, path_map, end_node
+                graph_name,
+                graph,
+                start_node=start_node,
+                next_node=next_node,
+                path_map=path_map,
+                end_node=end_node,
             )
-        else:
-            return graph
+        elif not private_state:
+            # Sub agents are invoked by other agents, through their graph.
+            cls.graph = graph
 
     @classmethod
     def _add_to_agents_graph(
         cls,
         name: str,
+        graph: CompiledStateGraph | Callable,
+        *,
         start_node: bool,
         next_node: str | Callable | None,
-        graph: CompiledStateGraph | Callable,
         path_map: dict[Hashable, str] | list[str] | None,
         end_node: bool,
     ):
@@ -169,46 +209,146 @@ class BaseAgent(ABC):
         ...
 
     @classmethod
-    async def llm_invoke(cls, messages) -> BaseMessage:
-        """Asynchronously invoke the right llm for the agent."""
-        if not connected_to_internet():
-            raise ConnectionError("User is not connected to the internet.")
+    async def llm_invoke(
+        cls,
+        messages,
+        on_chunk: Callable[[AIMessageChunk], None] | None = None,
+    ) -> BaseMessage:
+        """Asynchronously invoke the right llm for the agent.
+
+        The messages are first compacted to fit the agent's context budget, and sent
+        to the model routed to the agent, or to this step of the agent. When the
+        response cache is enabled, an identical earlier request is answered from the
+        cache. The static prefix of the system message is marked for the provider's
+        prompt caching. Calls go through the provider retry scheduler, which rate
+        limits, retries and tracks the provider health.
+
+        Args:
+            messages (list[BaseMessage]): The messages to send to the llm.
+            on_chunk (Callable, optional): Called with every chunk of the response,
+                which is then streamed.
 
-        try:
-            response = cls.llm.ainvoke(messages)
-        except Exception as err:
-            logger.debug("An error, %s occurred, now retrying after 60s.", err)
-            # Wait for 60 secs before retrying, just in case, we ran into usage limit
-            await asyncio.sleep(60)
-            response = cls.llm.ainvoke(messages)
+        """
+        budget = app_config.context_budgets.get(cls.__name__, cls.context_budget)
+        messages = ContextManager(budget).compact(messages)
+
+        step = step_kind(messages)
+        route = LLM.route(cls, step)
+
+        cache = key = None
+        # A recorded or replayed run skips the cache, to record every response.
+        if (
+            LLM.cassette is None
+            and app_config.response_cache
+            and app_config.response_cache_agents.get(cls.__name__, cls.cache_responses)
+        ):
+            cache = get_response_cache(app_config.response_cache_max_mb)
+            key = request_key(route.model_params(), LLM.tool_schemas(cls), messages)
+            if response := await asyncio.to_thread(cache.get, key, cls.__name__):
+                cls._replay(response, on_chunk)
+                return response
+
+        messages = route.mark_cacheable(messages)
+        # The metadata names the agent, route and step in the traces.
+        llm = LLM.bind(route.llm, cls).with_config(
+            tags=[] if cls.stream_tokens else [TAG_NOSTREAM],
+            metadata={"agent": cls.__name__, "route": route.name, "step": step},
+        )
+
+        async def call() -> BaseMessage:
+            if on_chunk is None:
+                return await llm.ainvoke(messages)
+
+            response = None
+            async for chunk in llm.astream(messages):
+                on_chunk(chunk)
+                response = chunk if response is None else response + chunk
+            return message_chunk_to_message(response)
+
+        response = await route.call(
+            call, estimated_tokens=count_tokens_approximately(messages)
+        )
+        if cache:
+            await asyncio.to_thread(cache.put, key, response)
+        return response
 
-        return await response
+    @classmethod
+    def _replay(
+        cls,
+        response: AIMessage,
+        on_chunk: Callable[[AIMessageChunk], None] | None,
+    ) -> None:
+        """Stream a cached response, as a single chunk, like a live one."""
+        chunk = AIMessageChunk(
+            content=response.content,
+            id=response.id,
+            tool_call_chunks=[
+                tool_call_chunk(
+                    name=tool_call["name"],
+                    args=json.dumps(tool_call["args"]),
+                    id=tool_call["id"],
+                    index=index,
+                )
+                for index, tool_call in enumerate(response.tool_calls)
+            ],
+        )
+        if on_chunk:
+            on_chunk(chunk)
+        if cls.stream_tokens and (writer := get_stream_writer()):
+            writer((chunk,))
 
 
 class AgentsGraph:
-    """The agents workflow graph."""
+    """The agents workflow graph.
+
+    The compiled graph is shared, while every instance runs on its own checkpoint
+    thread, so several sessions can stream concurrently on the same event loop.
+
+    Checkpoints are persisted in the project `.speech/checkpoints.db`, so an
+    interrupted build can be resumed with the `/continue` command.
+    """
+
+    CONTINUE_COMMAND = "/continue"
 
     builder = StateGraph(AgentsGraphState, input_schema=BaseInputSchema)
-    config: dict[str, Any] | None = {
-        "recursion_limit": 500,
-        "configurable": {"thread_id": "agents_graph_1"},
-    }
-    checkpointer = InMemorySaver()
+    recursion_limit: int = 500
+    checkpointer: SQLiteSaver | None = None
     graph: CompiledStateGraph | None = None
 
     def __new__(cls, *_args, **_kwargs):
-        """Build the agents graph once and store on the class."""
+        """Build the agents graph, and open its checkpointer, once on the class."""
         if not cls.graph:
             logger.debug("Building agents graph again..")
+            cls.checkpointer = SQLiteSaver(
+                START_DIRECTORY / ".speech" / "checkpoints.db",
+                max_checkpoints=app_config.max_checkpoints,
+                max_threads=app_config.max_checkpoint_threads,
+            )
             cls.graph = cls.builder.compile(checkpointer=cls.checkpointer)
 
         return super().__new__(cls)
 
-    def __init__(self, user_input: str | list[dict[str, Any]]):
+    def __init__(
+        self, user_input: str | list[dict[str, Any]], thread_id: str | None = None
+    ):
         self.user_input = user_input
+        self.thread_id = thread_id or self.new_thread_id()
         self.error: str | None = None
         self.interrupted = False
 
+    @staticmethod
+    def new_thread_id() -> str:
+        """Create a unique checkpoint thread id, for a new session."""
+        return f"agents_graph_{uuid.uuid4().hex}"
+
+    @property
+    def config(self) -> dict[str, Any]:
+        """The graph config for this session's thread."""
+        return {
+            "recursion_limit": self.recursion_limit,
+            "configurable": {"thread_id": self.thread_id},
+        }
+
     def __enter__(self):
         """Return the agent."""
         return self
@@ -219,25 +359,39 @@ class AgentsGraph:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ):
-        """Capture error if it exists."""
-        if exc_val:
-            if isinstance(exc_val, ConnectionError):
-                self.error = (
-                    "Connection error, make sure you are connected to the internet!"
-                )
-            elif isinstance(exc_val, Exception):
-                self.error = "Unknown error encountered, please try again!"
-            logger.error(
-                "Exception occurred: %s",
-                "".join(traceback.format_exception(exc_type, value=exc_val, tb=exc_tb)),
+        """Capture the error if it exists.
+
+        Only errors are captured, a cancellation or an interrupt propagates to the
+        caller.
+        """
+        if not isinstance(exc_val, Exception):
+            return False
+        if isinstance(exc_val, CircuitOpenError):
+            self.error = (
+                "The model provider is currently unavailable, please try again shortly!"
             )
-            return True
+        elif isinstance(exc_val, ConnectionError):
+            self.error = (
+                "Connection error, make sure you are connected to the internet!"
+            )
+        elif isinstance(exc_val, HLCError):
+            self.error = str(exc_val)
+        else:
+            self.error = "Unknown error encountered, please try again!"
+        logger.error(
+            "Exception occurred: %s",
+            "".join(traceback.format_exception(exc_type, value=exc_val, tb=exc_tb)),
+        )
+        return True
 
     @property
-    def _graph_input(self) -> dict[str, list] | Command:
+    def _graph_input(self) -> dict[str, list] | Command | None:
         """Build the input for initiating graph execution from user input."""
         logger.debug("Building graph input, %s", self.user_input)
-        if isinstance(self.user_input, str):
+        if self.user_input == self.CONTINUE_COMMAND:
+            # Resume from the last checkpoint.
+            return None
+        elif isinstance(self.user_input, str):
             return {"messages": [HumanMessage(content=self.user_input)]}
         elif isinstance(self.user_input, list):
             return Command(resume=self.user_input)
@@ -246,6 +400,9 @@ class AgentsGraph:
     async def run(self) -> AsyncGenerator[Any, Any, None]:
         """Async entry point to every agent.
 
+        With the `tracing` config, the run is traced to the project traces file, see
+        `TraceHandler`.
+
         Args:
             graph_input (str | list[dict[str, Any]]): The input to the graph.
 
@@ -254,9 +411,18 @@ class AgentsGraph:
                 interrupt.
 
         """
+        if self.user_input == self.CONTINUE_COMMAND and not await self._continue():
+            self.error = "There is no interrupted build to continue."
+            return
+
+        config = self.config
+        if app_config.tracing:
+            exporter = get_trace_exporter(app_config.tracing_max_mb)
+            config["callbacks"] = [TraceHandler(self.thread_id, exporter)]
+
         async for _namespace, _stream_mode, chunk in self.graph.astream(
             self._graph_input,
-            config=self.config,
+            config=config,
             stream_mode=["messages", "custom"],
             subgraphs=True,
         ):
@@ -268,7 +434,30 @@ class AgentsGraph:
             )
             yield chunk[0]
 
-        interrupts = self.graph.get_state(self.config).interrupts
+        interrupts = (await self.graph.aget_state(self.config)).interrupts
         if len(interrupts) > 0:
             self.interrupted = True
             yield interrupts[0]
+
+    async def _continue(self) -> bool:
+        """Switch to this session, or the latest thread, with an interrupted build.
+
+        Returns:
+            bool: Whether there's an interrupted build to continue.
+
+        """
+        thread_ids = await asyncio.to_thread(self.checkpointer.recent_thread_ids)
+        # Prefer this session's own thread.
+        if self.thread_id in thread_ids:
+            thread_ids.remove(self.thread_id)
+            thread_ids.insert(0, self.thread_id)
+
+        for thread_id in thread_ids:
+            config = {**self.config, "configurable": {"thread_id": thread_id}}
+
+            if (await self.graph.aget_state(config)).next:
+                logger.debug("Continuing the build of thread %s.", thread_id)
+                self.thread_id = thread_id
+                return True
+
+        return False
@@ -3,11 +3,11 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from langchain_core.messages import SystemMessage
 from langgraph.graph import START
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 
 from speech_cli.core.system_messages import system_messages
+from speech_cli.core.tool_executor import ToolExecutor
 from speech_cli.core.tools import transfer_to_generator
 
 from .base import BaseAgent, BaseState
@@ -32,7 +32,9 @@ class Chat(BaseAgent, start_node=True):
     overall_state = ChatOverallState
     tools = [transfer_to_generator]
 
-    _system_message = [SystemMessage(content=system_messages.chat)]
+    context_budget = 16_000
+
+    _system_message = [system_messages.build("chat")]
 
     @classmethod
     async def llm_node(cls, state: ChatOverallState) -> ChatOverallState:
@@ -48,7 +50,7 @@ class Chat(BaseAgent, start_node=True):
     @classmethod
     def nodes(cls) -> list[tuple[str, Callable]]:
         """Class method for retrieving agent nodes."""
-        return [("chat", cls.llm_node), ("tools", ToolNode(cls.tools))]
+        return [("chat", cls.llm_node), ("tools", ToolExecutor(cls.tools))]
 
     @classmethod
     def static_edges(cls) -> list[tuple[str | list[str], str]]:
@@ -3,11 +3,13 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from langchain_core.messages import SystemMessage
+from langgraph.config import get_config
 from langgraph.graph import START
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 
+from speech_cli.core.hlc_stream import HLCPipeline
 from speech_cli.core.system_messages import system_messages
+from speech_cli.core.tool_executor import ToolExecutor
 from speech_cli.core.tools import generator_write_file as write_file
 
 from .base import AgentsGraphState, BaseAgent, BaseState
@@ -28,13 +30,19 @@ class GeneratorOverallState(BaseState):
     pass
 
 
-class Generator(BaseAgent, next_node="Translator", private_state=True):
-    """Agent for generating hlc code from natural language."""
+class Generator(BaseAgent, private_state=True):
+    """Agent for generating hlc code from natural language.
+
+    The Generator runs alongside the Translator, streaming the HLC to it through
+    the thread's pipeline, so translation starts while the HLC is generated.
+    """
 
     overall_state = GeneratorOverallState
     tools = [write_file]
 
-    _system_message = [SystemMessage(content=system_messages.generator)]
+    context_budget = 32_000
+
+    _system_message = [system_messages.build("generator")]
 
     @classmethod
     async def llm_node(cls, state: GeneratorOverallState) -> GeneratorOverallState:
@@ -42,20 +50,27 @@ class Generator(BaseAgent, next_node="Translator", private_state=True):
         logger.debug("Entering the Generator agent...")
 
         messages = cls._system_message + state.messages
+        thread_id = get_config()["configurable"]["thread_id"]
 
-        response: AIMessage = await cls.llm_invoke(messages)
+        response: AIMessage = await cls.llm_invoke(
+            messages, on_chunk=HLCPipeline.get_or_open(thread_id).feed
+        )
 
         return {"messages": [response]}
 
     @classmethod
     async def call_generator(cls, state: AgentsGraphState):
         """Isolation unit for the generator agent."""
-        await cls.graph.ainvoke({"messages": state.summary})
+        thread_id = get_config()["configurable"]["thread_id"]
+        try:
+            await cls.graph.ainvoke({"messages": state.summary})
+        finally:
+            HLCPipeline.get_or_open(thread_id).close()
 
     @classmethod
     def nodes(cls) -> list[tuple[str, Callable]]:
         """Class method for retrieving agent nodes."""
-        return [("generator", cls.llm_node), ("tools", ToolNode(cls.tools))]
+        return [("generator", cls.llm_node), ("tools", ToolExecutor(cls.tools))]
 
     @classmethod
     def static_edges(cls) -> list[tuple[str | list[str], str]]:
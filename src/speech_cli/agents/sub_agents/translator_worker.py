@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from langgraph.graph import START
+from langgraph.prebuilt import tools_condition
+
+from speech_cli.agents.translator_agent import Translator, TranslatorOverallState
+from speech_cli.core.system_messages import system_messages
+from speech_cli.core.tool_executor import ToolExecutor
+from speech_cli.core.tools import change_directory
+
+from .base import BaseSubAgent
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class TranslatorWorker(BaseSubAgent):
+    """Sub agent translating a single HLC subtree, alongside other workers."""
+
+    overall_state = TranslatorOverallState
+    # Workers share the process working directory, so they can't change it.
+    tools = [tool for tool in Translator.tools if tool is not change_directory]
+
+    context_budget = 64_000
+    stream_tokens = False
+
+    _system_message = [
+        system_messages.build("translator", "translator_worker", system_info=True)
+    ]
+
+    @classmethod
+    async def llm_node(cls, state: TranslatorOverallState) -> TranslatorOverallState:
+        """Graph reasoning (llm) node."""
+        logger.debug("TranslatorWorker state: %r", state)
+        messages = cls._system_message + state.messages
+
+        response = await cls.llm_invoke(messages)
+
+        return {"messages": [response]}
+
+    @classmethod
+    def nodes(cls) -> list[tuple[str, Callable]]:
+        """Class method for retrieving agent nodes."""
+        return [("translator_worker", cls.llm_node), ("tools", ToolExecutor(cls.tools))]
+
+    @classmethod
+    def static_edges(cls) -> list[tuple[str | list[str], str]]:
+        """Class method for retrieving agent static edges."""
+        return [(START, "translator_worker"), ("tools", "translator_worker")]
+
+    @classmethod
+    def conditional_edges(cls) -> list[tuple[str, Any]]:
+        """Class method for retrieving agent conditional edges."""
+        return [("translator_worker", tools_condition)]
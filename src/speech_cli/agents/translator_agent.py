@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import TYPE_CHECKING
 
-from langchain_core.messages import SystemMessage
+from langgraph.config import get_config
 from langgraph.graph import START
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 
+from speech_cli.config import app_config
 from speech_cli.core.decorators import add_human_in_the_loop
+from speech_cli.core.hlc import HLCError, TranslationPlan
+from speech_cli.core.hlc_stream import HLCPipeline, HLCStreamParser
+from speech_cli.core.manifest import BuildManifest
+from speech_cli.core.subgraphs import OrderedSubgraphs, SubgraphSkippedError
 from speech_cli.core.system_messages import system_messages
+from speech_cli.core.tool_executor import ToolExecutor
 from speech_cli.core.tools import (
+    apply_patch,
     change_directory,
     delete_file_content,
     get_command_history,
@@ -17,6 +25,8 @@ from speech_cli.core.tools import (
     insert_file_content,
     list_directory,
     read_file,
+    read_files,
+    read_tool_output,
     run_javascript_test,
     run_python_test,
     terminal_use,
@@ -24,15 +34,26 @@ from speech_cli.core.tools import (
     update_file_content,
 )
 from speech_cli.core.utils import read_hlc_file
+from speech_cli.core.workdir import project_root
 
-from .base import AgentsGraphState, BaseAgent, BaseState
+from .base import AgentsGraph, AgentsGraphState, BaseAgent, BaseState
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncIterator, Callable
     from typing import Any
 
+    from langgraph.graph.state import CompiledStateGraph
+
+    from speech_cli.core.hlc import TranslationUnit
+    from speech_cli.core.hlc_stream import HLCEvent
+
 logger = logging.getLogger(__name__)
 
+_DRAFT_NOTE = (
+    "\n\nA draft of this component was already implemented, from an earlier"
+    " version of its specification. Update it to the specification above."
+)
+
 
 class TranslatorOverallState(BaseState):
     """Translator overall state."""
@@ -73,17 +94,22 @@ class Translator(BaseAgent, end_node=True, private_state=True):
                 "allow_ignore": True,
             },
         ),
+        apply_patch,
         change_directory,
         get_command_history,
         get_current_directory,
         insert_file_content,
         list_directory,
         read_file,
+        read_files,
+        read_tool_output,
         update_file_content,
         translator_write_file,
     ]
 
-    _system_message = [SystemMessage(content=system_messages.translator)]
+    context_budget = 64_000
+
+    _system_message = [system_messages.build("translator", system_info=True)]
 
     @classmethod
     async def llm_node(cls, state: TranslatorOverallState) -> TranslatorOverallState:
@@ -97,13 +123,60 @@ class Translator(BaseAgent, end_node=True, private_state=True):
 
     @classmethod
     async def call_translator(cls, _state: AgentsGraphState):
-        """Isolation unit for the translator agent."""
-        await cls.graph.ainvoke({"messages": read_hlc_file()})
+        """Isolation unit for the translator agent.
+
+        The translator runs alongside the generator, and translates the HLC while
+        it's still streamed. HLC documents whose top level object links several
+        subtrees are translated in three steps. The translator sets up the project
+        foundation, translator workers then implement the subtrees concurrently, as
+        soon as each one is generated, and the translator finally integrates them.
+
+        Every build is recorded in a manifest. When the foundation is unchanged
+        since the last build, only the added or changed subtrees are translated
+        again, and the removed ones are cleaned up by the integration pass.
+        """
+        thread_id = get_config()["configurable"]["thread_id"]
+        manifest = BuildManifest.load(
+            project_root() / ".speech" / "build_manifest.json"
+        )
+
+        try:
+            if await cls._generator_running(thread_id):
+                events = HLCPipeline.get_or_open(thread_id).events()
+            else:
+                # E.g. a resumed build, once the HLC is written.
+                events = cls._file_events()
+
+            await _StreamedBuild(cls, manifest).run(events)
+        finally:
+            HLCPipeline.discard(thread_id)
+
+    @staticmethod
+    async def _generator_running(thread_id: str) -> bool:
+        """Check if the generator is still running, alongside the translator."""
+        state = await AgentsGraph.graph.aget_state(
+            {"configurable": {"thread_id": thread_id}}
+        )
+        return any(
+            task.name == "Generator" and task.result is None for task in state.tasks
+        )
+
+    @staticmethod
+    async def _file_events() -> AsyncIterator[HLCEvent]:
+        """Yield the parts of the written HLC file."""
+        try:
+            events = HLCStreamParser().feed(read_hlc_file() or "")
+        except HLCError as err:
+            logger.debug("Can't parse the HLC file: %s", err)
+            return
+
+        for event in events:
+            yield event
 
     @classmethod
     def nodes(cls) -> list[tuple[str, Callable]]:
         """Class method for retrieving agent nodes."""
-        return [("translator", cls.llm_node), ("tools", ToolNode(cls.tools))]
+        return [("translator", cls.llm_node), ("tools", ToolExecutor(cls.tools))]
 
     @classmethod
     def static_edges(cls) -> list[tuple[str | list[str], str]]:
@@ -114,3 +187,255 @@ class Translator(BaseAgent, end_node=True, private_state=True):
     def conditional_edges(cls) -> list[tuple[str, Any]]:
         """Class method for retrieving agent conditional edges."""
         return [("translator", tools_condition)]
+
+
+class _StreamedBuild:
+    """A build of the HLC, translating its parts as they're streamed.
+
+    Every subgraph is invoked through the same `OrderedSubgraphs`, in the order of
+    the HLC, so a build resumed from the written HLC file reuses the checkpoints
+    of the interrupted one.
+
+    Args:
+        translator (type[Translator]): The translator agent.
+        manifest (BuildManifest): The manifest of the last build.
+
+    """
+
+    def __init__(self, translator: type[Translator], manifest: BuildManifest):
+        self.translator = translator
+        self.manifest = manifest
+        self.subgraphs = OrderedSubgraphs(max(1, app_config.translator_workers))
+        self.plan: TranslationPlan | None = None
+        self.full = True
+        self.foundation: asyncio.Task | None = None
+        # The units of a full build, waiting for the foundation to be started.
+        self.pending: list[TranslationUnit] = []
+        # The last dispatched version of every unit, with its worker.
+        self.units: dict[str, tuple[TranslationUnit, asyncio.Task]] = {}
+        self.tasks: list[asyncio.Task] = []
+
+    async def run(self, events: AsyncIterator[HLCEvent]) -> None:
+        """Translate the streamed HLC, reconciled with the written HLC file."""
+        try:
+            await self._run(events)
+        except BaseException:
+            for task in self.tasks:
+                task.cancel()
+            raise
+
+    async def _run(self, events: AsyncIterator[HLCEvent]) -> None:
+        streamed = await self._stream(events)
+        hlc = read_hlc_file() or streamed
+        if not hlc.strip():
+            await self._gather()
+            raise HLCError("No HLC was generated to translate.")
+
+        try:
+            final = TranslationPlan.from_hlc(hlc)
+        except HLCError as err:
+            # Let the translator report the malformed HLC.
+            logger.debug("Translating the HLC sequentially: %s", err)
+            await self._gather()
+            await self._invoke(self.translator.graph, hlc)
+            return
+
+        # The streamed HLC may fall short of the written one, e.g. when the
+        # generator retried its response.
+        self._replan(final)
+        if self.foundation is None:
+            self.pending = []
+        for unit in final.units:
+            self._reconcile(unit)
+
+        if self.full and self.foundation is None:
+            # A single component is translated in a single pass, which produced
+            # both the foundation and the component's files.
+            state = await self._invoke(self.translator.graph, hlc)
+            self.manifest.record_foundation(final, state["messages"])
+            for unit in final.units:
+                self.manifest.record_unit(unit, state["messages"])
+            self.manifest.save()
+            return
+
+        await self._integrate(final)
+
+    async def _stream(self, events: AsyncIterator[HLCEvent]) -> str:
+        """Dispatch the units of the streamed HLC, and return the streamed HLC."""
+        entry_level, streamed = None, ""
+        async for kind, value in events:
+            if kind == "entry_level":
+                entry_level = value
+            elif kind == "top_level" and entry_level is not None:
+                self._start(TranslationPlan(entry_level, value))
+            elif kind == "linker" and self.plan is not None:
+                try:
+                    self._add(self.plan.add_unit(value))
+                except HLCError as err:
+                    logger.debug("Skipping a streamed HLC part: %s", err)
+            elif kind == "done":
+                streamed = value
+        return streamed
+
+    async def _integrate(self, final: TranslationPlan) -> None:
+        """Wait for the workers, then wire the translated units together."""
+        foundation, states = await self._gather()
+        if foundation:
+            self.manifest.record_foundation(self.plan, foundation["messages"])
+
+        reports = {}
+        for unit in final.units:
+            if unit.name in states:
+                messages = states[unit.name]["messages"]
+                self.manifest.record_unit(unit, messages)
+                reports[unit.name] = messages[-1].text()
+        removed = self.manifest.record_removed(self.manifest.removed_units(final))
+
+        if not (self.full or reports or removed):
+            logger.debug("The HLC is unchanged since the last build.")
+            return
+
+        # The manifest is only saved once the build completes, so an interrupted
+        # build makes the same calls when resumed.
+        await self._invoke(
+            self.translator.graph,
+            final.integration_brief(reports, removed, incremental=not self.full),
+        )
+        self.manifest.save()
+
+    def _start(self, plan: TranslationPlan) -> None:
+        self.plan = plan
+        self.full = self.manifest.foundation_changed(plan)
+        if not self.full:
+            logger.debug("The HLC foundation is unchanged, rebuilding its changes.")
+
+    def _replan(self, final: TranslationPlan) -> None:
+        """Switch to the plan of the written HLC, when its foundation was changed."""
+        if self.plan is None:
+            self._start(final)
+            return
+        if self.plan.foundation_spec() == final.foundation_spec():
+            return
+
+        logger.debug("The HLC foundation changed once written.")
+        full, drafts = self.full, [task for _unit, task in self.units.values()]
+        self._start(final)
+        if full:
+            # A full build covers the changes, once its foundation is updated.
+            self.full = True
+            if self.foundation is not None:
+                self.foundation = self._task(
+                    self.translator.graph,
+                    final.foundation_brief() + _DRAFT_NOTE,
+                    [self.foundation],
+                )
+        elif self.full and drafts:
+            # The units rebuilt on the foundation of the last build are drafts now,
+            # so the new foundation is set up after them, and every unit again.
+            self.units = {}
+            self.foundation = self._task(
+                self.translator.graph, final.foundation_brief(), drafts
+            )
+
+    def _add(self, unit: TranslationUnit) -> None:
+        """Dispatch a new unit, once the foundation is started for a full build."""
+        if not self.full:
+            changes = self.manifest.unit_changes(unit)
+            if changes is not None:
+                logger.debug("Rebuilding the HLC subtree %s: %s", unit.name, changes)
+                self._dispatch(
+                    unit, self.manifest.rebuild_note(unit, changes) if changes else ""
+                )
+            return
+
+        # The foundation only runs once the HLC is known to have several
+        # components, as a single one is translated in a single pass.
+        self.pending.append(unit)
+        if self.foundation is None and len(self.pending) >= 2:  # noqa: PLR2004
+            self.foundation = self._task(
+                self.translator.graph, self.plan.foundation_brief()
+            )
+        if self.foundation is not None:
+            for pending in self.pending:
+                self._dispatch(pending)
+            self.pending = []
+
+    def _reconcile(self, unit: TranslationUnit) -> None:
+        """Dispatch a unit of the written HLC, unless streamed identically."""
+        if unit.name not in self.units:
+            self._add(unit)
+            return
+
+        draft, task = self.units[unit.name]
+        if draft.linker != unit.linker:
+            logger.debug("The HLC subtree %s changed once written.", unit.name)
+            self._dispatch(unit, _DRAFT_NOTE, after=[task])
+
+    def _dispatch(
+        self,
+        unit: TranslationUnit,
+        note: str = "",
+        after: list[asyncio.Task] | None = None,
+    ) -> None:
+        """Translate a unit with a worker, after the units it depends on."""
+        from .sub_agents.translator_worker import TranslatorWorker
+
+        wait_for = list(after or [])
+        if self.foundation is not None:
+            wait_for.append(self.foundation)
+        wait_for.extend(
+            self.units[name][1] for name in unit.depends_on if name in self.units
+        )
+
+        logger.debug("Translating the HLC subtree %s.", unit.name)
+        brief = unit.brief(self.plan.entry_level, self.plan.top_level) + note
+        self.units[unit.name] = (
+            unit,
+            self._task(TranslatorWorker.graph, brief, wait_for),
+        )
+
+    def _task(
+        self,
+        graph: CompiledStateGraph,
+        brief: str,
+        wait_for: list[asyncio.Task] | None = None,
+    ) -> asyncio.Task:
+        # Tasks start in creation order, which keeps the subgraphs ordered.
+        task = asyncio.create_task(
+            self.subgraphs.invoke(graph, {"messages": brief}, wait_for or [])
+        )
+        self.tasks.append(task)
+        return task
+
+    async def _invoke(self, graph: CompiledStateGraph, brief: str) -> dict[str, Any]:
+        return await self.subgraphs.invoke(graph, {"messages": brief})
+
+    async def _gather(
+        self,
+    ) -> tuple[dict[str, Any] | None, dict[str, dict[str, Any]]]:
+        """Wait for every worker, then raise the first failure, if any.
+
+        Every worker runs to completion, or to an interrupt, before the failure is
+        raised. Since the workers are checkpointed, resuming the build only re-runs
+        the unfinished ones.
+
+        Returns:
+            tuple: The final state of the foundation pass, and of every unit.
+
+        """
+        results = await asyncio.gather(*self.tasks, return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise next(
+                (
+                    error
+                    for error in errors
+                    if not isinstance(error, SubgraphSkippedError)
+                ),
+                errors[0],
+            )
+
+        foundation = self.foundation.result() if self.foundation else None
+        return foundation, {
+            name: task.result() for name, (_unit, task) in self.units.items()
+        }
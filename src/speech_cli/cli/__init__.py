@@ -1,3 +1,4 @@
+import sys
 from logging.config import dictConfig
 
 from speech_cli.config import LOGGING_CONFIG
@@ -10,8 +11,20 @@ from .cli import SpeechCLI  # noqa: E402
 def main():
     """Instantiate and run the speech cli app.
 
-    Returns SpeechCLI class for textual run command in dev mode support.
+    Returns SpeechCLI class for textual run command in dev mode support. `speech run`
+    builds briefs headlessly instead, see `speech run --help`, and `speech trace`
+    breaks a traced build's time down, see `speech trace --help`.
     """
+    if sys.argv[1:2] == ["run"]:
+        from .headless import main as run
+
+        sys.exit(run(sys.argv[2:]))
+
+    if sys.argv[1:2] == ["trace"]:
+        from .trace import main as trace
+
+        sys.exit(trace(sys.argv[2:]))
+
     SpeechCLI().run()
 
 
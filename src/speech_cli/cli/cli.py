@@ -3,30 +3,22 @@ from __future__ import annotations
 import logging
 from typing import TYPE_CHECKING
 
-from langchain_core.messages import AIMessageChunk, ToolMessage
-from langgraph.types import Interrupt
-from textual import work
 from textual.app import App, SystemCommand
-from textual.containers import Container, Horizontal, VerticalScroll
+from textual.containers import Container
 from textual.screen import Screen
-from textual.widgets import Footer, Header, Input, Static
+from textual.widgets import ContentSwitcher, Footer, Header, Input
 from textual_autocomplete import AutoComplete
 
-from speech_cli.agents import AgentsGraph
 from speech_cli.config import api_config
-from speech_cli.core.tool_call import ToolCall
 
 from .screens import APIConfigModal, SettingsScreen
-from .widgets import AgentResponse
+from .widgets import ChatSession
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
-    from typing import Any
 
     from textual.app import ComposeResult
 
-    from .widgets import ShowGraphInterrupt
-
 
 logger = logging.getLogger(__name__)
 
@@ -35,15 +27,21 @@ class SpeechCLI(App):
     """Speech CLI tool."""
 
     SCREENS = {"settings": SettingsScreen}
-    BINDINGS = [("d", "toggle_dark", "Toggle dark mode")]
+    BINDINGS = [
+        ("d", "toggle_dark", "Toggle dark mode"),
+        ("ctrl+n", "new_session", "New session"),
+        ("ctrl+t", "next_session", "Next session"),
+        ("escape", "stop_session", "Stop"),
+    ]
     CSS_PATH = "styles.tcss"
 
-    _current_agent_response_widget: AgentResponse | None = None
+    _sessions_count: int = 0
 
     async def on_mount(self) -> None:
         """Display app title and sub-title on app mount."""
         self.title = "Speech CLI"
-        self.sub_title = "From Natural Language to Code"
+
+        await self.action_new_session()
 
         if not api_config.configured:
             await self.push_screen(APIConfigModal())
@@ -53,8 +51,8 @@ class SpeechCLI(App):
         yield Header()
 
         with Container():
-            self.chat_area = VerticalScroll(id="chatArea")
-            yield self.chat_area
+            self.sessions = ContentSwitcher(id="sessions")
+            yield self.sessions
 
             self.chat_box = Input(
                 id="chatBox", placeholder="What are we building?", type="text"
@@ -73,6 +71,46 @@ class SpeechCLI(App):
         """Adding a settings command."""
         yield from super().get_system_commands(screen)
         yield SystemCommand("Settings", "Manage Speech CLI settings", self.app_settings)
+        yield SystemCommand(
+            "New session", "Start a new chat session", self.action_new_session
+        )
+        yield SystemCommand(
+            "Next session", "Switch to the next chat session", self.action_next_session
+        )
+
+    @property
+    def current_session(self) -> ChatSession:
+        """The session currently displayed."""
+        return self.sessions.get_child_by_id(self.sessions.current, ChatSession)
+
+    def switch_session(self, session: ChatSession) -> None:
+        """Display a session, and only accept input if it's waiting for some."""
+        self.sessions.current = session.id
+        self.sub_title = f"From Natural Language to Code · {session.title}"
+
+        if session.busy:
+            self.chat_box.disable_messages(Input.Submitted)
+        else:
+            self.chat_box.enable_messages(Input.Submitted)
+
+    async def action_new_session(self) -> None:
+        """Start, and switch to, a new chat session."""
+        self._sessions_count += 1
+        session = ChatSession(self._sessions_count)
+        await self.sessions.mount(session)
+
+        self.switch_session(session)
+
+    def action_next_session(self) -> None:
+        """Switch to the next chat session."""
+        sessions = list(self.sessions.query_children(ChatSession))
+        index = sessions.index(self.current_session)
+
+        self.switch_session(sessions[(index + 1) % len(sessions)])
+
+    def action_stop_session(self) -> None:
+        """Stop the agents running in the current session."""
+        self.current_session.stop()
 
     def action_toggle_dark(self) -> None:
         """Toggle theme mode."""
@@ -91,48 +129,11 @@ class SpeechCLI(App):
         """Dismiss API config modal."""
         await self.pop_screen()
 
-    def update_agent_response_widget(
-        self,
-        agent_response: AIMessageChunk | ToolMessage | Interrupt | ToolCall,
-    ) -> None:
-        """Update the widget with the content."""
-        if isinstance(agent_response, AIMessageChunk):
-            if self._current_agent_response_widget.create_new_ai_message_widget:
-                # Resetting the ai message to an empty string.
-                self._current_agent_response_widget.ai_message = ""
-
-            self._current_agent_response_widget.ai_message += agent_response.content
-        elif isinstance(agent_response, ToolMessage | ToolCall):
-            self._current_agent_response_widget.tool_call_message = agent_response
-        elif isinstance(agent_response, Interrupt):
-            self._current_agent_response_widget.graph_interrupt = agent_response
-
-    @work(exclusive=True)
-    async def execute_agents(self, user_input: str | list[dict[str, Any]]):
-        """Initiate the agent workflow, by calling the agents executor.
-
-        Args:
-            user_input (str | list[dict]): The input to the agents executor.
-
-        """
-        with AgentsGraph(user_input) as graph:
-            async for agent_response in graph.run():
-                self.update_agent_response_widget(agent_response)
-                self.chat_area.scroll_end()
-
-        if error := graph.error:
-            self._current_agent_response_widget.error_message = error
-
-        if not graph.interrupted:
-            self._current_agent_response_widget = None
+    def on_chat_session_finished(self, event: ChatSession.Finished):
+        """Accept input again, once the displayed session finishes."""
+        if event.session is self.current_session:
             self.chat_box.enable_messages(Input.Submitted)
 
-        self.chat_area.scroll_end()
-
-    def on_show_graph_interrupt_response(self, event: ShowGraphInterrupt.Response):
-        """Continue agent execution after human response."""
-        self.execute_agents([event.human_response])
-
     async def on_input_submitted(self, event: Input.Submitted):
         """Initiate agent execution on input submission."""
         user_input = event.value
@@ -143,18 +144,7 @@ class SpeechCLI(App):
         self.chat_box.value = ""
         self.chat_box.disable_messages(Input.Submitted)
 
-        await self.chat_area.mount(
-            Horizontal(
-                Static(content=user_input, classes="userMessage"),
-                classes="userMessageContainer",
-            )
-        )
-
-        self._current_agent_response_widget = AgentResponse()
-        await self.chat_area.mount(self._current_agent_response_widget)
-        self.chat_area.scroll_end()
-
-        self.execute_agents(user_input)
+        await self.current_session.submit(user_input)
 
     def run(self):
         """Configure logging before running app."""
@@ -0,0 +1,325 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from langgraph.types import Interrupt
+
+from speech_cli.agents import AgentsGraph
+from speech_cli.config import api_config, app_config
+from speech_cli.core.approval import ApprovalPolicy
+from speech_cli.core.cassette import Cassette, ReplayPace
+from speech_cli.core.llm import LLM
+from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import workspace
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+_HEADLESS_NOTE = (
+    "This build is run from a script, there's no user to answer questions. Make"
+    " reasonable assumptions, and hand off to the generator right away.\n\nBrief:\n"
+)
+_FOLLOW_UP = (
+    "There's no user to answer, go ahead with your own assumptions and hand off to"
+    " the generator now."
+)
+# Chat turns without a handoff, before a build is given up.
+_MAX_CHAT_TURNS = 3
+
+
+@dataclass
+class Brief:
+    """A brief to build, in its own working directory."""
+
+    id: str
+    text: str
+    workdir: Path
+
+
+@dataclass
+class BuildResult:
+    """The outcome of a headless build."""
+
+    id: str
+    workdir: str
+    thread_id: str
+    status: str = "incomplete"
+    """`succeeded`, `failed`, or `incomplete` when the agents never built it."""
+
+    error: str | None = None
+    started_at: str = ""
+    duration: float = 0.0
+    """The build duration, in seconds."""
+
+    tool_calls: int = 0
+    decisions: list[dict[str, str]] = field(default_factory=list)
+    """The approval policy decisions, on the tool calls needing a review."""
+
+
+def load_briefs(paths: Sequence[Path], builds_dir: Path) -> list[Brief]:
+    """Load the briefs of brief files, and of JSONL files with a brief per line.
+
+    A JSONL line is either a brief, or an object with a `brief`, and optionally an
+    `id` and a `workdir`. Every brief is built in `builds_dir/<id>` by default.
+
+    Raises:
+        ValueError: If a file can't be read, or a JSONL line is invalid.
+
+    """
+    entries: list[dict[str, Any]] = []
+    for path in paths:
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError as err:
+            raise ValueError(f"Can't read the brief file {path}: {err}") from err
+
+        if path.suffix != ".jsonl":
+            entries.append({"id": path.stem, "brief": text})
+            continue
+
+        for number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as err:
+                raise ValueError(f"{path}:{number} isn't valid JSON: {err}") from err
+
+            entry = {"brief": entry} if isinstance(entry, str) else entry
+            if not isinstance(entry, dict) or not isinstance(entry.get("brief"), str):
+                raise ValueError(f"{path}:{number} has no brief.")
+            entries.append({"id": f"{path.stem}-{number}", **entry})
+
+    briefs, ids = [], set()
+    for entry in entries:
+        brief_id = str(entry["id"])
+        while brief_id in ids:
+            brief_id = f"{brief_id}-{len(ids)}"
+        ids.add(brief_id)
+
+        workdir = Path(entry.get("workdir") or builds_dir / brief_id)
+        briefs.append(Brief(brief_id, entry["brief"], workdir))
+
+    return briefs
+
+
+async def run_build(
+    brief: Brief, policy: ApprovalPolicy, semaphore: asyncio.Semaphore
+) -> BuildResult:
+    """Run a brief through the agents, answering the interrupts with the policy."""
+    async with semaphore:
+        result = BuildResult(brief.id, str(brief.workdir), AgentsGraph.new_thread_id())
+        result.started_at = datetime.now().isoformat()
+        start = time.monotonic()
+        logger.info("Starting the headless build %s in %s.", brief.id, brief.workdir)
+
+        brief.workdir.mkdir(parents=True, exist_ok=True)
+        with workspace(brief.workdir):
+            await _build(brief, policy, result)
+
+        result.duration = round(time.monotonic() - start, 3)
+        logger.info("The headless build %s %s.", brief.id, result.status)
+        return result
+
+
+async def _build(brief: Brief, policy: ApprovalPolicy, result: BuildResult) -> None:
+    user_input: str | list[dict[str, Any]] = _HEADLESS_NOTE + brief.text
+    chat_turns = 0
+
+    while True:
+        interrupt = None
+        with AgentsGraph(user_input, result.thread_id) as agents:
+            async for chunk in agents.run():
+                if isinstance(chunk, Interrupt):
+                    interrupt = chunk
+                elif isinstance(chunk, ToolCall):
+                    result.tool_calls += 1
+
+        if agents.error:
+            result.status, result.error = "failed", agents.error
+            return
+
+        if interrupt:
+            user_input = []
+            for request in interrupt.value:
+                response = policy.decide(request)
+                result.decisions.append(
+                    {
+                        "tool": request["action_request"]["action"],
+                        "decision": response["type"],
+                    }
+                )
+                user_input.append(response)
+            continue
+
+        state = await agents.graph.aget_state(agents.config)
+        if state.values.get("summary"):
+            result.status = "succeeded"
+            return
+
+        # The chat agent answered, rather than handing the brief off.
+        chat_turns += 1
+        if chat_turns >= _MAX_CHAT_TURNS:
+            result.error = "The brief was never handed off to the generator."
+            return
+        user_input = _FOLLOW_UP
+
+
+async def run_builds(
+    briefs: list[Brief],
+    policy: ApprovalPolicy,
+    concurrency: int,
+    output: Path | None = None,
+) -> list[BuildResult]:
+    """Run the builds concurrently, writing every result as a JSON line once done."""
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results = []
+
+    with (
+        output.open("w", encoding="utf-8")
+        if output
+        else contextlib.nullcontext(sys.stdout)
+    ) as out:
+        for build in asyncio.as_completed(
+            [run_build(brief, policy, semaphore) for brief in briefs]
+        ):
+            result = await build
+            results.append(result)
+            out.write(json.dumps(asdict(result)) + "\n")
+            out.flush()
+
+    return results
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run briefs through the agents without the TUI, e.g. from scripts and CI.
+
+    Returns:
+        int: The exit code, 0 when every build succeeded.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="speech run",
+        description="Build briefs concurrently, without the interactive interface.",
+    )
+    parser.add_argument(
+        "briefs",
+        nargs="+",
+        type=Path,
+        help="brief files, or JSONL files with a brief per line",
+    )
+    parser.add_argument(
+        "-j",
+        "--concurrency",
+        type=int,
+        default=4,
+        help="maximum number of builds running at once (default: 4)",
+    )
+    parser.add_argument(
+        "--policy",
+        type=Path,
+        help="approval policy file, by default every tool call needing a review is"
+        " ignored",
+    )
+    parser.add_argument(
+        "--builds-dir",
+        type=Path,
+        default=Path("builds"),
+        help="directory of the builds' working directories (default: builds)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help="write the JSON results to this file, rather than stdout",
+    )
+    cassette = parser.add_mutually_exclusive_group()
+    cassette.add_argument(
+        "--record",
+        type=Path,
+        metavar="CASSETTE",
+        help="record the llm responses to a cassette file",
+    )
+    cassette.add_argument(
+        "--replay",
+        type=Path,
+        metavar="CASSETTE",
+        help="replay the llm responses of a cassette file, without a model",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="simulated delay before every replayed response (default: 0)",
+    )
+    parser.add_argument(
+        "--replay-tps",
+        type=float,
+        metavar="TOKENS",
+        help="simulated tokens per second of the replayed responses, by default"
+        " they're replayed at once",
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="replay the recorded latency and streaming rate",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="fail on requests missing from the replayed cassette",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="trace the builds, see `speech trace`",
+    )
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        app_config.tracing = True
+
+    if not (api_config.configured or args.replay):
+        parser.exit(2, "No model is configured, run `speech` to configure one.\n")
+
+    try:
+        policy = ApprovalPolicy.load(args.policy)
+        briefs = load_briefs(args.briefs, args.builds_dir)
+        if args.record or args.replay:
+            LLM.use_cassette(
+                Cassette(
+                    args.record or args.replay,
+                    "record" if args.record else "replay",
+                    pace=ReplayPace(
+                        args.replay_latency, args.replay_tps, realtime=args.realtime
+                    ),
+                    strict=args.strict,
+                )
+            )
+    except ValueError as err:
+        parser.exit(2, f"{err}\n")
+
+    results = asyncio.run(run_builds(briefs, policy, args.concurrency, args.output))
+    succeeded = sum(result.status == "succeeded" for result in results)
+    # The results are written to stdout, the summary goes to stderr.
+    sys.stderr.write(f"{succeeded}/{len(results)} builds succeeded.\n")
+    if LLM.cassette:
+        sys.stderr.write(
+            "Cassette: {recorded} recorded, {replayed} replayed ({fallbacks} by"
+            " their tools).\n".format(**LLM.cassette.stats())
+        )
+
+    return 0 if succeeded == len(results) else 1
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from speech_cli.core.tracing import TRACES_FILE
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+logger = logging.getLogger(__name__)
+
+# Spans shorter than this are left out of the critical path.
+_MIN_PATH_DURATION = 0.001
+
+
+def load_traces(path: Path) -> dict[str, list[dict[str, Any]]]:
+    """Load the spans of a traces file, by trace id, in the order traces started.
+
+    Raises:
+        ValueError: If the file can't be read.
+
+    """
+    traces: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError as err:
+        raise ValueError(f"Can't read the traces file {path}: {err}") from err
+
+    for line in lines:
+        try:
+            span = json.loads(line)
+        except json.JSONDecodeError:
+            # E.g. a line cut short by a crash.
+            continue
+        span["end"] = span["start"] + span["duration"]
+        traces[span["trace_id"]].append(span)
+
+    return dict(sorted(traces.items(), key=lambda item: _start(item[1])))
+
+
+def _start(spans: list[dict[str, Any]]) -> float:
+    return min(span["start"] for span in spans)
+
+
+def _started(spans: list[dict[str, Any]]) -> str:
+    return datetime.fromtimestamp(_start(spans)).isoformat(timespec="seconds")
+
+
+def _covered(spans: list[dict[str, Any]]) -> float:
+    """Return the time covered by spans, counting overlapping spans once."""
+    covered, until = 0.0, float("-inf")
+    for span in sorted(spans, key=lambda span: span["start"]):
+        start = max(span["start"], until)
+        if span["end"] > start:
+            covered += span["end"] - start
+            until = span["end"]
+    return covered
+
+
+def breakdown(spans: list[dict[str, Any]]) -> dict[str, float]:
+    """Break a build's wall time down into llm, tool, user and graph time.
+
+    Concurrent llm calls and tools are counted once, so the parts add up to the
+    wall time. The user time is spent between the build's runs, e.g. waiting on
+    the review of a tool call, and the graph time is the rest of the runs.
+    """
+    runs = sorted(
+        (span for span in spans if span["kind"] == "run"), key=lambda run: run["start"]
+    )
+    wall = max(span["end"] for span in spans) - _start(spans)
+    working = [span for span in spans if span["kind"] in ("llm", "tool")]
+
+    llm = _covered([span for span in working if span["kind"] == "llm"])
+    tools = _covered(working) - llm
+    user = sum(
+        max(0.0, run["start"] - previous["end"])
+        for previous, run in zip(runs, runs[1:], strict=False)
+    )
+    return {
+        "wall": wall,
+        "llm": llm,
+        "tools": tools,
+        "user": user,
+        "graph": max(0.0, wall - user - llm - tools),
+    }
+
+
+def critical_path(
+    spans: list[dict[str, Any]], root: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Follow the child ending last, the one holding its parent up, from the root."""
+    children = defaultdict(list)
+    for span in spans:
+        children[span["parent_id"]].append(span)
+
+    path = [root]
+    while candidates := [
+        child
+        for child in children[path[-1]["span_id"]]
+        if child["duration"] >= _MIN_PATH_DURATION
+    ]:
+        path.append(max(candidates, key=lambda child: child["end"]))
+    return path
+
+
+def _label(span: dict[str, Any]) -> str:
+    attributes = span["attributes"]
+    label = f"{span['kind']} {span['name']}"
+    if span["kind"] == "llm":
+        label += f" [{attributes.get('route')}:{attributes.get('step')}]"
+        if (ttft := attributes.get("ttft")) is not None:
+            label += f" ttft {ttft:.2f}s"
+        label += (
+            f" in {attributes.get('input_tokens', 0)}"
+            f" ({attributes.get('cached_tokens', 0)} cached)"
+            f" out {attributes.get('output_tokens', 0)}"
+        )
+    elif span["kind"] == "tool":
+        label += (
+            f" {attributes.get('bytes_in', 0)}B in,"
+            f" {attributes.get('bytes_out', 0)}B out"
+        )
+    if span["status"] != "ok":
+        label += f" ({span['status']})"
+    return label
+
+
+def report(trace_id: str, spans: list[dict[str, Any]]) -> str:
+    """Report a build's time breakdown, its slowest operations and critical paths."""
+    lines = [f"Build {trace_id}, started {_started(spans)}", ""]
+
+    parts = breakdown(spans)
+    wall = parts.pop("wall")
+    lines.append(f"  {'wall':<8}{wall:>10.2f}s")
+    for part, seconds in parts.items():
+        share = seconds / wall * 100 if wall else 0.0
+        lines.append(f"  {part:<8}{seconds:>10.2f}s {share:>5.1f}%")
+
+    totals: dict[tuple[str, str], list[float]] = defaultdict(list)
+    for span in spans:
+        if span["kind"] != "run":
+            totals[span["kind"], span["name"]].append(span["duration"])
+
+    lines += ["", f"  {'operation':<36}{'calls':>6}{'total':>10}{'mean':>9}{'max':>9}"]
+    for (kind, name), durations in sorted(
+        totals.items(), key=lambda item: -sum(item[1])
+    ):
+        lines.append(
+            f"  {f'{kind} {name}':<36}{len(durations):>6}{sum(durations):>9.2f}s"
+            f"{sum(durations) / len(durations):>8.2f}s{max(durations):>8.2f}s"
+        )
+
+    runs = sorted(
+        (span for span in spans if span["kind"] == "run"), key=lambda run: run["start"]
+    )
+    for number, run in enumerate(runs, start=1):
+        lines += ["", f"  Critical path of run {number}/{len(runs)}:"]
+        for depth, span in enumerate(critical_path(spans, run)):
+            offset = span["start"] - run["start"]
+            lines.append(
+                f"  {'  ' * depth}+{offset:.2f}s {span['duration']:.2f}s {_label(span)}"
+            )
+
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Report where the time of a traced build went, on stdout.
+
+    Returns:
+        int: The exit code.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="speech trace",
+        description="Break a traced build's time down, enable tracing with the"
+        ' `"tracing": true` config.',
+    )
+    parser.add_argument(
+        "trace_id",
+        nargs="?",
+        help="the build's trace id, by default the last traced build",
+    )
+    parser.add_argument(
+        "--file",
+        type=Path,
+        default=TRACES_FILE,
+        help=f"the traces file (default: {TRACES_FILE})",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="list the traced builds instead"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        traces = load_traces(args.file)
+    except ValueError as err:
+        parser.exit(2, f"{err}\n")
+
+    if not traces:
+        parser.exit(1, "No traced builds.\n")
+
+    if args.list:
+        for trace_id, spans in traces.items():
+            wall = breakdown(spans)["wall"]
+            sys.stdout.write(
+                f"{trace_id}  {_started(spans)}  {wall:>9.2f}s  {len(spans):>6} spans\n"
+            )
+        return 0
+
+    trace_id = args.trace_id or next(reversed(traces))
+    if trace_id not in traces:
+        parser.exit(1, f"No trace {trace_id} in {args.file}.\n")
+
+    sys.stdout.write(report(trace_id, traces[trace_id]))
+    return 0
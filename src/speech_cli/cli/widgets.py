@@ -1,11 +1,15 @@
+from __future__ import annotations
+
+import asyncio
 import logging
+from typing import TYPE_CHECKING
 
-from langchain_core.messages import ToolMessage
+from langchain_core.messages import AIMessageChunk, ToolMessage
 from langgraph.prebuilt.interrupt import HumanResponse
 from langgraph.types import Interrupt
 from textual import work
 from textual.app import ComposeResult
-from textual.containers import Horizontal, Vertical
+from textual.containers import Horizontal, Vertical, VerticalScroll
 from textual.message import Message
 from textual.reactive import reactive
 from textual.widgets import (
@@ -19,8 +23,15 @@ from textual.widgets import (
     Static,
 )
 
+from speech_cli.agents import AgentsGraph
 from speech_cli.config import api_config
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import START_DIRECTORY, Workspace, workspace
+
+if TYPE_CHECKING:
+    from typing import Any
+
+    from langgraph.prebuilt.interrupt import HumanInterrupt
 
 logger = logging.getLogger(__name__)
 
@@ -77,35 +88,23 @@ class _ToolArgs(Vertical):
             yield Static(f"[d][i]value:[/i] {value}[/d]")
 
 
-class ShowGraphInterrupt(Vertical):
-    """Graph interrupt widget.
-
-    For accepting, editing, directly responding or rejecting tool execution.
-    """
-
-    class Response(Message):
-        """Event sent when graph interrupt `Button` is pressed."""
-
-        def __init__(self, human_response: HumanResponse) -> None:
-            self.human_response: HumanResponse = human_response
-            """The human response as a `dict`."""
-            super().__init__()
+class _ReviewRequest(Vertical):
+    """Widget for reviewing a single tool call of an interrupt."""
 
-    def __init__(self, graph_interrupt: Interrupt) -> None:
-        self.graph_interrupt = graph_interrupt
+    def __init__(self, request: HumanInterrupt) -> None:
+        self.request = request
+        self.response: HumanResponse | None = None
 
-        super().__init__()
+        super().__init__(classes="reviewRequest")
 
     def compose(self) -> ComposeResult:
-        """Create child widgets for the app."""
-        interrupt = self.graph_interrupt.value[0]
-
+        """Create child widgets for this widget."""
         yield Collapsible(
-            _ToolArgs(interrupt["action_request"]["args"]),
-            title=interrupt["description"],
+            _ToolArgs(self.request["action_request"]["args"]),
+            title=self.request["description"],
         )
         with Horizontal(classes="graphInterruptBtns"):
-            for action in interrupt["config"]:
+            for action in self.request["config"]:
                 name = action.split("_")[1]
                 yield Button(
                     label=name.capitalize(),
@@ -118,15 +117,67 @@ class ShowGraphInterrupt(Vertical):
         # TODO(@Collins): Implement this to allow edit and response interrupts.
         return {}
 
-    def on_button_pressed(self, event: Button.Pressed):
-        """Create and post user response."""
-        for button in self.query("Horizontal Button"):
+    def respond(self, response_type: str) -> None:
+        """Answer the review request, unless answered already."""
+        if self.response is not None:
+            return
+
+        if not self.request["config"].get(f"allow_{response_type}", False):
+            response_type = "ignore"
+        self.response = HumanResponse(type=response_type, args=self.get_tool_args())
+        for button in self.query(Button):
             button.disabled = True
 
-        human_response = HumanResponse(
-            type=event.button.name, args=self.get_tool_args()
-        )
-        self.post_message(ShowGraphInterrupt.Response(human_response))
+
+class ShowGraphInterrupt(Vertical):
+    """Graph interrupt widget.
+
+    For accepting, editing, directly responding or rejecting tool execution. The
+    tool calls of a turn are reviewed together, each on its own or all at once, and
+    answered in one response.
+    """
+
+    class Response(Message):
+        """Event sent once every tool call of the interrupt is answered."""
+
+        def __init__(self, human_responses: list[HumanResponse]) -> None:
+            self.human_responses: list[HumanResponse] = human_responses
+            """The human responses, in the order of the interrupt's requests."""
+            super().__init__()
+
+    def __init__(self, graph_interrupt: Interrupt) -> None:
+        self.graph_interrupt = graph_interrupt
+
+        super().__init__()
+
+    def compose(self) -> ComposeResult:
+        """Create child widgets for the app."""
+        for request in self.graph_interrupt.value:
+            yield _ReviewRequest(request)
+
+        if len(self.graph_interrupt.value) > 1:
+            with Horizontal(classes="graphInterruptBtns"):
+                yield Button(label="Accept all", classes="accept", name="accept")
+                yield Button(label="Ignore all", classes="ignore", name="ignore")
+
+    def on_button_pressed(self, event: Button.Pressed):
+        """Answer the pressed button's tool call, or all of them."""
+        event.stop()
+        requests = list(self.query(_ReviewRequest))
+        for request in requests:
+            if event.button in request.query(Button):
+                request.respond(event.button.name)
+                break
+        else:
+            for request in requests:
+                request.respond(event.button.name)
+
+        if all(request.response is not None for request in requests):
+            for button in self.query(Button):
+                button.disabled = True
+            self.post_message(
+                ShowGraphInterrupt.Response([request.response for request in requests])
+            )
 
 
 class AgentResponse(Vertical):
@@ -219,6 +270,131 @@ class AgentResponse(Vertical):
         await self.mount(Label(error_message, classes="exception error"))
 
 
+class ChatSession(VerticalScroll):
+    """A chat session, with its own agents graph thread and chat history.
+
+    Every session runs its agents in its own worker group, so sessions can run
+    concurrently while the user switches between them.
+    """
+
+    class Finished(Message):
+        """Event sent when the session agents stop, and await user input."""
+
+        def __init__(self, session: ChatSession) -> None:
+            self.session: ChatSession = session
+            """The session that finished."""
+            super().__init__()
+
+    def __init__(self, number: int) -> None:
+        self.number = number
+        self.thread_id = AgentsGraph.new_thread_id()
+        self.busy = False
+        # The first session works in the project, the others in their own project
+        # directory, so concurrent sessions never share their current directory,
+        # HLC or build manifest.
+        self.workspace = Workspace(
+            START_DIRECTORY
+            if number == 1
+            else START_DIRECTORY / "sessions" / f"session{number}"
+        )
+
+        self._current_agent_response_widget: AgentResponse | None = None
+
+        super().__init__(id=f"session{number}", classes="chatArea")
+
+    @property
+    def title(self) -> str:
+        """The session title."""
+        return f"Session {self.number}"
+
+    async def submit(self, user_input: str) -> None:
+        """Display the user input, then initiate agent execution with it."""
+        await self.mount(
+            Horizontal(
+                Static(content=user_input, classes="userMessage"),
+                classes="userMessageContainer",
+            )
+        )
+
+        self._current_agent_response_widget = AgentResponse()
+        await self.mount(self._current_agent_response_widget)
+        self.scroll_end()
+
+        self.execute_agents(user_input)
+
+    def update_agent_response_widget(
+        self,
+        agent_response: AIMessageChunk | ToolMessage | Interrupt | ToolCall,
+    ) -> None:
+        """Update the widget with the content."""
+        if isinstance(agent_response, AIMessageChunk):
+            if self._current_agent_response_widget.create_new_ai_message_widget:
+                # Resetting the ai message to an empty string.
+                self._current_agent_response_widget.ai_message = ""
+
+            self._current_agent_response_widget.ai_message += agent_response.content
+        elif isinstance(agent_response, ToolMessage | ToolCall):
+            self._current_agent_response_widget.tool_call_message = agent_response
+        elif isinstance(agent_response, Interrupt):
+            self._current_agent_response_widget.graph_interrupt = agent_response
+
+    def execute_agents(self, user_input: str | list[dict[str, Any]]) -> None:
+        """Run the agents for this session in a worker.
+
+        Args:
+            user_input (str | list[dict]): The input to the agents executor.
+
+        """
+        self.busy = True
+        self.run_worker(self._execute_agents(user_input), group=self.id, exclusive=True)
+
+    def stop(self) -> None:
+        """Stop the running agents, cancelling the running tools."""
+        if self.busy:
+            self.workers.cancel_group(self, self.id)
+
+    async def _execute_agents(self, user_input: str | list[dict[str, Any]]):
+        """Initiate the agent workflow, in the session's workspace."""
+        self.workspace.root.mkdir(parents=True, exist_ok=True)
+        with (
+            workspace(self.workspace),
+            AgentsGraph(user_input, thread_id=self.thread_id) as graph,
+        ):
+            try:
+                async for agent_response in graph.run():
+                    self.update_agent_response_widget(agent_response)
+                    self.scroll_end()
+            except asyncio.CancelledError:
+                # Stopped by the user, the tools' processes are killed.
+                self.thread_id = graph.thread_id
+                if self._current_agent_response_widget is not None:
+                    self._current_agent_response_widget.error_message = (
+                        "Stopped by the user."
+                    )
+                self._current_agent_response_widget = None
+                self.busy = False
+                self.post_message(ChatSession.Finished(self))
+                raise
+
+        # The graph may have switched thread, to continue an interrupted build.
+        self.thread_id = graph.thread_id
+
+        if error := graph.error:
+            self._current_agent_response_widget.error_message = error
+
+        if not graph.interrupted:
+            self._current_agent_response_widget = None
+            self.busy = False
+            self.post_message(ChatSession.Finished(self))
+
+        self.scroll_end()
+
+    def on_show_graph_interrupt_response(self, event: ShowGraphInterrupt.Response):
+        """Continue agent execution after human response."""
+        event.stop()
+        self.execute_agents(event.human_responses)
+
+
 class APIConfig(Horizontal):
     """A widget for configuring a model provider."""
 
@@ -72,7 +72,11 @@ class _GetAvailableModels:
 
 
 class APIConfig:
-    """Api configuration class."""
+    """Api configuration class.
+
+    Besides the default model, `api_config.json` can route agents, or agent steps,
+    to their own models, see `LLM`.
+    """
 
     def __init__(self):
         self._speech_dir = Path.home() / ".speech"
@@ -114,6 +118,7 @@ class APIConfig:
         """Store the api configuration in the api_config.json file."""
         if provider not in _SUPPORTED_PROVIDERS:
             raise ValueError(f"Unsupported provider {provider}, provided.")
+        previous = self.config or {}
         self.config = {
             "verbose_name": provider,
             "model": model,
@@ -121,6 +126,9 @@ class APIConfig:
         }
 
         self.config.update(_SUPPORTED_PROVIDERS[provider])
+        # The model routes name models of the provider, so they're only kept with it.
+        if previous.get("verbose_name") == provider and "routes" in previous:
+            self.config["routes"] = previous["routes"]
 
         with self._config_file.open("w", encoding="utf-8") as f:
             json.dump(self.config, f, indent=2)
@@ -31,6 +31,31 @@ class AppConfig:
 
     _default_config: dict[str, Any] = {
         "debug": False,
+        "max_checkpoints": 20,
+        # Checkpoint threads kept, the most recent ones, e.g. one per session
+        "max_checkpoint_threads": 50,
+        # Per agent context token budgets, e.g. {"Translator": 64000}
+        "context_budgets": {},
+        # Maximum number of HLC subtrees translated concurrently
+        "translator_workers": 4,
+        # Cache llm responses on disk, in ~/.speech/cache
+        "response_cache": False,
+        # Per agent response cache flags, e.g. {"Chat": false}
+        "response_cache_agents": {},
+        "response_cache_max_mb": 512,
+        # Trace the builds' nodes, llm calls and tools, to .speech/traces.jsonl
+        "tracing": False,
+        "tracing_max_mb": 50,
+        # Longer tool outputs are cut to their head and tail, and stored for paging
+        "tool_output_max_chars": 12_000,
+        "tool_output_store_mb": 256,
+        # Threads running the blocking file I/O of the tools, off the event loop
+        "tool_io_workers": 8,
+        # The lines of the files the file tools work on, shared by the tools
+        "file_cache_mb": 64,
+        # Rules accepting or ignoring reviewed tool calls without a review, e.g.
+        # [{"tool": "run_*_test", "decision": "accept"}], see ApprovalRule
+        "approval_rules": [],
     }
     _config_file_name = "config.json"
 
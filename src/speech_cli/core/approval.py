@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import fnmatch
+import json
+import logging
+import re
+import threading
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from speech_cli.core.workdir import project_root, resolve_path
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from langgraph.prebuilt.interrupt import HumanInterrupt, HumanResponse
+
+logger = logging.getLogger(__name__)
+
+# Shell operators running other commands, or writing files, after the matched one.
+_CHAINED = re.compile(r"[;&|`<>\n]|\$\(")
+# The tool arguments naming the path a tool call works on.
+_PATH_ARGS = ("path", "file_path")
+
+
+class ApprovalRule:
+    """Decide the tool calls matching a tool name pattern, and their arguments.
+
+    A rule matches the calls of the tools matching its `tool` pattern, whose
+    command fully matches one of its `commands` regexes, and whose path matches one
+    of its `paths` globs, relative to the project directory. A rule without
+    `commands` or `paths` matches any command or path:
+
+        {"tool": "terminal_use", "commands": ["ls( .*)?", "git (status|diff)"],
+         "decision": "accept"}
+
+    A command chaining other commands, or redirecting to a file, is never accepted
+    by a command pattern, it's left to the review, and paths outside the project
+    directory never match.
+
+    Args:
+        decision (str): `accept` or `ignore` the matching calls.
+        tool (str, optional): The tool name pattern, e.g. `run_*_test`.
+        commands (list[str], optional): The command regexes.
+        paths (list[str], optional): The path globs, e.g. `tests/**`.
+        reason (str, optional): The reason given to the model for ignoring a call.
+
+    """
+
+    def __init__(
+        self,
+        decision: str,
+        tool: str = "*",
+        commands: list[str] | None = None,
+        paths: list[str] | None = None,
+        reason: str | None = None,
+    ):
+        if decision not in ApprovalPolicy.DECISIONS:
+            raise ValueError(
+                f"Invalid decision {decision!r}, "
+                f"expected one of {ApprovalPolicy.DECISIONS}."
+            )
+
+        self.decision = decision
+        self.tool = tool
+        self.paths = paths
+        self.reason = reason
+        try:
+            self.commands = (
+                None if commands is None else [re.compile(c) for c in commands]
+            )
+        except re.error as err:
+            raise ValueError(f"Invalid command pattern {err.pattern!r}: {err}") from err
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ApprovalRule:
+        """Make a rule from its config.
+
+        Raises:
+            ValueError: If the rule is invalid.
+
+        """
+        try:
+            return cls(**data)
+        except TypeError as err:
+            raise ValueError(f"Invalid approval rule {data!r}: {err}") from err
+
+    def matches(self, tool: str, args: dict[str, Any]) -> bool:
+        """Whether the rule matches a tool call."""
+        if not fnmatch.fnmatchcase(tool, self.tool):
+            return False
+
+        if self.commands is not None:
+            command = args.get("command")
+            if not isinstance(command, str):
+                return False
+            if self.decision == "accept" and _CHAINED.search(command):
+                return False
+            if not any(pattern.fullmatch(command) for pattern in self.commands):
+                return False
+
+        if self.paths is not None:
+            path = self._relative_path(args)
+            if path is None or not any(
+                fnmatch.fnmatchcase(path, glob) for glob in self.paths
+            ):
+                return False
+
+        return True
+
+    @staticmethod
+    def _relative_path(args: dict[str, Any]) -> str | None:
+        """Return the call's path, relative to the project directory."""
+        path = next((args[arg] for arg in _PATH_ARGS if arg in args), None)
+        if not isinstance(path, str) or not path:
+            return None
+
+        try:
+            resolved = resolve_path(path).resolve()
+            return resolved.relative_to(project_root().resolve()).as_posix()
+        except (OSError, RuntimeError, ValueError):
+            return None
+
+
+class ApprovalPolicy:
+    """Answer human in the loop interrupts without a human, e.g. in headless builds.
+
+    A policy file maps tools to a decision, `accept` or `ignore`, with a default
+    decision for the other tools:
+
+        {"default": "ignore", "tools": {"terminal_use": "accept"}}
+
+    The policy's rules, see `ApprovalRule`, decide the calls they match first, the
+    first matching rule deciding. A decision the interrupt doesn't allow falls back
+    to `ignore`.
+
+    Args:
+        default (str, optional): The decision for tools without their own.
+        tools (dict, optional): The decision of every tool, by name.
+        rules (list[ApprovalRule], optional): The rules deciding matching calls.
+
+    """
+
+    DECISIONS = ("accept", "ignore")
+
+    def __init__(
+        self,
+        default: str = "ignore",
+        tools: dict[str, str] | None = None,
+        rules: list[ApprovalRule] | None = None,
+    ):
+        self.default = default
+        self.tools = tools or {}
+        self.rules = rules or []
+
+        for decision in (default, *self.tools.values()):
+            if decision not in self.DECISIONS:
+                raise ValueError(
+                    f"Invalid decision {decision!r}, expected one of {self.DECISIONS}."
+                )
+
+    @classmethod
+    def load(cls, path: Path | None) -> ApprovalPolicy:
+        """Load a policy file, or the default policy, ignoring every tool call.
+
+        Raises:
+            ValueError: If the policy file is invalid.
+
+        """
+        if path is None:
+            return cls()
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            rules = [ApprovalRule.from_dict(rule) for rule in data.get("rules", [])]
+            return cls(data.get("default", "ignore"), data.get("tools"), rules)
+        except (OSError, AttributeError, json.JSONDecodeError, ValueError) as err:
+            raise ValueError(f"Invalid policy file {path}: {err}") from err
+
+    def match(self, tool: str, args: dict[str, Any]) -> ApprovalRule | None:
+        """Return the first rule matching a tool call, if any."""
+        return next((rule for rule in self.rules if rule.matches(tool, args)), None)
+
+    def decide(self, request: HumanInterrupt) -> HumanResponse:
+        """Answer a tool call review request."""
+        tool = request["action_request"]["action"]
+        rule = self.match(tool, request["action_request"]["args"])
+        decision = rule.decision if rule else self.tools.get(tool, self.default)
+        if not request["config"].get(f"allow_{decision}", False):
+            decision = "ignore"
+
+        logger.debug("The approval policy decided to %s the %s call.", decision, tool)
+        return {"type": decision, "args": None}
+
+
+_registry: dict[str, ApprovalPolicy] = {}
+
+
+def get_approval_policy(rules: list[dict[str, Any]]) -> ApprovalPolicy:
+    """Return the policy of the configured approval rules, deciding calls in-graph.
+
+    Calls no rule matches are left to the review, invalid rules are ignored.
+    """
+    key = json.dumps(rules, sort_keys=True)
+    if key not in _registry:
+        try:
+            policy_rules = [ApprovalRule.from_dict(rule) for rule in rules]
+        except (ValueError, AttributeError) as err:
+            logger.warning("Ignoring the invalid approval rules: %s", err)
+            policy_rules = []
+        _registry[key] = ApprovalPolicy(rules=policy_rules)
+
+    return _registry[key]
+
+
+_decisions_lock = threading.Lock()
+
+
+def record_decision(tool: str, args: dict[str, Any], decision: str, rule: ApprovalRule):
+    """Append an approval rule decision to the project's `.speech/approvals.jsonl`."""
+    logger.info("The approval rules decided to %s the %s call.", decision, tool)
+    entry = {
+        "time": datetime.now().isoformat(),
+        "tool": tool,
+        "args": args,
+        "decision": decision,
+        "rule": {"tool": rule.tool, "reason": rule.reason},
+    }
+    path = project_root() / ".speech" / "approvals.jsonl"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _decisions_lock, path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(entry, default=str) + "\n")
+    except OSError as err:
+        logger.warning("Can't record the approval decision: %s", err)
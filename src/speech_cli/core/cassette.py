@@ -0,0 +1,399 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.language_models.chat_models import (
+    agenerate_from_stream,
+    generate_from_stream,
+)
+from langchain_core.messages import AIMessageChunk
+from langchain_core.outputs import ChatGenerationChunk
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from speech_cli.core.response_cache import request_key
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator, Sequence
+
+    from langchain_core.callbacks import (
+        AsyncCallbackManagerForLLMRun,
+        CallbackManagerForLLMRun,
+    )
+    from langchain_core.messages import BaseMessage
+    from langchain_core.outputs import ChatResult
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(LookupError):
+    """Raised when a replayed request was never recorded."""
+
+
+def _encode_chunk(chunk: AIMessageChunk) -> dict[str, Any]:
+    """Keep the parts of a response chunk worth replaying, with short keys."""
+    encoded = {
+        "c": chunk.content,
+        "t": [dict(tool_call_chunk) for tool_call_chunk in chunk.tool_call_chunks],
+        "u": chunk.usage_metadata,
+        "r": chunk.response_metadata,
+    }
+    return {key: value for key, value in encoded.items() if value}
+
+
+def _decode_chunk(encoded: dict[str, Any]) -> AIMessageChunk:
+    return AIMessageChunk(
+        content=encoded.get("c", ""),
+        tool_call_chunks=encoded.get("t", []),
+        usage_metadata=encoded.get("u"),
+        response_metadata=encoded.get("r", {}),
+    )
+
+
+def _chunk_tokens(chunk: AIMessageChunk) -> float:
+    """Approximate the tokens of a chunk, at 4 characters per token."""
+    text = chunk.text() + "".join(
+        (tool_call_chunk.get("name") or "") + (tool_call_chunk.get("args") or "")
+        for tool_call_chunk in chunk.tool_call_chunks
+    )
+    return max(1.0, len(text) / 4)
+
+
+@dataclass
+class ReplayPace:
+    """The pace replayed responses are streamed at."""
+
+    latency: float = 0.0
+    """The delay before the first chunk, in seconds."""
+
+    tokens_per_second: float | None = None
+    """The streaming rate, by default chunks are replayed at once."""
+
+    realtime: bool = False
+    """Replay the recorded latency and streaming rate instead."""
+
+    def delays(
+        self, entry: dict[str, Any], chunks: list[AIMessageChunk]
+    ) -> tuple[float, list[float]]:
+        """Return the delay before the first chunk of a response, and before each."""
+        if self.realtime:
+            latency = entry["latency"]
+            return latency, [(entry["duration"] - latency) / max(1, len(chunks))] * len(
+                chunks
+            )
+
+        return self.latency, [
+            _chunk_tokens(chunk) / self.tokens_per_second
+            if self.tokens_per_second
+            else 0.0
+            for chunk in chunks
+        ]
+
+
+class Cassette:
+    """A recording of llm requests and their streamed responses.
+
+    In `record` mode, every response is streamed from the real model and appended to
+    the cassette file, with its chunks and timings. In `replay` mode, the responses
+    are served from the file instead, so a run is deterministic and needs no
+    network, e.g. to benchmark the agents, or to profile the interface overhead
+    without the model latency.
+
+    A request is replayed by its `request_key`. Requests which differ from the
+    recording, e.g. as a tool result holds an absolute path, fall back to the next
+    unreplayed response recorded with the same tools, unless the cassette is strict.
+
+    The cassette file is JSON lines, a header followed by an entry per response:
+
+        {"key": ..., "tools": ..., "latency": 0.41, "duration": 2.3, "chunks": [...]}
+
+    Args:
+        path (Path): The cassette file.
+        mode (str): `record` or `replay`.
+        pace (ReplayPace, optional): The pace responses are replayed at, by default
+            at once.
+        strict (bool, optional): Fail on requests which weren't recorded, rather than
+            falling back to a response recorded with the same tools.
+
+    """
+
+    MODES = ("record", "replay")
+
+    def __init__(
+        self,
+        path: Path,
+        mode: str,
+        *,
+        pace: ReplayPace | None = None,
+        strict: bool = False,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid cassette mode {mode!r}, expected {self.MODES}.")
+
+        self.path = Path(path)
+        self.mode = mode
+        self.pace = pace or ReplayPace()
+        self.strict = strict
+
+        self._lock = threading.Lock()
+        self._by_key: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self._by_tools: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        self.recorded = self.replayed = self.fallbacks = 0
+
+        if mode == "record":
+            self._start_recording()
+        else:
+            self._load()
+
+    @staticmethod
+    def tools_key(tool_schemas: list[dict[str, Any]]) -> str:
+        """Hash the tool schemas bound to a model, to match fallback responses."""
+        canonical = json.dumps(tool_schemas, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+    def _start_recording(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = {
+            "version": CASSETTE_VERSION,
+            "recorded_at": datetime.now().isoformat(),
+        }
+        self.path.write_text(json.dumps(header) + "\n", encoding="utf-8")
+        logger.info("Recording the llm responses to %s.", self.path)
+
+    def _load(self):
+        """Load a cassette file.
+
+        Raises:
+            ValueError: If the file can't be read, or isn't a cassette.
+
+        """
+        try:
+            header, *lines = self.path.read_text(encoding="utf-8").splitlines()
+            if json.loads(header).get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version in {self.path}.")
+
+            for line in lines:
+                entry = json.loads(line)
+                entry["replayed"] = False
+                self._by_key[entry["key"]].append(entry)
+                self._by_tools[entry["tools"]].append(entry)
+        except (OSError, KeyError, AttributeError, json.JSONDecodeError) as err:
+            raise ValueError(f"Invalid cassette file {self.path}: {err}") from err
+
+        logger.info("Replaying %d llm responses from %s.", len(lines), self.path)
+
+    def record(
+        self,
+        key: str,
+        tools_key: str,
+        chunks: list[AIMessageChunk],
+        latency: float,
+        duration: float,
+    ):
+        """Append a response, with its timings in seconds, to the cassette."""
+        entry = {
+            "key": key,
+            "tools": tools_key,
+            "latency": round(latency, 3),
+            "duration": round(duration, 3),
+            "chunks": [_encode_chunk(chunk) for chunk in chunks],
+        }
+        with self._lock, self.path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self.recorded += 1
+
+    def find(self, key: str, tools_key: str) -> dict[str, Any]:
+        """Find the recorded response of a request.
+
+        A request recorded several times gets its recorded responses in order, and
+        the last one again once they're all replayed.
+
+        Raises:
+            CassetteMissError: If the request, or in a strict cassette, the exact
+                request, was never recorded.
+
+        """
+        with self._lock:
+            entries = self._by_key.get(key)
+            entry = next(
+                (entry for entry in entries or () if not entry["replayed"]),
+                entries[-1] if entries else None,
+            )
+            if entry is None and not self.strict:
+                entry = next(
+                    (
+                        entry
+                        for entry in self._by_tools.get(tools_key, ())
+                        if not entry["replayed"]
+                    ),
+                    None,
+                )
+                self.fallbacks += entry is not None
+
+            if entry is None:
+                raise CassetteMissError(
+                    f"No response recorded in {self.path} for the request {key}."
+                )
+
+            entry["replayed"] = True
+            self.replayed += 1
+            return entry
+
+    async def replay(self, entry: dict[str, Any]) -> AsyncIterator[AIMessageChunk]:
+        """Stream a recorded response, at the simulated latency and rate."""
+        chunks = [_decode_chunk(encoded) for encoded in entry["chunks"]]
+        latency, delays = self.pace.delays(entry, chunks)
+
+        await asyncio.sleep(latency)
+        for chunk, delay in zip(chunks, delays, strict=True):
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+    def replay_sync(self, entry: dict[str, Any]) -> Iterator[AIMessageChunk]:
+        """Stream a recorded response, blocking for the simulated latency and rate."""
+        chunks = [_decode_chunk(encoded) for encoded in entry["chunks"]]
+        latency, delays = self.pace.delays(entry, chunks)
+
+        time.sleep(latency)
+        for chunk, delay in zip(chunks, delays, strict=True):
+            if delay:
+                time.sleep(delay)
+            yield chunk
+
+    def stats(self) -> dict[str, int]:
+        """Return the recorded and replayed response counts."""
+        return {
+            "recorded": self.recorded,
+            "replayed": self.replayed,
+            "fallbacks": self.fallbacks,
+        }
+
+
+class CassetteModel(BaseChatModel):
+    """A chat model recording the responses of a wrapped model, or replaying them.
+
+    Responses are always streamed, so the replayed tokens go through the same
+    callbacks, and reach the interface the same way, as live ones.
+    """
+
+    cassette: Any
+    """The `Cassette` recorded to, or replayed from."""
+
+    wrapped: Any = None
+    """The real model, only needed to record."""
+
+    bound: Any = None
+    """The real model, with the tools bound to it."""
+
+    tool_schemas: list[dict[str, Any]] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "cassette"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        params = getattr(self.wrapped, "_identifying_params", {})
+        return {**params, "cassette": str(self.cassette.path)}
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> CassetteModel:
+        """Bind the tools to the wrapped model, keeping their schemas for the key."""
+        return self.model_copy(
+            update={
+                "tool_schemas": [convert_to_openai_tool(tool) for tool in tools],
+                "bound": self.wrapped.bind_tools(tools, **kwargs)
+                if self.wrapped
+                else None,
+            }
+        )
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return generate_from_stream(self._stream(messages, stop, run_manager, **kwargs))
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await agenerate_from_stream(
+            self._astream(messages, stop, run_manager, **kwargs)
+        )
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,  # noqa: ARG002
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        key = request_key({}, self.tool_schemas, messages)
+        tools_key = self.cassette.tools_key(self.tool_schemas)
+
+        if self.cassette.mode == "replay":
+            entry = self.cassette.find(key, tools_key)
+            for chunk in self.cassette.replay_sync(entry):
+                yield ChatGenerationChunk(message=chunk)
+            return
+
+        model = self.bound or self.wrapped
+        chunks, latency, start = [], 0.0, time.monotonic()
+        for chunk in model.stream(
+            messages, config={"callbacks": []}, stop=stop, **kwargs
+        ):
+            if not chunks:
+                latency = time.monotonic() - start
+            chunks.append(chunk)
+            yield ChatGenerationChunk(message=chunk)
+
+        self.cassette.record(key, tools_key, chunks, latency, time.monotonic() - start)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,  # noqa: ARG002
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        key = request_key({}, self.tool_schemas, messages)
+        tools_key = self.cassette.tools_key(self.tool_schemas)
+
+        if self.cassette.mode == "replay":
+            entry = self.cassette.find(key, tools_key)
+            async for chunk in self.cassette.replay(entry):
+                yield ChatGenerationChunk(message=chunk)
+            return
+
+        model = self.bound or self.wrapped
+        chunks, latency, start = [], 0.0, time.monotonic()
+        # The wrapped model's callbacks are dropped, as its chunks are streamed
+        # through the cassette model's own.
+        async for chunk in model.astream(
+            messages, config={"callbacks": []}, stop=stop, **kwargs
+        ):
+            if not chunks:
+                latency = time.monotonic() - start
+            chunks.append(chunk)
+            yield ChatGenerationChunk(message=chunk)
+
+        self.cassette.record(key, tools_key, chunks, latency, time.monotonic() - start)
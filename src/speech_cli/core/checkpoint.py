@@ -0,0 +1,721 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator, Sequence
+    from pathlib import Path
+
+    from langchain_core.runnables import RunnableConfig
+    from langgraph.checkpoint.serde.base import SerializerProtocol
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    channel_versions TEXT NOT NULL,
+    type TEXT NOT NULL,
+    checkpoint BLOB NOT NULL,
+    metadata_type TEXT NOT NULL,
+    metadata BLOB NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    type TEXT NOT NULL,
+    blob BLOB NOT NULL,
+    base_version TEXT,
+    PRIMARY KEY (thread_id, checkpoint_ns, channel, version)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL,
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT NOT NULL,
+    value BLOB NOT NULL,
+    task_path TEXT NOT NULL,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+"""
+
+
+class SQLiteSaver(BaseCheckpointSaver[str]):
+    """A disk backed checkpoint saver, using SQLite in WAL mode.
+
+    Like the in-memory saver, channel values are stored once per channel version, so
+    a checkpoint only stores the channels that changed. On top of that, list
+    channels which only grew since their previous version (e.g. `messages`) are
+    stored as a delta holding the appended items, with a full keyframe every
+    `keyframe_every` versions.
+
+    Only the last `max_checkpoints` checkpoints of every thread (and namespace) are
+    kept. Older checkpoints, their writes and the blobs no longer referenced are
+    removed by a background compaction, which runs every `compact_every` puts.
+
+    Only the `max_threads` most recent threads are kept, pruned when the saver is
+    opened, and the subgraph namespaces of a thread are dropped once they are older
+    than its remaining root checkpoints.
+
+    Args:
+        path (Path): The SQLite database file.
+        max_checkpoints (int, optional): Checkpoints to keep per thread.
+        max_threads (int, optional): Threads to keep, the most recent ones.
+        serde (SerializerProtocol, optional): The checkpoints serializer.
+
+    """
+
+    # Puts, per thread, between compactions.
+    compact_every: int = 10
+    # Maximum length of a delta chain.
+    keyframe_every: int = 32
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_checkpoints: int = 20,
+        max_threads: int = 50,
+        serde: SerializerProtocol | None = None,
+    ) -> None:
+        super().__init__(serde=serde)
+        self.path = path
+        self.max_checkpoints = max_checkpoints
+        self.max_threads = max_threads
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._compactor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="checkpoint-compactor"
+        )
+        self._puts: dict[tuple[str, str], int] = {}
+        # The last stored value of every channel, used as the base of the next delta.
+        self._latest: OrderedDict[tuple[str, str, str], tuple[str, list, int]] = (
+            OrderedDict()
+        )
+        self._latest_maxsize = 64
+
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+        self._compactor.submit(self.prune_threads)
+
+    def close(self) -> None:
+        """Wait for the pending compaction, then close the database."""
+        self._compactor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+    def _remember(
+        self, key: tuple[str, str, str], version: str, value: Any, depth: int
+    ) -> None:
+        """Keep the last value of a list channel, evicting the least recent ones."""
+        if not isinstance(value, list):
+            self._latest.pop(key, None)
+            return
+
+        self._latest[key] = (version, list(value), depth)
+        self._latest.move_to_end(key)
+        while len(self._latest) > self._latest_maxsize:
+            self._latest.popitem(last=False)
+
+    def _encode_blob(
+        self, thread_id: str, checkpoint_ns: str, channel: str, version: str, value: Any
+    ) -> tuple[str, bytes, str | None]:
+        """Serialize a channel value, as a delta of its previous version if possible."""
+        key = (thread_id, checkpoint_ns, channel)
+        base_version = None
+        depth = 0
+
+        latest = self._latest.get(key)
+        if (
+            latest
+            and isinstance(value, list)
+            and latest[2] + 1 < self.keyframe_every
+            and len(value) >= len(latest[1])
+            and value[: len(latest[1])] == latest[1]
+        ):
+            base_version, base_value, base_depth = latest
+            type_, blob = self.serde.dumps_typed(value[len(base_value) :])
+            depth = base_depth + 1
+        else:
+            type_, blob = self.serde.dumps_typed(value)
+
+        self._remember(key, version, value, depth)
+        return type_, blob, base_version
+
+    def _load_blob(
+        self, thread_id: str, checkpoint_ns: str, channel: str, version: str
+    ) -> tuple[bool, Any]:
+        """Load a channel value, following its delta chain.
+
+        Returns:
+            tuple[bool, Any]: Whether the value was found, with every delta of its
+                chain, and the value.
+
+        """
+        row = self._conn.execute(
+            "SELECT type, blob, base_version FROM blobs WHERE thread_id = ? AND"
+            " checkpoint_ns = ? AND channel = ? AND version = ?",
+            (thread_id, checkpoint_ns, channel, version),
+        ).fetchone()
+
+        if row is None or row[0] == "empty":
+            return False, None
+
+        type_, blob, base_version = row
+        value = self.serde.loads_typed((type_, blob))
+
+        if base_version is not None:
+            found, base_value = self._load_blob(
+                thread_id, checkpoint_ns, channel, base_version
+            )
+            if not found:
+                # A delta alone isn't the channel value, so the value is lost.
+                logger.warning(
+                    "The base version %s of the %s channel of thread %s is missing.",
+                    base_version,
+                    channel,
+                    thread_id,
+                )
+                return False, None
+            value = base_value + value
+
+        return True, value
+
+    def _load_blobs(
+        self, thread_id: str, checkpoint_ns: str, versions: ChannelVersions
+    ) -> dict[str, Any]:
+        channel_values = {}
+        for channel, version in versions.items():
+            found, value = self._load_blob(
+                thread_id, checkpoint_ns, channel, str(version)
+            )
+            if found:
+                channel_values[channel] = value
+        return channel_values
+
+    def _load_writes(
+        self, thread_id: str, checkpoint_ns: str, checkpoint_id: str
+    ) -> list[tuple[str, str, Any]]:
+        rows = self._conn.execute(
+            "SELECT task_id, channel, type, value FROM writes WHERE thread_id = ? AND"
+            " checkpoint_ns = ? AND checkpoint_id = ? ORDER BY rowid",
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return [
+            (task_id, channel, self.serde.loads_typed((type_, value)))
+            for task_id, channel, type_, value in rows
+        ]
+
+    def _build_tuple(self, row: tuple) -> CheckpointTuple:
+        (
+            thread_id,
+            checkpoint_ns,
+            checkpoint_id,
+            parent_checkpoint_id,
+            type_,
+            checkpoint_blob,
+            metadata_type,
+            metadata_blob,
+        ) = row
+        checkpoint: Checkpoint = self.serde.loads_typed((type_, checkpoint_blob))
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint={
+                **checkpoint,
+                "channel_values": self._load_blobs(
+                    thread_id, checkpoint_ns, checkpoint["channel_versions"]
+                ),
+            },
+            metadata=self.serde.loads_typed((metadata_type, metadata_blob)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=self._load_writes(thread_id, checkpoint_ns, checkpoint_id),
+        )
+
+    _SELECT_CHECKPOINT = (
+        "SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type,"
+        " checkpoint, metadata_type, metadata FROM checkpoints"
+    )
+
+    def get_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Get a checkpoint tuple from the database.
+
+        The checkpoint matching the config "checkpoint_id" is retrieved if provided,
+        otherwise the latest checkpoint of the thread.
+
+        Args:
+            config: The config to use for retrieving the checkpoint.
+
+        Returns:
+            CheckpointTuple | None: The retrieved checkpoint tuple, if any.
+
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        with self._lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self._conn.execute(
+                    f"{self._SELECT_CHECKPOINT} WHERE thread_id = ? AND"
+                    " checkpoint_ns = ? AND checkpoint_id = ?",
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    f"{self._SELECT_CHECKPOINT} WHERE thread_id = ? AND"
+                    " checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+
+            return self._build_tuple(row) if row else None
+
+    def list(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,  # noqa: A002
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> Iterator[CheckpointTuple]:
+        """List checkpoints from the database, the most recent first.
+
+        Args:
+            config: Base configuration for filtering checkpoints.
+            filter: Additional filtering criteria for metadata.
+            before: List checkpoints created before this configuration.
+            limit: Maximum number of checkpoints to return.
+
+        Yields:
+            Iterator[CheckpointTuple]: The matching checkpoint tuples.
+
+        """
+        clauses, params = [], []
+        if config:
+            clauses.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                clauses.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                clauses.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before and (before_checkpoint_id := get_checkpoint_id(before)):
+            clauses.append("checkpoint_id < ?")
+            params.append(before_checkpoint_id)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"{self._SELECT_CHECKPOINT}{where} ORDER BY checkpoint_id DESC", params
+            ).fetchall()
+
+        for row in rows:
+            if limit is not None and limit <= 0:
+                break
+
+            if filter:
+                metadata = self.serde.loads_typed((row[6], row[7]))
+                if not all(metadata.get(key) == value for key, value in filter.items()):
+                    continue
+
+            if limit is not None:
+                limit -= 1
+
+            with self._lock:
+                checkpoint_tuple = self._build_tuple(row)
+            yield checkpoint_tuple
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Save a checkpoint, and the channel versions it introduced, to the database.
+
+        Args:
+            config: The config to associate with the checkpoint.
+            checkpoint: The checkpoint to save.
+            metadata: Additional metadata to save with the checkpoint.
+            new_versions: New versions as of this write.
+
+        Returns:
+            RunnableConfig: The updated config containing the saved checkpoint's id.
+
+        """
+        checkpoint = checkpoint.copy()
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        values: dict[str, Any] = checkpoint.pop("channel_values")  # type: ignore[misc]
+
+        with self._lock, self._conn:
+            for channel, version in new_versions.items():
+                if channel in values:
+                    type_, blob, base_version = self._encode_blob(
+                        thread_id, checkpoint_ns, channel, str(version), values[channel]
+                    )
+                else:
+                    type_, blob, base_version = "empty", b"", None
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        channel,
+                        str(version),
+                        type_,
+                        blob,
+                        base_version,
+                    ),
+                )
+
+            type_, checkpoint_blob = self.serde.dumps_typed(checkpoint)
+            metadata_type, metadata_blob = self.serde.dumps_typed(
+                get_checkpoint_metadata(config, metadata)
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint["id"],
+                    config["configurable"].get("checkpoint_id"),
+                    json.dumps(checkpoint["channel_versions"]),
+                    type_,
+                    checkpoint_blob,
+                    metadata_type,
+                    metadata_blob,
+                ),
+            )
+
+        self._schedule_compaction(thread_id, checkpoint_ns)
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Save the writes of a task to the database.
+
+        Args:
+            config: The config to associate with the writes.
+            writes: The writes to save, each as a (channel, value) pair.
+            task_id: Identifier for the task creating the writes.
+            task_path: Path of the task creating the writes.
+
+        """
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+
+        with self._lock, self._conn:
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                # Regular writes are only saved once, special writes are replaced.
+                verb = "INSERT OR IGNORE" if write_idx >= 0 else "INSERT OR REPLACE"
+                type_, blob = self.serde.dumps_typed(value)
+                self._conn.execute(
+                    f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint_id,
+                        task_id,
+                        write_idx,
+                        channel,
+                        type_,
+                        blob,
+                        task_path,
+                    ),
+                )
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints, writes and blobs of a thread.
+
+        Args:
+            thread_id: The thread ID to delete.
+
+        """
+        with self._lock, self._conn:
+            for table in ("checkpoints", "blobs", "writes"):
+                self._conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id = ?",
+                    (thread_id,),
+                )
+            self._forget(thread_id)
+
+    def _delete_namespace(self, thread_id: str, checkpoint_ns: str) -> None:
+        """Delete all checkpoints, writes and blobs of a thread's namespace."""
+        for table in ("checkpoints", "blobs", "writes"):
+            self._conn.execute(
+                f"DELETE FROM {table} WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns),
+            )
+        self._forget(thread_id, checkpoint_ns)
+
+    def _forget(self, thread_id: str, checkpoint_ns: str | None = None) -> None:
+        """Drop the delta bases and put counts of a deleted thread, or namespace."""
+        for key in [
+            key
+            for key in self._latest
+            if key[0] == thread_id and checkpoint_ns in (None, key[1])
+        ]:
+            del self._latest[key]
+        # The put counts are updated outside the lock, so they're copied first.
+        for key in list(self._puts):
+            if key[0] == thread_id and checkpoint_ns in (None, key[1]):
+                self._puts.pop(key, None)
+
+    def recent_thread_ids(self, limit: int = 5) -> list[str]:
+        """Return the threads with the most recent root checkpoints, newest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT thread_id FROM checkpoints WHERE checkpoint_ns = ''"
+                " GROUP BY thread_id ORDER BY MAX(checkpoint_id) DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [thread_id for (thread_id,) in rows]
+
+    def prune_threads(self) -> None:
+        """Delete the threads older than the `max_threads` most recent ones."""
+        try:
+            with self._lock:
+                stale = self._conn.execute(
+                    "SELECT thread_id FROM checkpoints GROUP BY thread_id"
+                    " ORDER BY MAX(checkpoint_id) DESC LIMIT -1 OFFSET ?",
+                    (self.max_threads,),
+                ).fetchall()
+            for (thread_id,) in stale:
+                self.delete_thread(thread_id)
+
+            if stale:
+                logger.debug("Pruned %d old checkpoint thread(s).", len(stale))
+        except sqlite3.Error as err:
+            logger.error("Checkpoint thread pruning failed: %r", err)
+
+    def _prune_namespaces(self, thread_id: str) -> int:
+        """Delete the subgraph namespaces older than the thread's root checkpoints.
+
+        Every subgraph run checkpoints in a namespace of its own, which no remaining
+        root checkpoint can go back to once it ended before the oldest of them.
+
+        Returns:
+            int: The number of deleted namespaces.
+
+        """
+        stale = self._conn.execute(
+            "SELECT checkpoint_ns FROM checkpoints WHERE thread_id = ? AND"
+            " checkpoint_ns != '' GROUP BY checkpoint_ns HAVING MAX(checkpoint_id) <"
+            " (SELECT MIN(checkpoint_id) FROM checkpoints WHERE thread_id = ? AND"
+            " checkpoint_ns = '')",
+            (thread_id, thread_id),
+        ).fetchall()
+        for (checkpoint_ns,) in stale:
+            self._delete_namespace(thread_id, checkpoint_ns)
+        return len(stale)
+
+    def _schedule_compaction(self, thread_id: str, checkpoint_ns: str) -> None:
+        key = (thread_id, checkpoint_ns)
+        self._puts[key] = self._puts.get(key, 0) + 1
+
+        if self._puts[key] >= self.compact_every:
+            self._puts[key] = 0
+            self._compactor.submit(self.compact, thread_id, checkpoint_ns)
+
+    def compact(self, thread_id: str, checkpoint_ns: str) -> None:
+        """Apply the retention policy to a thread.
+
+        Checkpoints older than the last `max_checkpoints`, their writes, and the blobs
+        neither referenced by the remaining checkpoints nor used as a delta base are
+        deleted. Compacting the root namespace also deletes the subgraph namespaces
+        older than the remaining root checkpoints.
+        """
+        try:
+            with self._lock, self._conn:
+                stale = self._conn.execute(
+                    "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND"
+                    " checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?",
+                    (thread_id, checkpoint_ns, self.max_checkpoints),
+                ).fetchall()
+                if not stale:
+                    return
+
+                for (checkpoint_id,) in stale:
+                    for table in ("checkpoints", "writes"):
+                        self._conn.execute(
+                            f"DELETE FROM {table} WHERE thread_id = ? AND"
+                            " checkpoint_ns = ? AND checkpoint_id = ?",
+                            (thread_id, checkpoint_ns, checkpoint_id),
+                        )
+
+                referenced = set()
+                for (channel_versions,) in self._conn.execute(
+                    "SELECT channel_versions FROM checkpoints WHERE thread_id = ? AND"
+                    " checkpoint_ns = ?",
+                    (thread_id, checkpoint_ns),
+                ):
+                    referenced.update(
+                        (channel, str(version))
+                        for channel, version in json.loads(channel_versions).items()
+                    )
+
+                bases = {
+                    (channel, version): base_version
+                    for channel, version, base_version in self._conn.execute(
+                        "SELECT channel, version, base_version FROM blobs WHERE"
+                        " thread_id = ? AND checkpoint_ns = ?",
+                        (thread_id, checkpoint_ns),
+                    )
+                }
+                keep = set()
+                for channel, version in referenced:
+                    key = (channel, version)
+                    while key in bases and key not in keep:
+                        keep.add(key)
+                        if bases[key] is None:
+                            break
+                        key = (channel, bases[key])
+
+                self._conn.executemany(
+                    "DELETE FROM blobs WHERE thread_id = ? AND checkpoint_ns = ? AND"
+                    " channel = ? AND version = ?",
+                    [
+                        (thread_id, checkpoint_ns, channel, version)
+                        for channel, version in bases
+                        if (channel, version) not in keep
+                    ],
+                )
+
+                namespaces = 0 if checkpoint_ns else self._prune_namespaces(thread_id)
+
+            logger.debug(
+                "Compacted %d checkpoint(s) and %d namespace(s) of thread %s (%r).",
+                len(stale),
+                namespaces,
+                thread_id,
+                checkpoint_ns,
+            )
+        except sqlite3.Error as err:
+            logger.error("Checkpoint compaction failed: %r", err)
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        """Asynchronous version of `get_tuple`, run in a worker thread."""
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,  # noqa: A002
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """Asynchronous version of `list`, run in a worker thread."""
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Asynchronous version of `put`, run in a worker thread."""
+        return await asyncio.to_thread(
+            self.put, config, checkpoint, metadata, new_versions
+        )
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Asynchronous version of `put_writes`, run in a worker thread."""
+        return await asyncio.to_thread(
+            self.put_writes, config, writes, task_id, task_path
+        )
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """Asynchronous version of `delete_thread`, run in a worker thread."""
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(
+        self,
+        current: str | None,
+        channel: None,  # noqa: ARG002
+    ) -> str:
+        """Return the next, sortable, version of a channel."""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import logging
+import os
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.messages import AIMessage, SystemMessage, ToolMessage
+from langchain_core.messages.utils import count_tokens_approximately
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+# Tools returning a copy of a file, and the tools modifying a file.
+FILE_READ_TOOLS = {"read_file", "read_files"}
+FILE_WRITE_TOOLS = {
+    "translator_write_file",
+    "update_file_content",
+    "insert_file_content",
+    "delete_file_content",
+    "apply_patch",
+}
+# Tools which only inspect the project.
+READ_ONLY_TOOLS = FILE_READ_TOOLS | {
+    "list_directory",
+    "get_current_directory",
+    "get_command_history",
+    "read_tool_output",
+}
+
+
+def written_paths(name: str, args: dict[str, Any]) -> list[str]:
+    """Return the files a file write tool call modifies, normalized."""
+    from speech_cli.core.tools import patch_paths
+
+    if name not in FILE_WRITE_TOOLS:
+        return []
+    if name == "apply_patch":
+        # A patch modifies the files it names, rather than a `path`.
+        patch = args.get("patch")
+        paths = patch_paths(patch) if isinstance(patch, str) else []
+    else:
+        paths = [args["path"]] if isinstance(args.get("path"), str) else []
+    return [os.path.normpath(path) for path in paths]
+
+
+def _count_tokens(message: BaseMessage) -> int:
+    return count_tokens_approximately([message])
+
+
+def _excerpt(content: str, keep_chars: int) -> str:
+    """Keep the head and tail of a tool result, noting how much was elided."""
+    if len(content) <= keep_chars * 2:
+        return content
+
+    elided = len(content) - keep_chars * 2
+    return (
+        f"{content[:keep_chars]}\n[... {elided} characters elided from this older"
+        f" tool result ...]\n{content[-keep_chars:]}"
+    )
+
+
+class ContextManager:
+    """Fit an agent's messages into a token budget, before every llm call.
+
+    System messages, the first user message (the brief or the HLC) and the
+    `keep_recent` most recent messages are always sent verbatim. Older messages
+    are compacted, oldest first:
+
+    1. Copies of files that were re-read or modified since are dropped.
+    2. If the messages are still over budget, older tool results are cut down to
+       their head and tail.
+
+    Messages are never removed, only their content is replaced, so every tool
+    call keeps its tool result.
+
+    The providers cache the prompt prefix of the previous call, so the messages
+    are only compacted when a boundary, every `step` messages, is crossed, down to
+    `low_water` of the budget to leave room for the messages until the next
+    boundary. The crossed boundaries are replayed in turn, so a message compacted
+    at a boundary stays the same afterwards, and the compacted prefix only
+    changes when the next boundary is crossed.
+
+    Args:
+        max_tokens (int): The token budget for the messages.
+        keep_recent (int, optional): Number of recent messages kept verbatim.
+        excerpt_chars (int, optional): Characters kept from both ends of an elided
+            tool result.
+
+    """
+
+    # The messages between compaction boundaries.
+    step: int = 8
+    # The share of the budget the messages are compacted down to at a boundary.
+    low_water: float = 0.75
+
+    def __init__(self, max_tokens: int, keep_recent: int = 8, excerpt_chars: int = 400):
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.excerpt_chars = excerpt_chars
+
+    def compact(self, messages: list[BaseMessage]) -> list[BaseMessage]:
+        """Return the messages, compacted to fit the token budget."""
+        messages = list(messages)
+        tokens = [_count_tokens(message) for message in messages]
+        initial_total = sum(tokens)
+        compactable = self._compactable(messages)
+        compacted: set[int] = set()
+
+        last = max(0, len(messages) - self.keep_recent) // self.step * self.step
+        for boundary in range(self.step, last + 1, self.step):
+            # The messages seen when the boundary was crossed, with their recent
+            # ones, so the compaction at a boundary never changes afterwards.
+            seen = boundary + self.keep_recent
+            candidates = [
+                index
+                for index in compactable
+                if index < boundary and index not in compacted
+            ]
+            for index, path in self._stale_file_copies(messages[:seen], candidates):
+                messages[index] = messages[index].model_copy(
+                    update={
+                        "content": f"[Outdated copy of {path} elided, re-read or"
+                        " modified later.]"
+                    }
+                )
+                tokens[index] = _count_tokens(messages[index])
+                compacted.add(index)
+
+            self._cut_results(
+                messages,
+                tokens,
+                [index for index in candidates if index not in compacted],
+                compacted,
+                limit=sum(tokens[:seen]) - int(self.max_tokens * self.low_water),
+            )
+
+        # Recent messages outgrowing the room left at the last boundary, compact the
+        # messages since as well, at the cost of the cached prefix.
+        self._cut_results(
+            messages,
+            tokens,
+            [index for index in compactable if index not in compacted],
+            compacted,
+            limit=sum(tokens) - self.max_tokens,
+        )
+
+        total = sum(tokens)
+        if total != initial_total:
+            logger.debug(
+                "Compacted the context from %d to %d tokens (budget %d).",
+                initial_total,
+                total,
+                self.max_tokens,
+            )
+        return messages
+
+    def _cut_results(
+        self,
+        messages: list[BaseMessage],
+        tokens: list[int],
+        candidates: list[int],
+        compacted: set[int],
+        limit: int,
+    ):
+        """Cut tool results down to their head and tail, until `limit` tokens saved."""
+        for index in candidates:
+            if limit <= 0:
+                break
+
+            message = messages[index]
+            if not isinstance(message, ToolMessage) or not isinstance(
+                message.content, str
+            ):
+                continue
+
+            excerpt = _excerpt(message.content, self.excerpt_chars)
+            if excerpt == message.content:
+                continue
+            messages[index] = message.model_copy(update={"content": excerpt})
+            new_tokens = _count_tokens(messages[index])
+            limit -= tokens[index] - new_tokens
+            tokens[index] = new_tokens
+            compacted.add(index)
+
+    def _compactable(self, messages: list[BaseMessage]) -> list[int]:
+        """Indexes of the messages that may be compacted, oldest first."""
+        first_user_message = next(
+            (
+                index
+                for index, message in enumerate(messages)
+                if not isinstance(message, SystemMessage)
+            ),
+            None,
+        )
+        recent = max(0, len(messages) - self.keep_recent)
+
+        return [
+            index
+            for index, message in enumerate(messages[:recent])
+            if index != first_user_message and not isinstance(message, SystemMessage)
+        ]
+
+    def _stale_file_copies(
+        self, messages: list[BaseMessage], candidates: list[int]
+    ) -> list[tuple[int, str]]:
+        """Find file reads followed by a write, or the same read, of the files."""
+        tool_calls = {
+            tool_call["id"]: tool_call
+            for message in messages
+            if isinstance(message, AIMessage)
+            for tool_call in message.tool_calls
+        }
+
+        stale = []
+        # Files modified or fully read later on, and the line ranges read later on.
+        superseded: set[str] = set()
+        read_ranges: set[tuple[str, int | None, int | None]] = set()
+        compactable = set(candidates)
+
+        for index in range(len(messages) - 1, -1, -1):
+            message = messages[index]
+            if not isinstance(message, ToolMessage):
+                continue
+            tool_call = tool_calls.get(message.tool_call_id)
+            if tool_call is None:
+                continue
+
+            name, args = tool_call["name"], tool_call["args"]
+            if name in FILE_READ_TOOLS:
+                reads = _file_reads(name, args)
+                if (
+                    index in compactable
+                    and reads
+                    and all(
+                        read[0] in superseded or read in read_ranges for read in reads
+                    )
+                ):
+                    stale.append((index, ", ".join(read[0] for read in reads)))
+
+                read_ranges.update(reads)
+                superseded.update(path for path, start, _ in reads if start is None)
+            else:
+                superseded.update(written_paths(name, args))
+
+        return stale
+
+
+def _file_reads(
+    name: str, args: dict[str, Any]
+) -> list[tuple[str, int | None, int | None]]:
+    """Return the files, and line ranges, a read tool call returns copies of.
+
+    Reads returning files unknown from their arguments, e.g. glob patterns, return
+    none, so they're never taken for outdated.
+    """
+    from speech_cli.core.tools import is_glob, split_range
+
+    if name == "read_files":
+        paths = args.get("paths")
+        if not isinstance(paths, list) or not all(isinstance(p, str) for p in paths):
+            return []
+        reads = [split_range(path) for path in paths]
+        if any(is_glob(path) for path, _, _ in reads):
+            return []
+        return [(os.path.normpath(path), start, end) for path, start, end in reads]
+
+    if not isinstance(args.get("path"), str):
+        return []
+    path, start, end = args["path"], args.get("start_row"), args.get("end_row")
+    if start is None:
+        return [(os.path.normpath(path), None, None)]
+    # A single line is read without an end row.
+    return [(os.path.normpath(path), start, start if end is None else end)]
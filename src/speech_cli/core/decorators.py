@@ -1,20 +1,104 @@
 from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
 
 from langchain_core.runnables import RunnableConfig
-from langchain_core.tools import BaseTool
-from langchain_core.tools import tool as create_tool
-from langgraph.prebuilt.interrupt import HumanInterrupt, HumanInterruptConfig
+from langchain_core.tools import BaseTool, StructuredTool
+from langgraph.prebuilt.interrupt import (
+    HumanInterrupt,
+    HumanInterruptConfig,
+    HumanResponse,
+)
 from langgraph.types import interrupt
 
+from speech_cli.config import app_config
+from speech_cli.core.approval import (
+    ApprovalRule,
+    get_approval_policy,
+    record_decision,
+)
+from speech_cli.core.tools import as_async_tool
+
+# A review decision, the tool input to call the tool with, or None and the response
+# to return instead.
+Decision = tuple[dict[str, Any] | None, Any]
+
+# The decision on the tool call run by the current task, when reviewed beforehand
+# with the other calls of its turn, see `ToolExecutor`.
+reviewed_call: ContextVar[Decision | None] = ContextVar("reviewed_call", default=None)
+
+
+class ReviewedTool(StructuredTool):
+    """A tool whose calls are reviewed by a human, or by the approval rules."""
+
+    interrupt_config: dict[str, bool]
+
+    def match(self, tool_input: dict[str, Any]) -> ApprovalRule | None:
+        """Return the `approval_rules` config rule deciding a call, if any."""
+        rule = get_approval_policy(app_config.approval_rules).match(
+            self.name, tool_input
+        )
+        if rule is None or not self.interrupt_config.get(f"allow_{rule.decision}"):
+            return None
+        return rule
+
+    def rule_decision(self, tool_input: dict[str, Any], rule: ApprovalRule) -> Decision:
+        """Decide a call with a matching approval rule, recording the decision."""
+        record_decision(self.name, tool_input, rule.decision, rule)
+        if rule.decision == "accept":
+            return tool_input, None
+        return None, (
+            False,
+            rule.reason or "The approval rules rejected this tool call.",
+        )
+
+    def request(self, tool_input: dict[str, Any]) -> HumanInterrupt:
+        """Make the review request of a call."""
+        return {
+            "action_request": {"action": self.name, "args": tool_input},
+            "config": self.interrupt_config,
+            "description": f"Agent wants to call the tool: [b]'{self.name}'[/b]",
+        }
+
+    @staticmethod
+    def decision(tool_input: dict[str, Any], response: HumanResponse) -> Decision:
+        """Turn the review response of a call into a decision."""
+        # approve the tool call
+        if response["type"] == "accept":
+            return tool_input, None
+        # update tool call args
+        if response["type"] == "edit":
+            return response["args"]["args"], None
+        # respond to the LLM with user feedback
+        if response["type"] == "response":
+            return None, response["args"]
+        if response["type"] == "ignore":
+            return None, (False, "User cancelled this tool call.")
+        raise ValueError(f"Unsupported interrupt response type: {response['type']}")
+
+    def review(self, tool_input: dict[str, Any]) -> Decision:
+        """Decide a call, asking for its review unless decided beforehand."""
+        if (decision := reviewed_call.get()) is not None:
+            return decision
+        if (rule := self.match(tool_input)) is not None:
+            return self.rule_decision(tool_input, rule)
+
+        response = interrupt([self.request(tool_input)])[0]
+        return self.decision(tool_input, response)
+
 
 def add_human_in_the_loop(
     tool: Callable | BaseTool,
     *,
     interrupt_config: HumanInterruptConfig = None,
 ) -> BaseTool:
-    """Wrap a tool to support human-in-the-loop review."""
-    if not isinstance(tool, BaseTool):
-        tool = create_tool(tool)
+    """Wrap a tool to support human-in-the-loop review.
+
+    The reviewed tool keeps the tool's async variant, for async graphs. Calls
+    matching the `approval_rules` config are decided without a review, and the
+    `ToolExecutor` reviews the calls of a turn together.
+    """
+    tool = as_async_tool(tool)
 
     if interrupt_config is None:
         interrupt_config = {
@@ -24,30 +108,24 @@ def add_human_in_the_loop(
             "allow_ignore": True,
         }
 
-    @create_tool(tool.name, description=tool.description, args_schema=tool.args_schema)
     def call_tool_with_interrupt(config: RunnableConfig, **tool_input):
-        request: HumanInterrupt = {
-            "action_request": {"action": tool.name, "args": tool_input},
-            "config": interrupt_config,
-            "description": f"Agent wants to call the tool: [b]'{tool.name}'[/b]",
-        }
-        response = interrupt([request])[0]
-        # approve the tool call
-        if response["type"] == "accept":
-            tool_response = tool.invoke(tool_input, config)
-        # update tool call args
-        elif response["type"] == "edit":
-            tool_input = response["args"]["args"]
-            tool_response = tool.invoke(tool_input, config)
-        # respond to the LLM with user feedback
-        elif response["type"] == "response":
-            user_feedback = response["args"]
-            tool_response = user_feedback
-        elif response["type"] == "ignore":
-            tool_response = (False, "User cancelled this tool call.")
-        else:
-            raise ValueError(f"Unsupported interrupt response type: {response['type']}")
+        tool_input, tool_response = reviewed.review(tool_input)
+        if tool_input is None:
+            return tool_response
+        return tool.invoke(tool_input, config)
 
-        return tool_response
+    async def acall_tool_with_interrupt(config: RunnableConfig, **tool_input):
+        tool_input, tool_response = reviewed.review(tool_input)
+        if tool_input is None:
+            return tool_response
+        return await tool.ainvoke(tool_input, config)
 
-    return call_tool_with_interrupt
+    reviewed = ReviewedTool.from_function(
+        func=call_tool_with_interrupt,
+        coroutine=acall_tool_with_interrupt,
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        interrupt_config=dict(interrupt_config),
+    )
+    return reviewed
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from speech_cli.core.workdir import project_root
+
+if TYPE_CHECKING:
+    from os import stat_result
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def _version(stat: stat_result) -> tuple[int, int, int]:
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def split_lines(text: str) -> list[str]:
+    """Split a text into its lines, with their line endings, at LF only.
+
+    Unlike `str.splitlines`, a CR, form feed or other line separator doesn't end a
+    line, so the lines agree with the line index of large files, and with patches.
+    """
+    lines = text.split("\n")
+    last = lines.pop()
+    return [f"{line}\n" for line in lines] + ([last] if last else [])
+
+
+class FileCache:
+    """The split lines of the files the file tools work on, shared by the tools.
+
+    An edit loop reads, modifies and reads a file again and again. The lines of a
+    file are kept once read, and the file tools write their changes through the
+    cache, so the next tool call on the file neither reads nor splits it again.
+
+    A cached file is checked against its modification time, size and inode on
+    every read, so changes made outside the tools, e.g. by a terminal command, are
+    read again. The least recently used files are evicted once the cache
+    outgrows its size.
+
+    Args:
+        max_bytes (int): The maximum size of the cached lines.
+
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Path, tuple[tuple[int, int, int], list[str]]] = (
+            OrderedDict()
+        )
+        self._sizes: dict[Path, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def read(self, path: Path) -> list[str]:
+        """Return the lines of a file, with their line endings as in the file.
+
+        The lines are a copy, free to modify, and write back with `write`.
+
+        Raises:
+            OSError: If the file can't be read.
+            UnicodeDecodeError: If the file isn't UTF-8 text.
+
+        """
+        key = path.resolve()
+        version = _version(key.stat())
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(entry[1])
+            self.misses += 1
+
+        lines = split_lines(key.read_text(encoding="utf-8", newline=""))
+        self._put(key, version, lines)
+        return list(lines)
+
+    def write(self, path: Path, lines: list[str]):
+        """Write the lines of a file, through the cache."""
+        path.write_text("".join(lines), encoding="utf-8", newline="")
+        self.store(path, lines)
+
+    def store(self, path: Path, lines: list[str]):
+        """Cache the lines of a file, just written by a tool."""
+        key = path.resolve()
+        self._put(key, _version(key.stat()), list(lines))
+
+    def discard(self, path: Path):
+        """Forget a file, e.g. appended to or deleted by a tool."""
+        with self._lock:
+            self._remove(path.resolve())
+
+    def stats(self) -> dict[str, float]:
+        """Return the cache's hits, misses, hit rate, cached files and bytes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "files": len(self._entries),
+                "bytes": self._size,
+            }
+
+    def _put(self, key: Path, version: tuple[int, int, int], lines: list[str]):
+        size = sum(map(len, lines))
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (version, lines)
+            self._sizes[key] = size
+            self._size += size
+            while self._size > self.max_bytes:
+                evicted = next(iter(self._entries))
+                logger.debug("Evicting %s from the file cache.", evicted)
+                self._remove(evicted)
+
+    def _remove(self, key: Path):
+        if self._entries.pop(key, None) is not None:
+            self._size -= self._sizes.pop(key)
+
+
+_registry: dict[Path, FileCache] = {}
+
+
+def get_file_cache(max_mb: int) -> FileCache:
+    """Return the file cache of the current project."""
+    root = project_root()
+    if root not in _registry:
+        _registry[root] = FileCache(max_mb * 1024 * 1024)
+
+    return _registry[root]
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from enum import StrEnum
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+_SERVER_ERROR_STATUS = 500
+
+# Hosts used when a provider is configured without an explicit base url.
+_PROVIDER_HOSTS = {
+    "google_genai": "generativelanguage.googleapis.com",
+    "openai": "api.openai.com",
+    "anthropic": "api.anthropic.com",
+}
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when calls to a provider are short-circuited after repeated failures."""
+
+
+class CircuitState(StrEnum):
+    """The states of a provider circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+def is_provider_failure(err: BaseException) -> bool:
+    """Check if an llm call error says something about the provider's health.
+
+    Transport errors (connection, timeout) and server side errors (5xx) count as
+    failures, while client errors like an invalid request do not.
+    """
+    if isinstance(err, ConnectionError | TimeoutError | asyncio.TimeoutError):
+        return True
+
+    status_code = getattr(err, "status_code", None) or getattr(
+        getattr(err, "response", None), "status_code", None
+    )
+    if isinstance(status_code, int):
+        return status_code >= _SERVER_ERROR_STATUS
+
+    return any(
+        "Connection" in klass.__name__ or "Timeout" in klass.__name__
+        for klass in type(err).__mro__
+    )
+
+
+class ProviderHealth:
+    """Passively track the health of a model provider.
+
+    Health is worked out from the outcome of the real llm calls, so no extra
+    request is made per call. After `failure_threshold` consecutive failures the
+    circuit opens and calls fail fast until `reset_timeout` elapses, then a single
+    trial call is let through (half open) to decide whether to close the circuit.
+
+    An async connectivity probe is only run when a call fails, to tell an offline
+    user apart from an unhealthy provider, and its result is cached for
+    `probe_ttl` seconds.
+    """
+
+    failure_threshold: int = 3
+    reset_timeout: float = 30.0
+    probe_ttl: float = 30.0
+    probe_timeout: float = 5.0
+
+    def __init__(self, provider: str, host: str | None = None):
+        self.provider = provider
+        self.host = host or _PROVIDER_HOSTS.get(provider)
+
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+        self._probe_result: bool | None = None
+        self._probe_checked_at = 0.0
+        self._probe_lock = asyncio.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        """The current circuit state, moving from open to half open when due."""
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._trial_in_flight = False
+        return self._state
+
+    def before_call(self) -> None:
+        """Fail fast if the circuit is open.
+
+        Raises:
+            CircuitOpenError: If the provider is considered unhealthy.
+
+        """
+        state = self.state
+        if state is CircuitState.OPEN or (
+            state is CircuitState.HALF_OPEN and self._trial_in_flight
+        ):
+            elapsed = time.monotonic() - self._opened_at
+            retry_in = max(0.0, self.reset_timeout - elapsed)
+            raise CircuitOpenError(
+                f"Provider {self.provider} is unavailable, retry in {retry_in:.0f}s."
+            )
+
+        if state is CircuitState.HALF_OPEN:
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        """Record a successful call, closing the circuit."""
+        if self._state is not CircuitState.CLOSED:
+            logger.debug("Closing the circuit for provider %s.", self.provider)
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self, err: BaseException) -> None:
+        """Record a failed call, opening the circuit if the threshold is reached."""
+        if not is_provider_failure(err):
+            # The provider answered, so it is reachable.
+            self._trial_in_flight = False
+            return
+
+        self._failures += 1
+        self._trial_in_flight = False
+
+        if (
+            self._state is CircuitState.HALF_OPEN
+            or self._failures >= self.failure_threshold
+        ):
+            logger.debug(
+                "Opening the circuit for provider %s after %d failure(s).",
+                self.provider,
+                self._failures,
+            )
+            self._state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def record_cancelled(self) -> None:
+        """Record a call cancelled before its outcome, freeing the trial call slot.
+
+        A cancelled trial says nothing about the provider, so the next call is let
+        through as the trial instead.
+        """
+        self._trial_in_flight = False
+
+    async def connected(self) -> bool:
+        """Check, without blocking the event loop, if the provider host is reachable.
+
+        The result is cached for `probe_ttl` seconds and concurrent callers share a
+        single probe.
+        """
+        async with self._probe_lock:
+            if (
+                self._probe_result is not None
+                and time.monotonic() - self._probe_checked_at < self.probe_ttl
+            ):
+                return self._probe_result
+
+            self._probe_result = await self._probe()
+            self._probe_checked_at = time.monotonic()
+            return self._probe_result
+
+    async def _probe(self) -> bool:
+        """Open, then close a tcp connection to the provider host."""
+        if not self.host:
+            return True
+
+        try:
+            _reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, 443), timeout=self.probe_timeout
+            )
+        except (OSError, TimeoutError) as err:
+            logger.debug("Connectivity probe to %s failed: %r", self.host, err)
+            return False
+
+        writer.close()
+        with contextlib.suppress(OSError):
+            await writer.wait_closed()
+        return True
+
+
+_registry: dict[str, ProviderHealth] = {}
+
+
+def get_provider_health(provider: str, base_url: str | None = None) -> ProviderHealth:
+    """Return the shared health tracker for a provider (and base url)."""
+    host = urlparse(base_url).hostname if base_url else None
+    key = f"{provider}:{host}" if host else provider
+
+    if key not in _registry:
+        _registry[key] = ProviderHealth(provider, host)
+
+    return _registry[key]
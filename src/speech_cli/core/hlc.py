@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class HLCError(ValueError):
+    """Raised when an HLC document can't be parsed into a translation plan."""
+
+
+def content_hash(obj: Any) -> str:
+    """Hash a JSON serializable object, regardless of its key order."""
+    canonical = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def parse_hlc(content: str) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Parse an HLC document into its entry level and top level objects.
+
+    Raises:
+        HLCError: If the document isn't a JSON array starting with the entry
+            level and top level objects.
+
+    """
+    try:
+        hlc = json.loads(content)
+    except (TypeError, json.JSONDecodeError) as err:
+        raise HLCError(f"HLC isn't valid JSON: {err}") from err
+
+    if (
+        not isinstance(hlc, list)
+        or len(hlc) < 2  # noqa: PLR2004
+        or not all(isinstance(obj, dict) for obj in hlc[:2])
+    ):
+        raise HLCError("HLC must start with the entry level and top level objects.")
+
+    return hlc[0], hlc[1]
+
+
+def _mentions(name: str) -> re.Pattern[str]:
+    """Match a node name as a whole identifier, e.g. USER_AUTH but not USER_AUTH2."""
+    return re.compile(rf"(?<![\w-]){re.escape(name)}(?![\w-])")
+
+
+def _names(node: dict[str, Any]) -> set[str]:
+    """Collect the names of a node and all its descendants."""
+    names = {node["name"]} if isinstance(node.get("name"), str) else set()
+    for linker in node.get("linkers") or []:
+        if isinstance(linker, dict) and isinstance(linker.get("value"), dict):
+            names |= _names(linker["value"])
+    return names
+
+
+@dataclass
+class TranslationUnit:
+    """An independent subtree of the top level object, translated by one worker."""
+
+    name: str
+    """The name of the subtree root node."""
+
+    linker: dict[str, Any]
+    """The top level linker holding the subtree."""
+
+    depends_on: list[str] = field(default_factory=list)
+    """Earlier units which must be translated first, as this subtree mentions them."""
+
+    def brief(self, entry_level: dict[str, Any], top_level: dict[str, Any]) -> str:
+        """Return the worker's brief, with the project context and its subtree."""
+        context = {key: top_level.get(key) for key in ("name", "type", "prompt")}
+        return (
+            "The project foundation has already been set up for the following"
+            f" entry level object:\n{json.dumps(entry_level, indent=2)}\n\nIt is"
+            f" part of the top level object:\n{json.dumps(context, indent=2)}\n\n"
+            + (
+                f"The components {', '.join(self.depends_on)} have already been"
+                " implemented, build on them.\n\n"
+                if self.depends_on
+                else ""
+            )
+            + "Implement only the following component, linked to the top level"
+            f" object:\n{json.dumps(self.linker, indent=2)}"
+        )
+
+
+@dataclass
+class TranslationPlan:
+    """A dependency ordered plan for translating an HLC document in parallel.
+
+    The foundation (the entry level object and the top level object's own prompt)
+    is translated first, the top level linker subtrees are then translated
+    concurrently, and a final integration pass wires them up.
+
+    Units are added in document order, and only depend on the earlier units they
+    mention by name, so a plan can be built while the HLC is still being generated
+    and a unit never waits for a later one.
+    """
+
+    entry_level: dict[str, Any]
+    top_level: dict[str, Any]
+    units: list[TranslationUnit] = field(default_factory=list)
+
+    @classmethod
+    def from_hlc(cls, content: str) -> TranslationPlan:
+        """Build the translation plan of a complete HLC document.
+
+        Raises:
+            HLCError: If the document can't be parsed.
+
+        """
+        entry_level, top_level = parse_hlc(content)
+
+        plan = cls(entry_level, top_level)
+        for linker in top_level.get("linkers") or []:
+            plan.add_unit(linker)
+        return plan
+
+    def add_unit(self, linker: Any) -> TranslationUnit:
+        """Add the next top level linker subtree to the plan.
+
+        Raises:
+            HLCError: If the linker has no object value.
+
+        """
+        index = len(self.units)
+        value = linker.get("value") if isinstance(linker, dict) else None
+        if not isinstance(value, dict):
+            raise HLCError(f"Top level linker {index} has no object value.")
+
+        # Unnamed, or duplicate, subtrees are named by their content rather than
+        # their position, so inserting a linker doesn't rename the ones after it.
+        names = {unit.name for unit in self.units}
+        name = value.get("name") or linker.get("name", "linker")
+        if not value.get("name") or name in names:
+            name = f"{name}-{content_hash(linker)[:8]}"
+        # Identical subtrees are numbered in document order.
+        unique, count = name, 1
+        while unique in names:
+            count += 1
+            unique = f"{name}-{count}"
+
+        text = json.dumps(linker)
+        own_names = _names(value)
+        unit = TranslationUnit(
+            unique,
+            linker,
+            [
+                other.name
+                for other in self.units
+                if other.name not in own_names and _mentions(other.name).search(text)
+            ],
+        )
+        self.units.append(unit)
+        return unit
+
+    def foundation_spec(self) -> list[dict[str, Any]]:
+        """Return the foundation, the entry level and the top level without linkers."""
+        top_level = {
+            key: value for key, value in self.top_level.items() if key != "linkers"
+        }
+        return [self.entry_level, top_level]
+
+    def foundation_brief(self) -> str:
+        """Return the brief setting up the project, before the units are translated."""
+        return (
+            "Set up the foundation of the project described by this HLC, without"
+            " implementing its components:\n"
+            f"{json.dumps(self.foundation_spec(), indent=2)}\n\n"
+            "Check the environment, install the dependencies, scaffold the project"
+            " structure and the shared configuration. The components linked to the"
+            " top level object will be implemented afterwards by other agents. Don't"
+            " write the README yet."
+        )
+
+    def integration_brief(
+        self,
+        reports: dict[str, str],
+        removed: dict[str, list[str]] | None = None,
+        incremental: bool = False,
+    ) -> str:
+        """Return the brief for wiring the translated units together.
+
+        Args:
+            reports (dict): The final report of every translated unit.
+            removed (dict, optional): The units removed from the HLC since the last
+                build, with the files they had produced.
+            incremental (bool, optional): Whether only the changed units of an
+                already built project were translated.
+
+        """
+        summaries = (
+            "\n\n".join(f"### {name}\n{report}" for name, report in reports.items())
+            or "No component was translated."
+        )
+        removals = "".join(
+            f"\n- {name}, which produced: {', '.join(files) or 'no recorded file'}"
+            for name, files in (removed or {}).items()
+        )
+        return (
+            (
+                "The project described by the HLC below was already built. Only its"
+                " added or changed components were translated again, by concurrent"
+                " agents, the others are unchanged."
+                if incremental
+                else "The components of the project described by the HLC below were"
+                " implemented concurrently by several agents, on top of the project"
+                " foundation."
+            )
+            + f" Their reports:\n\n{summaries}\n\n"
+            + (
+                "These components were removed from the HLC, remove their files and"
+                f" any reference to them:{removals}\n\n"
+                if removals
+                else ""
+            )
+            + "Integrate the components: wire them together (routes, imports,"
+            " registrations, shared configuration), fix any conflict between them,"
+            " run the tests, then "
+            + ("update" if incremental else "write")
+            + " the README and write the final report.\n\nHLC:\n"
+            f"{json.dumps([self.entry_level, self.top_level], indent=2)}"
+        )
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import re
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from speech_cli.core.hlc import HLCError
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator
+
+    from langchain_core.messages import AIMessageChunk
+
+logger = logging.getLogger(__name__)
+
+# The tool writing the HLC, and its argument holding the HLC.
+HLC_TOOL = "generator_write_file"
+HLC_ARGUMENT = "content"
+
+_ESCAPES = {
+    '"': '"',
+    "\\": "\\",
+    "/": "/",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+}
+_HIGH_SURROGATES = range(0xD800, 0xDC00)
+# The roles of the first objects of the HLC array.
+_ROOTS = ("entry_level", "top_level")
+_ARGUMENT_VALUE = re.compile(rf'"{HLC_ARGUMENT}"\s*:\s*(["\[])')
+
+
+class HLCEvent(NamedTuple):
+    """A part of the HLC, completed while the HLC is streamed.
+
+    Kinds are `entry_level` and `top_level` (without its linkers) with the parsed
+    object, `linker` with a parsed top level linker, and `done` with the HLC text.
+    """
+
+    kind: str
+    value: Any
+
+
+class ArgumentDecoder:
+    """Incrementally extract the HLC argument, from streamed tool call arguments.
+
+    The arguments are a JSON object, whose HLC argument is either a JSON string
+    holding the HLC, decoded as it arrives, or the HLC array itself.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._quoted: bool | None = None
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        """Return the next characters of the HLC argument."""
+        if self.done:
+            return ""
+
+        self._buffer += chunk
+        if self._quoted is None:
+            match = _ARGUMENT_VALUE.search(self._buffer)
+            if not match:
+                return ""
+
+            self._quoted = match.group(1) == '"'
+            # Skip the opening quote, or keep the opening bracket.
+            self._buffer = self._buffer[
+                match.end(1) if self._quoted else match.start(1) :
+            ]
+
+        if not self._quoted:
+            text, self._buffer = self._buffer, ""
+            return text
+
+        return self._unescape()
+
+    def _unescape(self) -> str:
+        """Decode the buffered JSON string, keeping an incomplete escape buffered."""
+        raw, decoded, index = self._buffer, [], 0
+
+        while index < len(raw):
+            char = raw[index]
+            if char == '"':
+                self.done = True
+                break
+            if char != "\\":
+                decoded.append(char)
+                index += 1
+                continue
+
+            if index + 1 >= len(raw):
+                break
+            if raw[index + 1] != "u":
+                decoded.append(_ESCAPES.get(raw[index + 1], raw[index + 1]))
+                index += 2
+                continue
+
+            if index + 6 > len(raw):
+                break
+            code = int(raw[index + 2 : index + 6], 16)
+            if code in _HIGH_SURROGATES:
+                # Wait for the low surrogate of the pair.
+                if index + 12 > len(raw):
+                    break
+                if raw[index + 6 : index + 8] == "\\u":
+                    low = int(raw[index + 8 : index + 12], 16) - 0xDC00
+                    decoded.append(chr(0x10000 + ((code - 0xD800) << 10) + low))
+                    index += 12
+                    continue
+
+            decoded.append(chr(code))
+            index += 6
+
+        self._buffer = raw[index:]
+        return "".join(decoded)
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError as err:
+        raise HLCError(f"Malformed HLC part: {err}") from err
+
+
+class HLCStreamParser:
+    """Incrementally parse an HLC document, emitting its parts as they complete.
+
+    Only the structure is tracked while scanning, each completed part is then
+    parsed on its own. The top level object is emitted without its linkers, as
+    soon as its `linkers` array starts, and every top level linker once complete.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.done = False
+        self._position = 0
+        # The open containers, as (start position, role).
+        self._stack: list[tuple[int, str]] = []
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        # The last string of the top level object, and its position.
+        self._last_string: tuple[str, int] | None = None
+        self._root_objects = 0
+        self._top_level_sent = False
+
+    def feed(self, chunk: str) -> list[HLCEvent]:
+        """Scan the next characters of the HLC, returning the completed parts.
+
+        Raises:
+            HLCError: If a completed part isn't valid JSON.
+
+        """
+        events = []
+        self.text += chunk
+
+        while self._position < len(self.text) and not self.done:
+            char = self.text[self._position]
+            if self._in_string:
+                self._scan_string(char)
+            elif char == '"':
+                self._in_string = True
+                self._string_start = self._position
+            elif char in "{[":
+                events.extend(self._open(char))
+            elif char in "}]" and self._stack:
+                events.extend(self._close())
+            elif char not in " \t\r\n:":
+                self._last_string = None
+            self._position += 1
+
+        return events
+
+    def _scan_string(self, char: str) -> None:
+        if self._escaped:
+            self._escaped = False
+        elif char == "\\":
+            self._escaped = True
+        elif char == '"':
+            self._in_string = False
+            if self._stack and self._stack[-1][1] == "top_level":
+                string = self.text[self._string_start + 1 : self._position]
+                self._last_string = (string, self._string_start)
+
+    def _open(self, char: str) -> list[HLCEvent]:
+        events = []
+        parent = self._stack[-1][1] if self._stack else None
+        role = ""
+        if parent is None and char == "[":
+            role = "root"
+        elif parent == "root" and char == "{" and self._root_objects < len(_ROOTS):
+            role = _ROOTS[self._root_objects]
+        elif (
+            parent == "top_level"
+            and char == "["
+            and self._last_string
+            and self._last_string[0] == "linkers"
+        ):
+            role = "linkers"
+            events = self._top_level_head(self._last_string[1])
+        elif parent == "linkers" and char == "{":
+            role = "linker"
+
+        self._stack.append((self._position, role))
+        self._last_string = None
+        return events
+
+    def _close(self) -> list[HLCEvent]:
+        start, role = self._stack.pop()
+        self._last_string = None
+        if self._stack and self._stack[-1][1] == "root":
+            self._root_objects += 1
+
+        text = self.text[start : self._position + 1]
+        if role == "root":
+            self.done = True
+            return [HLCEvent("done", self.text[: self._position + 1])]
+        if role == "entry_level":
+            return [HLCEvent("entry_level", _loads(text))]
+        if role == "top_level" and not self._top_level_sent:
+            self._top_level_sent = True
+            top_level = _loads(text)
+            top_level.pop("linkers", None)
+            return [HLCEvent("top_level", top_level)]
+        if role == "linker":
+            return [HLCEvent("linker", _loads(text))]
+        return []
+
+    def _top_level_head(self, linkers_key: int) -> list[HLCEvent]:
+        """Emit the top level object, from its keys preceding the linkers."""
+        if self._top_level_sent:
+            return []
+
+        self._top_level_sent = True
+        start = self._stack[-1][0]
+        head = self.text[start:linkers_key].rstrip().rstrip(",")
+        return [HLCEvent("top_level", _loads(f"{head}}}"))]
+
+
+class HLCPipeline:
+    """Hand the HLC from a streaming Generator to the concurrent Translator.
+
+    The Generator feeds its streamed response chunks, and the parts of the HLC are
+    queued as soon as they're complete, so translation starts while the rest of
+    the HLC is still being generated. Both agents get the pipeline of their
+    thread, whichever starts first opening it. The Generator closes it once done,
+    and the Translator discards it once the HLC is translated.
+    """
+
+    _pipelines: dict[str, HLCPipeline] = {}
+
+    def __init__(self):
+        self._queue: asyncio.Queue[HLCEvent | None] = asyncio.Queue()
+        self._message_id: str | None = None
+        self._tool_call_index: int | None = None
+        self._decoder = ArgumentDecoder()
+        self._parser = HLCStreamParser()
+        self._sent = False
+        self._failed = False
+
+    @classmethod
+    def get_or_open(cls, thread_id: str) -> HLCPipeline:
+        """Retrieve the pipeline of a thread, opening it if needed."""
+        return cls._pipelines.setdefault(thread_id, cls())
+
+    @classmethod
+    def discard(cls, thread_id: str) -> None:
+        """Discard the pipeline of a thread."""
+        cls._pipelines.pop(thread_id, None)
+
+    def close(self) -> None:
+        """Close the pipeline, once the Generator is done."""
+        self._queue.put_nowait(None)
+
+    def feed(self, chunk: AIMessageChunk) -> None:
+        """Feed a streamed response chunk of the Generator."""
+        if chunk.id != self._message_id:
+            # A new response, e.g. a retried call, starts over. The parts already
+            # queued can't be taken back, so the Translator reads the rest from
+            # the written HLC file instead.
+            self._message_id = chunk.id
+            self._tool_call_index = None
+            self._decoder = ArgumentDecoder()
+            self._parser = HLCStreamParser()
+            self._failed = self._failed or self._sent
+
+        for tool_call_chunk in chunk.tool_call_chunks:
+            if tool_call_chunk.get("name") == HLC_TOOL:
+                self._tool_call_index = tool_call_chunk.get("index")
+            elif tool_call_chunk.get("name") or (
+                tool_call_chunk.get("index") != self._tool_call_index
+            ):
+                continue
+
+            if self._tool_call_index is None or self._failed:
+                continue
+
+            try:
+                for event in self._parser.feed(
+                    self._decoder.feed(tool_call_chunk.get("args") or "")
+                ):
+                    self._queue.put_nowait(event)
+                    self._sent = True
+            except HLCError as err:
+                # Translation falls back to the written HLC file.
+                logger.debug("Can't stream the HLC: %s", err)
+                self._failed = True
+
+    async def events(self) -> AsyncIterator[HLCEvent]:
+        """Yield the parts of the HLC, until the pipeline is closed."""
+        while (event := await self._queue.get()) is not None:
+            yield event
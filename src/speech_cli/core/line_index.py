@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import hashlib
+import itertools
+import json
+import logging
+import mmap
+import re
+import threading
+from array import array
+from typing import TYPE_CHECKING
+
+from speech_cli.core.workdir import project_root
+
+if TYPE_CHECKING:
+    from os import stat_result
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Every STRIDE-th line start is indexed, so reading a line skips at most STRIDE
+# lines, and the index of a file is STRIDE times smaller than a full one.
+STRIDE = 128
+
+
+class LineIndex:
+    """The byte offsets of every `stride`-th line of a file, to seek to any line.
+
+    Reading a range of lines seeks to the indexed line before it, so it costs the
+    range, rather than the lines before it, wherever it is in the file.
+
+    Args:
+        mtime_ns (int): The modification time of the indexed file.
+        size (int): The size of the indexed file.
+        lines (int): The number of lines of the file.
+        offsets (array): The offset of every `stride`-th line, from line 0.
+        stride (int): The number of lines between indexed lines.
+
+    """
+
+    def __init__(
+        self, mtime_ns: int, size: int, lines: int, offsets: array, stride: int
+    ):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.lines = lines
+        self.offsets = offsets
+        self.stride = stride
+
+    @classmethod
+    def build(cls, path: Path, stat: stat_result, stride: int = STRIDE) -> LineIndex:
+        """Index a file, mapped in memory, rather than read in Python."""
+        offsets = array("Q", [0])
+        if stat.st_size == 0:
+            return cls(stat.st_mtime_ns, 0, 0, offsets, stride)
+
+        with (
+            path.open("rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+        ):
+            newlines = re.finditer(rb"\n", data)
+            offsets.extend(
+                match.end()
+                for match in itertools.islice(newlines, stride - 1, None, stride)
+            )
+            # A file ending with a newline has no line after it.
+            if offsets[-1] == len(data) and len(offsets) > 1:
+                offsets.pop()
+            tail = data[offsets[-1] :]
+
+        lines = (len(offsets) - 1) * stride + tail.count(b"\n")
+        lines += bool(tail) and not tail.endswith(b"\n")
+        return cls(stat.st_mtime_ns, stat.st_size, lines, offsets, stride)
+
+    def matches(self, stat: stat_result) -> bool:
+        """Whether the index is up to date with the file."""
+        return self.mtime_ns == stat.st_mtime_ns and self.size == stat.st_size
+
+    def read(
+        self, path: Path, start: int, count: int, max_bytes: int
+    ) -> tuple[list[str], bool]:
+        """Read `count` lines from line `start`, up to `max_bytes`.
+
+        Returns:
+            tuple[list[str], bool]: The lines, and whether they were cut short by
+                `max_bytes`.
+
+        """
+        indexed = min(start // self.stride, len(self.offsets) - 1)
+        with path.open("rb") as file:
+            file.seek(self.offsets[indexed])
+            for _ in range(start - indexed * self.stride):
+                if not file.readline():
+                    return [], False
+
+            lines, read = [], 0
+            for line in itertools.islice(file, count):
+                if lines and read + len(line) > max_bytes:
+                    return lines, True
+                lines.append(line.decode("utf-8", errors="replace"))
+                read += len(line)
+        return lines, False
+
+    def dump(self) -> bytes:
+        """Serialize the index, a JSON header line, then the offsets."""
+        header = {
+            "mtime_ns": self.mtime_ns,
+            "size": self.size,
+            "lines": self.lines,
+            "stride": self.stride,
+        }
+        return json.dumps(header).encode() + b"\n" + self.offsets.tobytes()
+
+    @classmethod
+    def load(cls, data: bytes) -> LineIndex:
+        """Deserialize an index.
+
+        Raises:
+            ValueError: If the index is malformed.
+
+        """
+        header, _, offsets_data = data.partition(b"\n")
+        try:
+            header = json.loads(header)
+            offsets = array("Q")
+            offsets.frombytes(offsets_data)
+            return cls(
+                header["mtime_ns"],
+                header["size"],
+                header["lines"],
+                offsets,
+                header["stride"],
+            )
+        except (json.JSONDecodeError, KeyError, TypeError) as err:
+            raise ValueError(f"Malformed line index: {err}") from err
+
+
+class LineIndexStore:
+    """Keep the line indexes of large files, in memory and on disk.
+
+    An index is built once per version of a file, by modification time and size,
+    and kept on disk so it outlives the process.
+
+    Args:
+        directory (Path): The directory of the stored indexes.
+
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._indexes: dict[Path, LineIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> LineIndex:
+        """Return the up to date index of a file, building it if needed."""
+        path = path.resolve()
+        stat = path.stat()
+        with self._lock:
+            index = self._indexes.get(path)
+        if index is not None and index.matches(stat):
+            return index
+
+        stored = self.directory / f"{hashlib.sha1(bytes(path)).hexdigest()}.idx"
+        try:
+            index = LineIndex.load(stored.read_bytes())
+        except (OSError, ValueError):
+            index = None
+
+        if index is None or not index.matches(stat):
+            logger.debug("Indexing the lines of %s.", path)
+            index = LineIndex.build(path, stat)
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                stored.write_bytes(index.dump())
+            except OSError as err:
+                logger.warning("Can't store the line index of %s: %s", path, err)
+
+        with self._lock:
+            self._indexes[path] = index
+        return index
+
+
+_registry: dict[Path, LineIndexStore] = {}
+
+
+def get_line_index_store() -> LineIndexStore:
+    """Return the line index store of the current project."""
+    directory = project_root() / ".speech" / "line_index"
+    if directory not in _registry:
+        _registry[directory] = LineIndexStore(directory)
+
+    return _registry[directory]
@@ -1,53 +1,338 @@
 from __future__ import annotations
 
+import json
 import logging
-from typing import TYPE_CHECKING
+import statistics
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
 
 from langchain.chat_models import init_chat_model
+from langchain_core.messages import SystemMessage, ToolMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from speech_cli.core.cassette import CassetteModel
+from speech_cli.core.context import READ_ONLY_TOOLS
+from speech_cli.core.health import get_provider_health
+from speech_cli.core.retry import get_retry_scheduler
 
 if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
     from langchain_core.language_models import BaseChatModel
     from langchain_core.language_models.base import LanguageModelInput
     from langchain_core.messages import BaseMessage
     from langchain_core.runnables import Runnable
 
     from speech_cli.agents.base import BaseAgent
+    from speech_cli.core.cassette import Cassette
+    from speech_cli.core.health import ProviderHealth
+    from speech_cli.core.retry import RetryScheduler
 
 logger = logging.getLogger(__name__)
 
+_OPENROUTER_HOSTS = ("openrouter.ai",)
+
+
+def step_kind(messages: list[BaseMessage]) -> str:
+    """Classify the llm step answering the given messages.
+
+    Returns:
+        str: `read` when the step answers tool results of read only tools, `write`
+            when it answers the results of any other tool, else `start`.
+
+    """
+    results = []
+    for message in reversed(messages):
+        if not isinstance(message, ToolMessage):
+            break
+        results.append(message)
+
+    if not results:
+        return "start"
+    if all(result.name in READ_ONLY_TOOLS for result in results):
+        return "read"
+    return "write"
+
+
+@dataclass
+class Route:
+    """A configured model, with its own client, retry scheduler and latency stats."""
+
+    name: str
+    llm: BaseChatModel
+    health: ProviderHealth
+    scheduler: RetryScheduler
+    latencies: deque[float] = field(default_factory=lambda: deque(maxlen=500))
+    """The durations of the last calls, in seconds, retries included."""
+
+    input_tokens: int = 0
+    """The input tokens of every call."""
+
+    cached_tokens: int = 0
+    """The input tokens read from the provider's prompt cache."""
+
+    @property
+    def explicit_caching(self) -> bool:
+        """Whether the provider only caches prompt prefixes marked for caching.
+
+        Anthropic, also through OpenRouter, caches the prompt up to a block marked
+        with `cache_control`, while OpenAI and Gemini implicitly cache the repeated
+        prompt prefixes.
+        """
+        return (
+            self.health.provider == "anthropic" or self.health.host in _OPENROUTER_HOSTS
+        )
+
+    def mark_cacheable(self, messages: list[BaseMessage]) -> list[BaseMessage]:
+        """Mark the static prefix of the system message for prompt caching."""
+        if not (
+            self.explicit_caching
+            and messages
+            and isinstance(messages[0], SystemMessage)
+            and isinstance(messages[0].content, list)
+        ):
+            return messages
+
+        prefix, *rest = messages[0].content
+        system_message = SystemMessage(
+            content=[{**prefix, "cache_control": {"type": "ephemeral"}}, *rest]
+        )
+        return [system_message, *messages[1:]]
+
+    def model_params(self) -> dict[str, Any]:
+        """Return the parameters identifying the model, e.g. its name."""
+        return {
+            "class": type(self.llm).__name__,
+            **getattr(self.llm, "_identifying_params", {}),
+        }
+
+    async def call(
+        self, call: Callable[[], Awaitable[Any]], estimated_tokens: int = 0
+    ) -> Any:
+        """Await `call()` through the route's retry scheduler, timing it."""
+        start = time.monotonic()
+        try:
+            response = await self.scheduler.call(
+                call, estimated_tokens=estimated_tokens
+            )
+        finally:
+            self.latencies.append(time.monotonic() - start)
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        input_tokens = usage.get("input_tokens", 0)
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+        self.input_tokens += input_tokens
+        self.cached_tokens += cached_tokens
+        logger.debug(
+            "The %s route answered in %.2fs, %d of its %d input tokens were cached.",
+            self.name,
+            self.latencies[-1],
+            cached_tokens,
+            input_tokens,
+        )
+        return response
+
+    def stats(self) -> dict[str, float]:
+        """Return the latency and prompt cache stats.
+
+        The stats are the call count, the mean, median and 95th percentile latency,
+        and the input tokens, with those read from the prompt cache.
+        """
+        tokens = {
+            "input_tokens": self.input_tokens,
+            "cached_tokens": self.cached_tokens,
+        }
+        if not self.latencies:
+            return {"calls": 0, **tokens}
+
+        latencies = sorted(self.latencies)
+        return {
+            **tokens,
+            "calls": len(latencies),
+            "mean": statistics.fmean(latencies),
+            "p50": latencies[len(latencies) // 2],
+            "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        }
+
 
 class LLM:
-    """Maintain a single shared BaseChatModel and return per-agent configured LLMs.
+    """Maintain the configured chat models and return per-agent configured LLMs.
+
+    LLM holds the application's default model, and the models routed to specific
+    agents, or to specific steps of an agent. When an agent requests its LLM, its
+    model is returned with that agent's tools bound to it so the agent receives a
+    ready-to-use chat model. The models can be updated at runtime by the
+    `APIConfig` class so changes to the user's model selection take effect
+    immediately for subsequent agent requests.
+
+    Routes are configured in `api_config.json`, overriding the default model
+    configuration, e.g. `{"routes": {"Chat": {"model": "..."}}}`. A route is named
+    after an agent, or after an agent step, e.g. `Translator:read`, see
+    `step_kind`. Every route has its own client, while routes of the same provider
+    share its health tracking and rate limits.
 
-    LLM holds one BaseChatModel instance as the application's current model. When an
-    agent requests its LLM, the shared model is returned with that agent's tools
-    bound to it so the agent receives a ready-to-use chat model. The stored model
-    reference can be updated at runtime by the `APIConfig` class so changes to the
-    user's model selection take effect immediately for subsequent agent requests.
+    With a cassette, every route records its responses, or replays them offline,
+    see `use_cassette`.
+
+    Binding tools converts every tool signature into a JSON schema, so the bound
+    models are cached per (model, agent) pair, until the model is swapped.
     """
 
     _COMPULSORY_ARGS = ("model", "api_key", "model_provider")
     _OPTIONAL_ARGS = ("base_url",)
+    DEFAULT_ROUTE = "default"
 
     llm: BaseChatModel | None = None
+    health: ProviderHealth | None = None
+    scheduler: RetryScheduler | None = None
+    routes: dict[str, Route] = {}
+    cassette: Cassette | None = None
+
+    # Keyed by the model's id, and holding the model, so the id isn't reused.
+    _bound_models: dict[
+        tuple[int, type[BaseAgent]],
+        tuple[BaseChatModel, Runnable[LanguageModelInput, BaseMessage]],
+    ] = {}
+    _tool_schemas: dict[type[BaseAgent], list[dict[str, Any]]] = {}
 
     def __get__(
         self, _agent: BaseAgent, agent_type: type[BaseAgent]
     ) -> Runnable[LanguageModelInput, BaseMessage]:
         """Return the right llm for each agent at runtime."""
-        return self.llm.bind_tools(agent_type.tools) if agent_type.tools else self.llm
+        return self.bind(self.route(agent_type).llm, agent_type)
 
     @classmethod
-    def create_model(cls, config: dict[str, str]):
-        """Create and store llm."""
+    def bind(
+        cls, llm: BaseChatModel, agent_type: type[BaseAgent]
+    ) -> Runnable[LanguageModelInput, BaseMessage]:
+        """Return a model with the agent's tools bound to it."""
+        if not agent_type.tools:
+            return llm
+
+        key = (id(llm), agent_type)
+        if key not in cls._bound_models:
+            logger.debug(
+                "Binding %d tools (%d schema bytes) for %s.",
+                len(agent_type.tools),
+                cls.tool_schema_size(agent_type),
+                agent_type.__name__,
+            )
+            cls._bound_models[key] = (llm, llm.bind_tools(agent_type.tools))
+
+        return cls._bound_models[key][1]
+
+    @classmethod
+    def route(cls, agent_type: type[BaseAgent], step: str | None = None) -> Route:
+        """Return the most specific route of an agent step, or the default route."""
+        name = agent_type.__name__
+        for route_name in (f"{name}:{step}", name):
+            if route_name in cls.routes:
+                return cls.routes[route_name]
+
+        default = cls.routes.get(cls.DEFAULT_ROUTE)
+        if default is None or default.llm is not cls.llm:
+            # E.g. a model set directly, rather than configured.
+            cls.routes[cls.DEFAULT_ROUTE] = Route(
+                cls.DEFAULT_ROUTE, cls.llm, cls.health, cls.scheduler
+            )
+        return cls.routes[cls.DEFAULT_ROUTE]
+
+    @classmethod
+    def route_stats(cls) -> dict[str, dict[str, float]]:
+        """Return the latency stats of every route, to tune the routes."""
+        return {name: route.stats() for name, route in cls.routes.items()}
+
+    @classmethod
+    def tool_schemas(cls, agent_type: type[BaseAgent]) -> list[dict[str, Any]]:
+        """Return the JSON schemas of an agent's tools, as sent to the provider."""
+        if agent_type not in cls._tool_schemas:
+            cls._tool_schemas[agent_type] = [
+                convert_to_openai_tool(tool) for tool in agent_type.tools or []
+            ]
+
+        return cls._tool_schemas[agent_type]
+
+    @classmethod
+    def tool_schema_size(cls, agent_type: type[BaseAgent]) -> int:
+        """Return the size, in bytes, of an agent's serialized tool schemas.
+
+        This is the prompt overhead the tools add to every call of the agent.
+        """
+        return len(json.dumps(cls.tool_schemas(agent_type)).encode("utf-8"))
+
+    @classmethod
+    def create_model(cls, config: dict[str, Any]):
+        """Create and store the default llm, and the routed ones."""
         if not isinstance(config, dict):
             raise TypeError(f"Expected api config to be a dict, not {type(config)}.")
 
+        routes = {cls.DEFAULT_ROUTE: cls._create_route(cls.DEFAULT_ROUTE, config)}
+        for name, overrides in (config.get("routes") or {}).items():
+            if not isinstance(overrides, dict):
+                raise TypeError(f"Expected route {name} to be a dict.")
+
+            # A route only inherits the default rate limits with its provider.
+            route_config = {
+                key: value
+                for key, value in config.items()
+                if key not in ("routes", "rate_limits")
+            }
+            routes[name] = cls._create_route(name, route_config | overrides)
+
+        cls.routes = routes
+        cls.cassette = None
+        cls._bound_models.clear()
+        cls.llm = routes[cls.DEFAULT_ROUTE].llm
+        cls.health = routes[cls.DEFAULT_ROUTE].health
+        cls.scheduler = routes[cls.DEFAULT_ROUTE].scheduler
+
+    @classmethod
+    def use_cassette(cls, cassette: Cassette):
+        """Record the responses of every route to a cassette, or replay them.
+
+        Replaying needs no configured model, the responses are served by a default
+        route of its own.
+
+        Raises:
+            ValueError: If no model is configured to record.
+
+        """
+        routes = dict(cls.routes)
+        if cls.DEFAULT_ROUTE not in routes and cls.llm is not None:
+            # E.g. a model set directly, rather than configured.
+            routes[cls.DEFAULT_ROUTE] = Route(
+                cls.DEFAULT_ROUTE, cls.llm, cls.health, cls.scheduler
+            )
+
+        if cls.DEFAULT_ROUTE not in routes:
+            if cassette.mode == "record":
+                raise ValueError("No model is configured to record the cassette.")
+
+            health = get_provider_health("cassette")
+            routes[cls.DEFAULT_ROUTE] = Route(
+                cls.DEFAULT_ROUTE, None, health, get_retry_scheduler(health)
+            )
+
+        for route in routes.values():
+            wrapped = route.llm if cassette.mode == "record" else None
+            route.llm = CassetteModel(cassette=cassette, wrapped=wrapped)
+
+        cls.routes = routes
+        cls.cassette = cassette
+        cls._bound_models.clear()
+        cls.llm = routes[cls.DEFAULT_ROUTE].llm
+        cls.health = routes[cls.DEFAULT_ROUTE].health
+        cls.scheduler = routes[cls.DEFAULT_ROUTE].scheduler
+
+    @classmethod
+    def _create_route(cls, name: str, config: dict[str, Any]) -> Route:
         verified_args = {}
 
         for arg in cls._COMPULSORY_ARGS:
             if arg not in config:
-                raise ValueError("Config dict missing a compulsory arg, {arg}")
+                raise ValueError(f"Config dict missing a compulsory arg, {arg}")
 
             verified_args[arg] = config[arg]
 
@@ -55,4 +340,12 @@ class LLM:
             if arg in config:
                 verified_args[arg] = config[arg]
 
-        cls.llm = init_chat_model(**verified_args, timeout=600)
+        logger.debug("Creating the %s route, with model %s.", name, config["model"])
+        # Retries are owned by the retry scheduler, not the provider clients.
+        llm = init_chat_model(**verified_args, timeout=600, max_retries=0)
+        health = get_provider_health(
+            verified_args["model_provider"], verified_args.get("base_url")
+        )
+        return Route(
+            name, llm, health, get_retry_scheduler(health, config.get("rate_limits"))
+        )
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.messages import AIMessage
+
+from speech_cli.core.context import written_paths
+from speech_cli.core.hlc import content_hash
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+    from speech_cli.core.hlc import TranslationPlan, TranslationUnit
+
+logger = logging.getLogger(__name__)
+
+# Tools whose calls are recorded as the commands a node produced.
+COMMAND_TOOLS = {"terminal_use"}
+
+
+def node_hashes(node: dict[str, Any]) -> dict[str, str]:
+    """Hash every node of an HLC subtree by name, excluding the node's children.
+
+    A changed hash thereby points at the very node whose content changed.
+    """
+    hashes = {}
+    own_content = {key: value for key, value in node.items() if key != "linkers"}
+    own_content["linkers"] = [
+        {key: value for key, value in linker.items() if key != "value"}
+        for linker in node.get("linkers") or []
+        if isinstance(linker, dict)
+    ]
+    hashes[str(node.get("name"))] = content_hash(own_content)
+
+    for linker in node.get("linkers") or []:
+        if isinstance(linker, dict) and isinstance(linker.get("value"), dict):
+            hashes |= node_hashes(linker["value"])
+    return hashes
+
+
+def build_outputs(messages: list[BaseMessage]) -> tuple[list[str], list[str]]:
+    """Retrieve the files written and the commands run by an agent.
+
+    Returns:
+        tuple[list[str], list[str]]: The files and the commands, in call order.
+
+    """
+    files: dict[str, None] = {}
+    commands: dict[str, None] = {}
+
+    for message in messages:
+        if not isinstance(message, AIMessage):
+            continue
+
+        for tool_call in message.tool_calls:
+            args = tool_call["args"]
+            files.update(dict.fromkeys(written_paths(tool_call["name"], args)))
+            if tool_call["name"] in COMMAND_TOOLS and isinstance(
+                args.get("command"), str
+            ):
+                commands[args["command"]] = None
+
+    return list(files), list(commands)
+
+
+@dataclass
+class NodeRecord:
+    """What the translation of an HLC subtree produced."""
+
+    hash: str
+    """The content hash of the whole subtree."""
+
+    spec: Any
+    """The subtree, as it was translated."""
+
+    nodes: dict[str, str] = field(default_factory=dict)
+    """The content hash of every node in the subtree, by name."""
+
+    files: list[str] = field(default_factory=list)
+    commands: list[str] = field(default_factory=list)
+
+
+class BuildManifest:
+    """Record of the last build, mapping HLC subtrees to the files they produced.
+
+    The manifest is stored next to the project's checkpoints, in
+    `.speech/build_manifest.json`. On the next build, the HLC subtrees are diffed
+    against it, so only the added, changed or removed ones are translated again.
+
+    Args:
+        path (Path): The manifest file.
+
+    """
+
+    version = 1
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.foundation: NodeRecord | None = None
+        self.units: dict[str, NodeRecord] = {}
+
+    @classmethod
+    def load(cls, path: Path) -> BuildManifest:
+        """Load the manifest, or start an empty one if it's missing or invalid."""
+        manifest = cls(path)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("version") != cls.version:
+                return manifest
+
+            manifest.foundation = NodeRecord(**data["foundation"])
+            manifest.units = {
+                name: NodeRecord(**record) for name, record in data["units"].items()
+            }
+        except FileNotFoundError:
+            pass
+        except (OSError, TypeError, KeyError, json.JSONDecodeError) as err:
+            logger.debug("Ignoring the invalid build manifest %s: %r", path, err)
+            manifest.foundation, manifest.units = None, {}
+
+        return manifest
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        data = {
+            "version": self.version,
+            "foundation": asdict(self.foundation) if self.foundation else None,
+            "units": {name: asdict(record) for name, record in self.units.items()},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp = self.path.with_suffix(".tmp")
+        temp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        temp.replace(self.path)
+
+    def foundation_changed(self, plan: TranslationPlan) -> bool:
+        """Check if the foundation changed since the last build, or wasn't built."""
+        return (
+            self.foundation is None
+            or content_hash(plan.foundation_spec()) != self.foundation.hash
+        )
+
+    def unit_changes(self, unit: TranslationUnit) -> list[str] | None:
+        """Diff a unit against the last build.
+
+        Returns:
+            list[str] | None: None if the unit is unchanged, otherwise the names of
+                its changed nodes, or an empty list if the unit is new.
+
+        """
+        record = self.units.get(unit.name)
+        if record is None:
+            return []
+        if record.hash == content_hash(unit.linker):
+            return None
+
+        nodes = node_hashes(unit.linker["value"])
+        return [
+            name
+            for name, node_hash in nodes.items()
+            if record.nodes.get(name) != node_hash
+        ] or [unit.name]
+
+    def removed_units(self, plan: TranslationPlan) -> list[str]:
+        """Return the units of the last build which are no longer in the plan."""
+        names = {unit.name for unit in plan.units}
+        return [name for name in self.units if name not in names]
+
+    def rebuild_note(self, unit: TranslationUnit, changed_nodes: list[str]) -> str:
+        """Tell the worker what the previous build produced for a changed unit."""
+        record = self.units[unit.name]
+        return (
+            "\n\nThis component was already implemented, from this previous"
+            f" specification:\n{json.dumps(record.spec, indent=2)}\n\nIt produced the"
+            f" files: {', '.join(record.files) or 'none recorded'}. Its changed nodes"
+            f" are: {', '.join(changed_nodes)}. Update the existing implementation to"
+            " the new specification, rather than starting over."
+        )
+
+    def record_foundation(
+        self, plan: TranslationPlan, messages: list[BaseMessage]
+    ) -> None:
+        """Record the foundation pass of a full build, forgetting the previous one."""
+        spec = plan.foundation_spec()
+        files, commands = build_outputs(messages)
+        self.foundation = NodeRecord(
+            content_hash(spec), spec, files=files, commands=commands
+        )
+        self.units = {}
+
+    def record_unit(self, unit: TranslationUnit, messages: list[BaseMessage]) -> None:
+        """Record the translation of a unit."""
+        files, commands = build_outputs(messages)
+        self.units[unit.name] = NodeRecord(
+            content_hash(unit.linker),
+            unit.linker,
+            node_hashes(unit.linker["value"]),
+            files,
+            commands,
+        )
+
+    def record_removed(self, names: list[str]) -> dict[str, list[str]]:
+        """Forget the removed units, returning the files they had produced."""
+        return {name: self.units.pop(name).files for name in names}
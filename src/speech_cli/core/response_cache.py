@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.messages import message_to_dict, messages_from_dict
+
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(message: BaseMessage) -> dict[str, Any]:
+    """Keep the content of a message, without its run specific ids and metadata.
+
+    Prompt caching markers are dropped too, as they depend on the provider.
+    """
+    content = message.content
+    if isinstance(content, list):
+        content = [
+            {key: value for key, value in block.items() if key != "cache_control"}
+            if isinstance(block, dict)
+            else block
+            for block in content
+        ]
+
+    normalized = {"type": message.type, "name": message.name, "content": content}
+    if tool_calls := getattr(message, "tool_calls", None):
+        normalized["tool_calls"] = [
+            {"name": tool_call["name"], "args": tool_call["args"]}
+            for tool_call in tool_calls
+        ]
+    return normalized
+
+
+def request_key(
+    model: dict[str, Any],
+    tool_schemas: list[dict[str, Any]],
+    messages: list[BaseMessage],
+) -> str:
+    """Hash an llm request, from its model, bound tool schemas and messages."""
+    request = {
+        "model": model,
+        "tools": tool_schemas,
+        "messages": [_normalize(message) for message in messages],
+    }
+    canonical = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Disk cache of llm responses, keyed by the content of their request.
+
+    Every response is stored in its own JSON file, named by its `request_key`, so
+    identical steps of different runs share it. Reading an entry refreshes its
+    modification time, and the least recently used entries are evicted once the
+    cache outgrows its size.
+
+    Args:
+        directory (Path): The cache directory.
+        max_bytes (int): The maximum size of the cache.
+
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str, agent: str) -> BaseMessage | None:
+        """Retrieve a cached response, counting the hit or miss for the agent.
+
+        The response gets a new id, so it's a new message in the agent's state.
+        """
+        path = self._path(key)
+        try:
+            message = messages_from_dict([json.loads(path.read_text("utf-8"))])[0]
+            # Mark the entry as recently used.
+            os.utime(path)
+        except (OSError, ValueError, KeyError) as err:
+            if not isinstance(err, FileNotFoundError):
+                logger.debug("Ignoring the invalid cache entry %s: %r", path, err)
+            self.misses[agent] += 1
+            return None
+
+        self.hits[agent] += 1
+        logger.debug(
+            "Response cache hit for %s (%d hits, %d misses).",
+            agent,
+            self.hits[agent],
+            self.misses[agent],
+        )
+        message.id = str(uuid.uuid4())
+        return message
+
+    def put(self, key: str, message: BaseMessage) -> None:
+        """Cache a response, then evict the least recently used entries if needed."""
+        path = self._path(key)
+        data = json.dumps(message_to_dict(message)).encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # An entry cached again, e.g. by a concurrent session, replaces its file.
+            try:
+                replaced = path.stat().st_size
+            except FileNotFoundError:
+                replaced = 0
+            temp = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            temp.write_bytes(data)
+            temp.replace(path)
+        except OSError as err:
+            logger.debug("Can't cache the response %s: %r", key, err)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _path, size, _mtime in self._entries())
+            else:
+                self._size += len(data) - replaced
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def stats(self) -> dict[str, tuple[int, int]]:
+        """Return the hits and misses of every agent."""
+        return {
+            agent: (self.hits[agent], self.misses[agent])
+            for agent in self.hits | self.misses
+        }
+
+    def _entries(self) -> list[tuple[Path, int, float]]:
+        entries = []
+        for path in self.directory.glob("*/*.json"):
+            with contextlib.suppress(OSError):
+                stat = path.stat()
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries, down to 90% of the maximum size.
+
+        Evicting below the maximum size leaves room for the next responses, so the
+        cache directory isn't scanned on every write.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self._size = sum(size for _path, size, _mtime in entries)
+        target = self.max_bytes * 0.9
+
+        for path, size, _mtime in entries:
+            if self._size <= target:
+                break
+            with contextlib.suppress(OSError):
+                path.unlink()
+                self._size -= size
+
+        logger.debug("Evicted the response cache down to %d bytes.", self._size)
+
+
+_registry: dict[Path, ResponseCache] = {}
+
+
+def get_response_cache(max_mb: float) -> ResponseCache:
+    """Return the response cache shared by every agent, stored in ~/.speech/cache.
+
+    Args:
+        max_mb (float): The maximum size of the cache, in megabytes.
+
+    """
+    directory = Path.home() / ".speech" / "cache"
+    if directory not in _registry:
+        _registry[directory] = ResponseCache(directory, int(max_mb * 1024 * 1024))
+
+    return _registry[directory]
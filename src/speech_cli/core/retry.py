@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from speech_cli.core.health import CircuitOpenError, is_provider_failure
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from typing import Any
+
+    from speech_cli.core.health import ProviderHealth
+
+logger = logging.getLogger(__name__)
+
+_RATE_LIMIT_STATUS = 429
+_RETRYABLE_STATUSES = (408, 409)
+
+
+class ErrorKind(StrEnum):
+    """How an llm call error should be handled."""
+
+    RATE_LIMITED = "rate_limited"
+    RETRYABLE = "retryable"
+    FATAL = "fatal"
+
+
+def _status_code(err: BaseException) -> int | None:
+    """Retrieve the http status code of a provider error, if any."""
+    for status_code in (
+        getattr(err, "status_code", None),
+        getattr(getattr(err, "response", None), "status_code", None),
+        getattr(err, "code", None),
+    ):
+        if isinstance(status_code, int):
+            return int(status_code)
+    return None
+
+
+def classify_error(err: BaseException) -> ErrorKind:
+    """Classify an llm call error as rate limited, retryable or fatal."""
+    status_code = _status_code(err)
+    mro_names = [klass.__name__ for klass in type(err).__mro__]
+
+    if status_code == _RATE_LIMIT_STATUS or any(
+        "RateLimit" in name or "ResourceExhausted" in name for name in mro_names
+    ):
+        return ErrorKind.RATE_LIMITED
+
+    if status_code in _RETRYABLE_STATUSES or is_provider_failure(err):
+        return ErrorKind.RETRYABLE
+
+    return ErrorKind.FATAL
+
+
+def retry_after(err: BaseException) -> float | None:
+    """Read the delay in seconds requested by the provider through its headers."""
+    headers = getattr(getattr(err, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    if retry_after_ms := headers.get("retry-after-ms"):
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    if value := headers.get("retry-after"):
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+
+    return None
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff, with full jitter, for retryable llm call errors."""
+
+    max_attempts: int = 5
+    """Maximum number of attempts, including the first one."""
+
+    base_delay: float = 1.0
+    """Delay in seconds before the first retry."""
+
+    max_delay: float = 60.0
+    """Upper bound of the delay between attempts."""
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before the given retry attempt (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+class TokenBucket:
+    """An async token bucket, refilled continuously at `rate` tokens per second.
+
+    Waiters are served one after the other, so concurrent agents sharing a bucket
+    get the quota in a smooth, first come first served order.
+    """
+
+    def __init__(self, capacity: float, rate: float):
+        self.capacity = capacity
+        self.rate = rate
+
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until `amount` tokens are available, then take them."""
+        # A single request larger than the bucket would otherwise wait forever.
+        amount = min(amount, self.capacity)
+
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+
+    def resize(self, capacity: float, rate: float) -> None:
+        """Change the capacity and refill rate, keeping the tokens left."""
+        self._refill()
+        self.capacity = capacity
+        self.rate = rate
+        self._tokens = min(self._tokens, capacity)
+
+    def adjust(self, amount: float) -> None:
+        """Take (positive) or give back (negative) tokens, once the cost is known."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - amount)
+
+
+def _limit(bucket: TokenBucket | None, per_minute: float | None) -> TokenBucket | None:
+    """Return a bucket for a per minute limit, updating the existing one in place."""
+    if not per_minute:
+        return None
+    if bucket is None:
+        return TokenBucket(per_minute, per_minute / 60)
+
+    bucket.resize(per_minute, per_minute / 60)
+    return bucket
+
+
+class ProviderLimiter:
+    """Per provider request and token buckets, shared by every agent."""
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+    ):
+        self.requests: TokenBucket | None = None
+        self.tokens: TokenBucket | None = None
+        self._paused_until = 0.0
+        self.configure(requests_per_minute, tokens_per_minute)
+
+    def configure(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+    ) -> None:
+        """Set the limits, keeping the buckets and their waiters when reconfigured."""
+        self.requests = _limit(self.requests, requests_per_minute)
+        self.tokens = _limit(self.tokens, tokens_per_minute)
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Wait for a request slot and the estimated number of tokens."""
+        while (delay := self._paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+        if self.requests:
+            await self.requests.acquire()
+        if self.tokens:
+            await self.tokens.acquire(estimated_tokens)
+
+    def reconcile(self, estimated_tokens: int, used_tokens: int | None) -> None:
+        """Correct the token bucket with the tokens the call actually used."""
+        if self.tokens and used_tokens is not None:
+            self.tokens.adjust(used_tokens - estimated_tokens)
+
+    def pause(self, delay: float) -> None:
+        """Hold every caller back, after the provider rate limited a request."""
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+
+class RetryScheduler:
+    """Run llm calls with rate limiting, retries and provider health tracking.
+
+    Rate limited calls honour the provider's `Retry-After` header and pause the
+    shared buckets, so concurrent agents back off together instead of piling up
+    on the provider. Other retryable errors are retried with exponential backoff
+    and jitter, while fatal errors are raised at once.
+    """
+
+    def __init__(
+        self,
+        health: ProviderHealth,
+        limiter: ProviderLimiter | None = None,
+        policy: RetryPolicy | None = None,
+    ):
+        self.health = health
+        self.limiter = limiter or ProviderLimiter()
+        self.policy = policy or RetryPolicy()
+
+    async def call(
+        self,
+        call: Callable[[], Awaitable[Any]],
+        estimated_tokens: int = 0,
+    ) -> Any:
+        """Await `call()`, retrying it according to the retry policy.
+
+        Args:
+            call (Callable): A factory returning a fresh awaitable on every attempt.
+            estimated_tokens (int): The estimated number of tokens for the call.
+
+        Returns:
+            Any: The result of the call.
+
+        Raises:
+            CircuitOpenError: If the provider circuit is open.
+            ConnectionError: If the user is not connected to the internet.
+
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            self.health.before_call()
+
+            try:
+                await self.limiter.acquire(estimated_tokens)
+                response = await call()
+            except asyncio.CancelledError:
+                self.health.record_cancelled()
+                raise
+            except CircuitOpenError:
+                raise
+            except Exception as err:
+                self.health.record_failure(err)
+                kind = classify_error(err)
+
+                if is_provider_failure(err) and not await self.health.connected():
+                    raise ConnectionError(
+                        "User is not connected to the internet."
+                    ) from err
+
+                if kind is ErrorKind.FATAL or attempt >= self.policy.max_attempts:
+                    raise
+
+                delay = self.policy.backoff(attempt)
+                if kind is ErrorKind.RATE_LIMITED:
+                    delay = max(delay, retry_after(err) or 0.0)
+                    self.limiter.pause(delay)
+
+                logger.debug(
+                    "Attempt %d failed with a %s error, %r. Retrying after %.2fs.",
+                    attempt,
+                    kind,
+                    err,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            self.health.record_success()
+            usage = getattr(response, "usage_metadata", None) or {}
+            self.limiter.reconcile(estimated_tokens, usage.get("total_tokens"))
+            return response
+
+
+_registry: dict[ProviderHealth, RetryScheduler] = {}
+
+
+def get_retry_scheduler(
+    health: ProviderHealth, rate_limits: dict[str, float] | None = None
+) -> RetryScheduler:
+    """Return the retry scheduler shared by every model of a provider.
+
+    Args:
+        health (ProviderHealth): The provider health tracker.
+        rate_limits (dict, optional): The provider `requests_per_minute` and
+            `tokens_per_minute` limits.
+
+    """
+    if health not in _registry:
+        _registry[health] = RetryScheduler(health, ProviderLimiter(**rate_limits or {}))
+    elif rate_limits is not None:
+        # The models of the provider, and their waiting calls, share the limiter.
+        _registry[health].limiter.configure(**rate_limits)
+
+    return _registry[health]
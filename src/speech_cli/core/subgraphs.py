@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from langgraph.graph.state import CompiledStateGraph
+
+logger = logging.getLogger(__name__)
+
+
+class SubgraphSkippedError(Exception):
+    """Raised for a subgraph that wasn't started, as an earlier one failed."""
+
+
+class OrderedSubgraphs:
+    """Invoke subgraphs concurrently from a single node, starting them in order.
+
+    LangGraph checkpoints the n-th subgraph invoked by a node under the n-th
+    namespace, so when an interrupted node runs again, its subgraphs must be
+    started in the same order to resume from their own checkpoints. Subgraphs are
+    therefore started in call order, each one once the previous one has started,
+    and none is started after a failure, e.g. an interrupt.
+
+    Args:
+        max_concurrency (int, optional): Maximum number of subgraphs running at
+            once.
+
+    """
+
+    def __init__(self, max_concurrency: int | None = None):
+        self._semaphore = (
+            asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        )
+        self._previous: asyncio.Event | None = None
+        self._failed = False
+
+    async def invoke(
+        self,
+        graph: CompiledStateGraph,
+        graph_input: Any,
+        wait_for: Iterable[asyncio.Future] = (),
+    ) -> dict[str, Any]:
+        """Invoke a subgraph, after the given futures and the previous subgraphs.
+
+        Returns:
+            dict: The final state of the subgraph.
+
+        Raises:
+            SubgraphSkippedError: If an earlier subgraph failed.
+
+        """
+        previous, started = self._previous, asyncio.Event()
+        self._previous = started
+
+        try:
+            if wait_for := list(wait_for):
+                await asyncio.wait(wait_for)
+            if previous:
+                await previous.wait()
+            if self._failed:
+                raise SubgraphSkippedError
+
+            async with self._semaphore or contextlib.nullcontext():
+                state = {}
+                # The first chunk is emitted once the subgraph's namespace is set.
+                async for mode, chunk in graph.astream(
+                    graph_input, stream_mode=["checkpoints", "values"]
+                ):
+                    started.set()
+                    if mode == "values":
+                        state = chunk
+                return state
+        except BaseException:
+            self._failed = True
+            raise
+        finally:
+            started.set()
@@ -1,7 +1,15 @@
 from pathlib import Path
 
+from langchain_core.messages import SystemMessage
+
 from speech_cli.core.utils import get_system_info
 
+_SYSTEM_INFO = """## Specific Information about the User System
+
+This information is critical for deciding which commands to run.
+
+%s"""
+
 
 class _SystemMessages:
     """Retrieve the system message.
@@ -40,10 +48,27 @@ class _SystemMessages:
                 " directory."
             )
 
-        if name == "translator":
-            return self._load_file(file) % get_system_info()
-
         return self._load_file(file)
 
+    def build(self, *names: str, system_info: bool = False) -> SystemMessage:
+        """Build an agent's system message from the named system messages.
+
+        The named messages are a static prefix, byte identical on every call, so
+        providers can cache it. Dynamic parts, like the user's system information,
+        are a separate block following it.
+
+        Args:
+            *names (str): The system messages, e.g. `translator`.
+            system_info (bool, optional): Whether to add the user's system
+                information.
+
+        """
+        prefix = "\n\n".join(getattr(self, name) for name in names)
+        blocks = [{"type": "text", "text": prefix}]
+        if system_info:
+            blocks.append({"type": "text", "text": _SYSTEM_INFO % get_system_info()})
+
+        return SystemMessage(content=blocks)
+
 
 system_messages = _SystemMessages()
@@ -24,7 +24,11 @@ class ToolCall:
         """Stream this tool call."""
         from langgraph.config import get_stream_writer
 
-        writer = get_stream_writer()
+        try:
+            writer = get_stream_writer()
+        except (RuntimeError, KeyError):
+            # Called outside of a graph, e.g. by the tests or the benchmarks.
+            return
 
         if writer:
             writer((self,))
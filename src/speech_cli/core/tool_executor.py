@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.messages import ToolMessage
+from langgraph.errors import GraphBubbleUp
+from langgraph.prebuilt import ToolNode
+from langgraph.prebuilt.tool_node import (
+    INVALID_TOOL_NAME_ERROR_TEMPLATE,
+    TOOL_CALL_ERROR_TEMPLATE,
+)
+from langgraph.types import Command, interrupt
+
+from speech_cli.core.context import READ_ONLY_TOOLS, written_paths
+from speech_cli.core.decorators import ReviewedTool, reviewed_call
+from speech_cli.core.tools import as_async_tool, is_glob, strip_range
+from speech_cli.core.workdir import current_directory
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from langchain_core.messages import ToolCall
+    from langchain_core.runnables import RunnableConfig
+    from langchain_core.tools import BaseTool
+    from pydantic import BaseModel
+
+    from speech_cli.core.approval import ApprovalRule
+    from speech_cli.core.decorators import Decision
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve(path: str, directory: Path) -> str:
+    resolved = Path(path).expanduser()
+    if not resolved.is_absolute():
+        resolved = directory / resolved
+    try:
+        return str(resolved.resolve())
+    except (OSError, RuntimeError):
+        return str(resolved)
+
+
+def _read_targets(call: ToolCall, directory: Path) -> list[str] | None:
+    """Return the paths a read only call reads, None if it may read any path."""
+    paths = call["args"].get("paths")
+    if isinstance(paths, list):
+        # Globs may match any path.
+        names = [strip_range(str(path)) for path in paths]
+        if any(is_glob(name) for name in names):
+            return None
+        return [_resolve(name, directory) for name in names if name]
+
+    path = call["args"].get("path")
+    if not isinstance(path, str) or not path:
+        return None
+    return [_resolve(path, directory)]
+
+
+def dependencies(tool_calls: list[ToolCall]) -> list[list[int]]:
+    """Work out which earlier calls every tool call has to wait for.
+
+    Read only calls only wait for the earlier modifications of their paths, so
+    reads run concurrently, and reads of any path, e.g. of a glob, wait for every
+    earlier modification. File write calls wait for the earlier reads and
+    modifications of the paths they modify, e.g. every file of a patch. Any other
+    call, e.g. a terminal command or a change of directory, may touch anything, so
+    it waits for every earlier call, and every later call waits for it.
+
+    The paths of the calls after a change of directory are resolved against the
+    new directory.
+
+    Returns:
+        list[list[int]]: The indexes of the calls each call waits for.
+
+    """
+    waits: list[list[int]] = []
+    directory = current_directory()
+    barrier: int | None = None
+    writers: dict[str, int] = {}
+    readers: dict[str, list[int]] = {}
+    # Reads of any path, waited for by every later modification.
+    any_readers: list[int] = []
+
+    for index, call in enumerate(tool_calls):
+        name, args = call["name"], call["args"]
+        written = [_resolve(path, directory) for path in written_paths(name, args)]
+        if name in READ_ONLY_TOOLS:
+            targets = _read_targets(call, directory)
+            if targets is None:
+                after = [barrier, *writers.values()]
+                any_readers.append(index)
+            else:
+                after = [barrier, *(writers.get(path) for path in targets)]
+                for path in targets:
+                    readers.setdefault(path, []).append(index)
+        elif written:
+            after = [barrier, *any_readers]
+            for path in written:
+                after += [writers.get(path), *readers.pop(path, [])]
+                writers[path] = index
+        else:
+            after = list(range(index))
+            barrier = index
+            writers.clear()
+            readers.clear()
+            any_readers.clear()
+            if name == "change_directory" and isinstance(args.get("path"), str):
+                directory = Path(_resolve(args["path"], directory))
+
+        waits.append(sorted({wait for wait in after if wait is not None}))
+
+    return waits
+
+
+class ToolExecutor:
+    """A tool node running the independent tool calls of a turn concurrently.
+
+    When the model calls several tools in one turn, read only calls run
+    concurrently in the thread pool, while calls modifying a path are serialized
+    with the other calls on that path, see `dependencies`. A turn of several reads
+    takes as long as the slowest read. The results are returned in call order.
+
+    The tools are run through their async variants, see `as_async_tool`, so tool
+    I/O never blocks the event loop, and cancelling the graph cancels the tools.
+
+    The reviewed calls of a turn, see `add_human_in_the_loop`, are reviewed together
+    in a single interrupt, before any call runs, so the graph resumes once for the
+    whole turn.
+
+    Args:
+        tools (Sequence[Callable | BaseTool]): The tools of the node.
+
+    """
+
+    def __init__(self, tools: Sequence[Callable | BaseTool]):
+        # Only used to inject the graph state into the tools asking for it.
+        self.tool_node = ToolNode([as_async_tool(tool) for tool in tools])
+        self.tools_by_name = self.tool_node.tools_by_name
+
+    async def __call__(
+        self, state: BaseModel | dict[str, Any], config: RunnableConfig
+    ) -> Any:
+        """Run the tool calls of the last AI message, returning their messages."""
+        messages = state["messages"] if isinstance(state, dict) else state.messages
+        message = next(
+            message for message in reversed(messages) if message.type == "ai"
+        )
+        tool_calls = [
+            self.tool_node.inject_tool_args(call, state, None)
+            for call in message.tool_calls
+        ]
+        decisions = self._review(tool_calls)
+
+        tasks: list[asyncio.Task[ToolMessage | Command]] = []
+        for index, (call, waits) in enumerate(
+            zip(tool_calls, dependencies(tool_calls), strict=True)
+        ):
+            after = [tasks[wait] for wait in waits]
+            tasks.append(
+                asyncio.create_task(
+                    self._run_after(after, call, config, decisions.get(index))
+                )
+            )
+
+        outputs = await asyncio.gather(*tasks, return_exceptions=True)
+        # Re-raise e.g. an interrupt, once every call is done.
+        for output in outputs:
+            if isinstance(output, BaseException):
+                raise output
+
+        # Commands, e.g. a handoff, are returned along with the tool messages.
+        commands = [output for output in outputs if isinstance(output, Command)]
+        messages = [output for output in outputs if isinstance(output, ToolMessage)]
+        if not commands:
+            return {"messages": messages}
+        return [*commands, {"messages": messages}] if messages else commands
+
+    async def _run_after(
+        self,
+        after: list[asyncio.Task[ToolMessage | Command]],
+        call: ToolCall,
+        config: RunnableConfig,
+        decision: Decision | None,
+    ) -> ToolMessage | Command:
+        if after:
+            await asyncio.wait(after)
+        # The task runs in its own context, seen by the reviewed tool.
+        reviewed_call.set(decision)
+        return await self._run(call, config)
+
+    async def _run(
+        self, call: ToolCall, config: RunnableConfig
+    ) -> ToolMessage | Command:
+        """Run a tool call, returning its errors to the model as its message."""
+        tool = self.tools_by_name.get(call["name"])
+        if tool is None:
+            content = INVALID_TOOL_NAME_ERROR_TEMPLATE.format(
+                requested_tool=call["name"],
+                available_tools=", ".join(self.tools_by_name),
+            )
+            return ToolMessage(
+                content, name=call["name"], tool_call_id=call["id"], status="error"
+            )
+
+        try:
+            return await tool.ainvoke({**call, "type": "tool_call"}, config)
+        # Interrupts and parent commands are handled by the graph.
+        except GraphBubbleUp:
+            raise
+        except Exception as e:
+            logger.debug("The %s tool call failed.", call["name"], exc_info=True)
+            return ToolMessage(
+                TOOL_CALL_ERROR_TEMPLATE.format(error=repr(e)),
+                name=call["name"],
+                tool_call_id=call["id"],
+                status="error",
+            )
+
+    def _review(self, tool_calls: list[ToolCall]) -> dict[int, Decision]:
+        """Decide the reviewed calls of a turn, with a single interrupt.
+
+        Returns:
+            dict[int, Decision]: The decision on every reviewed call, by index.
+
+        """
+        ruled: list[tuple[int, ToolCall, ReviewedTool, ApprovalRule]] = []
+        pending: list[tuple[int, ToolCall, ReviewedTool]] = []
+        for index, call in enumerate(tool_calls):
+            tool = self.tools_by_name.get(call["name"])
+            if not isinstance(tool, ReviewedTool):
+                continue
+            if (rule := tool.match(call["args"])) is not None:
+                ruled.append((index, call, tool, rule))
+            else:
+                pending.append((index, call, tool))
+
+        decisions: dict[int, Decision] = {}
+        if pending:
+            # Raised before any call runs, so no call runs twice once resumed.
+            responses = interrupt(
+                [tool.request(call["args"]) for _, call, tool in pending]
+            )
+            for (index, call, tool), response in zip(pending, responses, strict=True):
+                decisions[index] = tool.decision(call["args"], response)
+
+        for index, call, tool, rule in ruled:
+            decisions[index] = tool.rule_decision(call["args"], rule)
+        return decisions
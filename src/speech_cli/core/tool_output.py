@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import uuid
+from typing import TYPE_CHECKING
+
+from speech_cli.core.workdir import project_root
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_HANDLE = re.compile(r"out-[0-9a-f]{12}")
+
+
+class ToolOutputStore:
+    """Store large tool outputs out of the message history.
+
+    A tool output over the budget is written to the store, and the model is only
+    sent its head and tail, with a handle to page or grep the rest with the
+    `read_tool_output` tool. Every output otherwise lives in the message history,
+    and is sent again on every later llm call.
+
+    The oldest outputs are evicted once the store outgrows its size.
+
+    Args:
+        directory (Path): The store directory.
+        max_bytes (int): The maximum size of the stored outputs.
+
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def put(self, output: str) -> str:
+        """Store an output.
+
+        Returns:
+            str: The output's handle.
+
+        """
+        handle = f"out-{uuid.uuid4().hex[:12]}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(handle).write_text(output, encoding="utf-8")
+        self._evict()
+        return handle
+
+    def lines(self, handle: str) -> Iterator[str]:
+        """Iterate over the lines of a stored output, without loading it whole.
+
+        Raises:
+            KeyError: If there's no output with this handle.
+
+        """
+        path = self._path(handle) if _HANDLE.fullmatch(handle) else None
+        if path is None or not path.is_file():
+            raise KeyError(handle)
+
+        with path.open(encoding="utf-8") as file:
+            yield from file
+
+    def excerpt(self, output: str, max_chars: int) -> str:
+        """Store an output over `max_chars`, and return its head and tail instead.
+
+        The head and tail are cut on line boundaries, when the lines allow it.
+        """
+        if len(output) <= max_chars:
+            return output
+
+        handle = self.put(output)
+        keep = max_chars // 2
+        head = output[:keep]
+        head = head[: head.rfind("\n") + 1] or head
+        tail = output[-keep:]
+        tail = tail[tail.find("\n") + 1 :] or tail
+
+        lines = output.count("\n") + (not output.endswith("\n"))
+        elided_lines = lines - head.count("\n") - tail.count("\n")
+        logger.debug("Stored a %d characters tool output as %s.", len(output), handle)
+        return (
+            f"{head}\n[... {elided_lines} of {lines} lines elided. The whole output is"
+            f" stored as {handle}, read or grep it with read_tool_output ...]\n{tail}"
+        )
+
+    def _path(self, handle: str) -> Path:
+        return self.directory / f"{handle}.txt"
+
+    def _evict(self):
+        """Remove the oldest outputs, until the store fits its size."""
+        with self._lock:
+            files = []
+            for path in self.directory.glob("out-*.txt"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+_registry: dict[Path, ToolOutputStore] = {}
+
+
+def get_tool_output_store(max_mb: int) -> ToolOutputStore:
+    """Return the tool output store of the current project."""
+    directory = project_root() / ".speech" / "tool_outputs"
+    if directory not in _registry:
+        _registry[directory] = ToolOutputStore(directory, max_mb * 1024 * 1024)
+
+    return _registry[directory]
@@ -2,14 +2,20 @@ import logging
 from typing import Literal
 
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.utils import hlc_file
 
+from ._apply_patch import apply_patch, patch_paths
+from ._async import as_async_tool, run_tool_io
 from ._change_directory import change_directory
 from ._delete_file_content import delete_file_content
+from ._file_lock import file_lock
 from ._get_current_directory import get_current_directory
 from ._handoff import transfer_to_generator
 from ._insert_file_content import insert_file_content
 from ._list_directory import list_directory
 from ._read_file import read_file
+from ._read_files import is_glob, read_files, split_range, strip_range
+from ._read_tool_output import read_tool_output
 from ._run_javascript_test import run_javascript_test
 from ._run_python_test import run_python_test
 from ._terminal import get_command_history, terminal_use
@@ -37,7 +43,7 @@ def generator_write_file(content: str) -> tuple[bool, str]:
         message=content,
     )
     tool_call.stream()
-    return write_file("HLC.json", content)
+    return write_file(str(hlc_file()), content)
 
 
 def translator_write_file(
@@ -72,18 +78,27 @@ def translator_write_file(
 
 
 __all__ = [
+    "apply_patch",
+    "as_async_tool",
     "change_directory",
     "delete_file_content",
+    "file_lock",
+    "get_command_history",
     "get_current_directory",
     "insert_file_content",
+    "is_glob",
     "list_directory",
+    "patch_paths",
     "read_file",
+    "read_files",
+    "read_tool_output",
     "run_javascript_test",
     "run_python_test",
-    "get_command_history",
+    "run_tool_io",
+    "split_range",
+    "strip_range",
     "terminal_use",
     "transfer_to_generator",
     "update_file_content",
     "write_file",
-    "write_file",
 ]
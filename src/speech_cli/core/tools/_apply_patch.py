@@ -0,0 +1,434 @@
+import contextlib
+import logging
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from speech_cli.config import app_config
+from speech_cli.core.file_cache import get_file_cache, split_lines
+from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import resolve_path
+
+from ._file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+_HUNK_HEADER = re.compile(r"@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+_SEARCH, _DIVIDER, _REPLACE = "<<<<<<< SEARCH", "=======", ">>>>>>> REPLACE"
+_DEV_NULL = "/dev/null"
+
+
+class PatchError(ValueError):
+    """A patch can't be parsed, or doesn't apply."""
+
+
+@dataclass
+class _Hunk:
+    """Lines to replace, found by their content near the hinted line."""
+
+    old: list[str]
+    new: list[str]
+    # The 0-based line the hunk was made at, from its unified diff header.
+    hint: int | None = None
+    # Search/replace blocks must match a single place.
+    unique: bool = False
+    # The changed lines, the old and new lines without the context lines.
+    added: int = 0
+    removed: int = 0
+
+
+@dataclass
+class _FilePatch:
+    path: str
+    hunks: list[_Hunk] = field(default_factory=list)
+    create: bool = False
+    delete: bool = False
+
+
+def _diff_path(header: str) -> str:
+    """Return the path of a `---`/`+++` line, without its prefix or timestamp."""
+    path = header[4:].split("\t", maxsplit=1)[0].strip()
+    if path != _DEV_NULL and path[:2] in ("a/", "b/"):
+        path = path[2:]
+    return path
+
+
+def _file_header(lines: list[str], index: int) -> _FilePatch | None:
+    """Return the patch of the file whose `---`/`+++` header is at `index`, if any."""
+    if not (
+        lines[index].startswith("--- ")
+        and index + 1 < len(lines)
+        and lines[index + 1].startswith("+++ ")
+    ):
+        return None
+
+    old, new = _diff_path(lines[index]), _diff_path(lines[index + 1])
+    return _FilePatch(
+        old if new == _DEV_NULL else new,
+        create=old == _DEV_NULL,
+        delete=new == _DEV_NULL,
+    )
+
+
+def _new_hunk(header: str) -> _Hunk:
+    """Start a hunk, hinted at the line of its `@@` header."""
+    hint = None
+    if match := _HUNK_HEADER.match(header):
+        # Lines are only added after the start line of an empty range.
+        start, count = int(match.group(1)), match.group(2)
+        hint = start if count == "0" else max(0, start - 1)
+    return _Hunk([], [], hint)
+
+
+def _add_line(hunk: _Hunk, line: str):
+    """Add a line of a unified diff hunk to its old and new lines."""
+    if line.startswith("-"):
+        hunk.old.append(line[1:])
+        hunk.removed += 1
+    elif line.startswith("+"):
+        hunk.new.append(line[1:])
+        hunk.added += 1
+    elif line.startswith(" ") or not line:
+        # Models often strip the space of blank context lines.
+        hunk.old.append(line[1:])
+        hunk.new.append(line[1:])
+    # Other lines, e.g. `\ No newline at end of file`, are skipped.
+
+
+def _parse_unified(lines: list[str]) -> list[_FilePatch]:
+    patches: list[_FilePatch] = []
+    hunk: _Hunk | None = None
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        if (file_patch := _file_header(lines, index)) is not None:
+            patches.append(file_patch)
+            hunk = None
+            index += 2
+            continue
+
+        if line.startswith("@@"):
+            if not patches:
+                raise PatchError("A hunk comes before any `---`/`+++` file header.")
+            hunk = _new_hunk(line)
+            patches[-1].hunks.append(hunk)
+        elif hunk is not None:
+            _add_line(hunk, line)
+        index += 1
+
+    return patches
+
+
+def _parse_search_replace(lines: list[str]) -> list[_FilePatch]:
+    patches: dict[str, _FilePatch] = {}
+    markers = [line.strip() for line in lines]
+    path: str | None = None
+    index = 0
+    while index < len(lines):
+        line = markers[index]
+        if line != _SEARCH:
+            if line and not line.startswith("```"):
+                path = line.strip("`*: ")
+            index += 1
+            continue
+
+        if path is None:
+            raise PatchError("A SEARCH block doesn't follow its file path.")
+        try:
+            divider = markers.index(_DIVIDER, index + 1)
+            end = markers.index(_REPLACE, divider + 1)
+        except ValueError:
+            raise PatchError(
+                f"The SEARCH block of {path} isn't closed by `{_DIVIDER}` and"
+                f" `{_REPLACE}`."
+            ) from None
+
+        patch = patches.setdefault(path, _FilePatch(path))
+        search, replace = lines[index + 1 : divider], lines[divider + 1 : end]
+        if not search:
+            patch.create = True
+        patch.hunks.append(
+            _Hunk(search, replace, unique=True, added=len(replace), removed=len(search))
+        )
+        index = end + 1
+
+    return list(patches.values())
+
+
+def parse_patch(patch: str) -> list[_FilePatch]:
+    """Parse a unified diff, or search/replace blocks, into the patch of every file.
+
+    Raises:
+        PatchError: If the patch is malformed, or changes no file.
+
+    """
+    lines = patch.replace("\r\n", "\n").rstrip("\n").split("\n")
+    if any(line.strip() == _SEARCH for line in lines):
+        patches = _parse_search_replace(lines)
+    else:
+        patches = _parse_unified(lines)
+
+    if not patches:
+        raise PatchError(
+            "The patch has no `---`/`+++` file header, nor SEARCH/REPLACE block."
+        )
+    return patches
+
+
+def patch_paths(patch: str) -> list[str]:
+    """Return the paths a patch changes, or none if the patch is malformed."""
+    try:
+        return [file_patch.path for file_patch in parse_patch(patch)]
+    except PatchError:
+        return []
+
+
+def _normalizers():
+    """Line comparisons, from exact to ignoring the whitespace."""
+    yield lambda line: line
+    yield str.rstrip
+    yield lambda line: " ".join(line.split())
+
+
+def _locate(lines: list[str], hunk: _Hunk, start: int, hint: int) -> int:
+    """Find where the hunk's old lines are, from `start`, the nearest to `hint`.
+
+    Raises:
+        PatchError: If the old lines aren't found, or a search block is ambiguous.
+
+    """
+    size = len(hunk.old)
+    for normalize in _normalizers():
+        old = [normalize(line) for line in hunk.old]
+        normalized = [normalize(line) for line in lines]
+        found = [
+            position
+            for position in range(start, len(lines) - size + 1)
+            if normalized[position : position + size] == old
+        ]
+        if not found:
+            continue
+        if hunk.unique and len(found) > 1:
+            raise PatchError(
+                f"The SEARCH lines starting with {hunk.old[0].strip()!r} match"
+                f" {len(found)} places, add lines around them to tell them apart."
+            )
+        return min(found, key=lambda position: abs(position - hint))
+
+    first = next((line.strip() for line in hunk.old if line.strip()), "")
+    raise PatchError(f"The lines starting with {first!r} aren't in the file.")
+
+
+def _position(lines: list[str], hunk: _Hunk, position: int, offset: int) -> int:
+    """Return the line a hunk applies at, from the end of the previous hunk.
+
+    The hinted line of a unified diff hunk is shifted by `offset`, the lines the
+    previous hunks added.
+    """
+    if hunk.unique:
+        # Search blocks are found anywhere in the file.
+        return _locate(lines, hunk, 0, 0) if hunk.old else len(lines)
+    if hunk.hint is None:
+        return _locate(lines, hunk, position, position) if hunk.old else position
+
+    hint = max(hunk.hint + offset, position)
+    if hunk.old:
+        return _locate(lines, hunk, position, hint)
+    # A hunk only adding lines, has no lines to find.
+    return min(hint, len(lines))
+
+
+def _apply(file_patch: _FilePatch, text: str | None) -> tuple[str | None, int, int]:
+    """Apply a file's hunks to its text, in a single pass over its lines.
+
+    The text keeps its line endings, CRLF or LF.
+
+    Returns:
+        tuple: The new text, None to delete the file, and the added and removed
+            lines.
+
+    Raises:
+        PatchError: If a hunk doesn't apply.
+
+    """
+    if file_patch.delete:
+        if text is None:
+            raise PatchError("The file to delete doesn't exist.")
+        return None, 0, text.count("\n")
+
+    if text is None and not file_patch.create:
+        raise PatchError("The file doesn't exist, create it with a `/dev/null` diff.")
+    if text and file_patch.create:
+        raise PatchError("The file to create already exists.")
+
+    text = text or ""
+    newline = "\r\n" if "\r\n" in text else "\n"
+    ends_with_newline = text.endswith("\n") or not text
+    lines = text.removesuffix("\n").split("\n") if text else []
+    if newline == "\r\n":
+        lines = [line.removesuffix("\r") for line in lines]
+
+    added = removed = 0
+    # The shift of the hinted lines, by the earlier hunks, and where they ended.
+    offset = position = 0
+    for hunk in file_patch.hunks:
+        at = _position(lines, hunk, position, offset)
+        lines[at : at + len(hunk.old)] = hunk.new
+        offset += len(hunk.new) - len(hunk.old)
+        position = at + len(hunk.new)
+        added += hunk.added
+        removed += hunk.removed
+
+    new_text = newline.join(lines)
+    if lines and ends_with_newline:
+        new_text += newline
+    return new_text, added, removed
+
+
+def _stage(path: Path, text: str) -> Path:
+    """Write the new text of a file next to it, to be renamed over it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        newline="",
+        dir=path.parent,
+        prefix=f".{path.name}.",
+        suffix=".patch",
+        delete=False,
+    ) as file:
+        staged = Path(file.name)
+        try:
+            file.write(text)
+        except BaseException:
+            staged.unlink(missing_ok=True)
+            raise
+    if path.exists():
+        shutil.copymode(path, staged)
+    return staged
+
+
+def _restore(path: Path, text: str | None):
+    """Put back the text a file had before the patch, or remove a created file."""
+    if text is None:
+        path.unlink(missing_ok=True)
+    else:
+        _stage(path, text).replace(path)
+
+
+def _write(texts: dict[Path, str | None], originals: dict[Path, str | None]):
+    """Write the patched files, None deleting a file, all of them or none.
+
+    Every new text is staged next to its file first, so only the renames are left
+    to fail, and the files already renamed over are then restored.
+    """
+    staged: dict[Path, Path | None] = {}
+    written: list[Path] = []
+    try:
+        for path, text in texts.items():
+            if text != originals[path]:
+                staged[path] = None if text is None else _stage(path, text)
+
+        for path, staged_path in staged.items():
+            if staged_path is None:
+                path.unlink()
+            else:
+                staged_path.replace(path)
+            written.append(path)
+
+    except OSError:
+        for path in written:
+            try:
+                _restore(path, originals[path])
+            except OSError:
+                logger.exception("Can't restore %s, after a failed patch.", path)
+        raise
+    finally:
+        for staged_path in staged.values():
+            if staged_path is not None:
+                staged_path.unlink(missing_ok=True)
+
+
+def apply_patch(patch: str) -> tuple[bool, str]:
+    """Apply a patch changing one or several files, in a single call.
+
+    The patch is either a unified diff, with a `---`/`+++` header per file and
+    `@@` hunks, or search/replace blocks, each after the path of its file:
+
+        path/to/file.py
+        <<<<<<< SEARCH
+        lines to replace
+        =======
+        replacement lines
+        >>>>>>> REPLACE
+
+    The changed lines are found by their content, tolerating shifted line numbers
+    and differing whitespace, so the files don't need to be read again first. A
+    SEARCH block must match a single place, and an empty one creates its file.
+    A unified diff from `/dev/null` creates a file, and to `/dev/null` deletes it.
+
+    Several sections on the same file apply in turn. Either every file is changed,
+    or, when any hunk doesn't apply or a file can't be written, none is.
+
+    Args:
+        patch (str): The unified diff, or the search/replace blocks.
+
+    Returns:
+        tuple[bool, str]: A tuple indicating success or failure and a
+                          corresponding message.
+
+    """
+    try:
+        file_patches = parse_patch(patch)
+    except PatchError as e:
+        return False, f"Error: {e}"
+
+    paths = [file_patch.path for file_patch in file_patches]
+    tool_call = ToolCall(
+        name="apply_patch",
+        action_in_progress=f"Patching {', '.join(paths)}",
+        action_success=f"Patched {', '.join(paths)}",
+        action_failed=f"Couldn't patch {', '.join(paths)}",
+        message=patch,
+    )
+    tool_call.stream()
+
+    resolved = {path: resolve_path(path).resolve() for path in paths}
+    # The patched text of every file, and its text before the patch.
+    texts: dict[Path, str | None] = {}
+    originals: dict[Path, str | None] = {}
+    cache = get_file_cache(app_config.file_cache_mb)
+    summary = []
+    try:
+        with contextlib.ExitStack() as stack:
+            # Locked in a stable order, so concurrent patches can't deadlock.
+            for path in sorted(set(resolved.values())):
+                stack.enter_context(file_lock(path))
+
+            for file_patch in file_patches:
+                path = resolved[file_patch.path]
+                if path not in texts:
+                    # The cached lines keep the file's line endings.
+                    text = "".join(cache.read(path)) if path.is_file() else None
+                    texts[path] = originals[path] = text
+                try:
+                    texts[path], added, removed = _apply(file_patch, texts[path])
+                except PatchError as e:
+                    return False, f"Error: {file_patch.path}: {e} No file was changed."
+                summary.append(f"{file_patch.path} (+{added} -{removed})")
+
+            _write(texts, originals)
+
+        for path, text in texts.items():
+            if text is None:
+                cache.discard(path)
+            else:
+                cache.store(path, split_lines(text))
+        return True, f"Successfully patched {', '.join(summary)}."
+
+    except PermissionError as e:
+        return False, f"Error: No permission to modify file '{e.filename}'."
+    except Exception as e:
+        return False, f"Error applying the patch: {e}"
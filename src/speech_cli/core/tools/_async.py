@@ -0,0 +1,120 @@
+import asyncio
+import contextlib
+import contextvars
+import functools
+import logging
+import os
+import signal
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+from speech_cli.config import app_config
+
+logger = logging.getLogger(__name__)
+
+_executors: dict[int, ThreadPoolExecutor] = {}
+# The async variants of the tools, by tool.
+_variants: dict[Callable, Callable[..., Coroutine]] = {}
+
+
+def _tool_io_executor() -> ThreadPoolExecutor:
+    workers = app_config.tool_io_workers
+    if workers not in _executors:
+        _executors[workers] = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="speech-tool-io"
+        )
+    return _executors[workers]
+
+
+async def run_tool_io(func: Callable, *args, **kwargs) -> Any:
+    """Run blocking tool I/O in the bounded tool I/O thread pool.
+
+    The context is copied to the thread, like `asyncio.to_thread`, so the tool
+    streams its tool call and resolves paths in the build's workspace.
+    """
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_tool_io_executor(), call)
+
+
+async def run_process(
+    command: str | list[str], cwd: Any, timeout: float | None
+) -> tuple[int, str, str]:
+    """Run a command, a shell command when given a string, without blocking.
+
+    The command runs in its own process group, which is killed when the command
+    times out, or when the awaiting task is cancelled.
+
+    Returns:
+        tuple[int, str, str]: The return code, the stdout and the stderr.
+
+    Raises:
+        TimeoutError: If the command runs longer than `timeout` seconds.
+
+    """
+    options = {
+        "cwd": cwd,
+        "stdout": asyncio.subprocess.PIPE,
+        "stderr": asyncio.subprocess.PIPE,
+        "start_new_session": os.name == "posix",
+    }
+    if isinstance(command, str):
+        process = await asyncio.create_subprocess_shell(command, **options)
+    else:
+        process = await asyncio.create_subprocess_exec(*command, **options)
+
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except (TimeoutError, asyncio.CancelledError):
+        _kill(process)
+        with contextlib.suppress(ProcessLookupError):
+            await process.wait()
+        raise
+
+    return (
+        process.returncode,
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+    )
+
+
+def _kill(process: asyncio.subprocess.Process):
+    """Kill a process, with the processes it started on POSIX."""
+    logger.debug("Killing the process %d.", process.pid)
+    with contextlib.suppress(ProcessLookupError):
+        if os.name == "posix":
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+
+
+def async_variant(tool: Callable) -> Callable:
+    """Register the decorated coroutine function as a tool's async variant."""
+
+    def register(coroutine: Callable[..., Coroutine]) -> Callable[..., Coroutine]:
+        _variants[tool] = coroutine
+        return coroutine
+
+    return register
+
+
+def as_async_tool(tool: Callable | BaseTool) -> BaseTool:
+    """Make a tool with an async variant, run by async graphs without blocking.
+
+    The registered async variant of the tool is used, otherwise the tool is run in
+    the tool I/O thread pool. Tools already made, e.g. reviewed tools, are kept.
+    """
+    if isinstance(tool, BaseTool):
+        return tool
+
+    coroutine = _variants.get(tool)
+    if coroutine is None:
+
+        @functools.wraps(tool)
+        async def coroutine(*args, **kwargs):
+            return await run_tool_io(tool, *args, **kwargs)
+
+    return StructuredTool.from_function(func=tool, coroutine=coroutine)
@@ -0,0 +1,37 @@
+import functools
+import inspect
+import logging
+from collections.abc import Callable
+
+from speech_cli.config import app_config
+from speech_cli.core.tool_output import get_tool_output_store
+
+logger = logging.getLogger(__name__)
+
+
+def _bound(success: bool, output: str) -> tuple[bool, str]:
+    if isinstance(output, str) and len(output) > app_config.tool_output_max_chars:
+        store = get_tool_output_store(app_config.tool_output_store_mb)
+        output = store.excerpt(output, app_config.tool_output_max_chars)
+    return success, output
+
+
+def bounds_output(tool: Callable) -> Callable:
+    """Cut a tool's output over the `tool_output_max_chars` budget to an excerpt.
+
+    The whole output is kept in the tool output store, for the model to page or
+    grep with `read_tool_output`.
+    """
+    if inspect.iscoroutinefunction(tool):
+
+        @functools.wraps(tool)
+        async def async_wrapper(*args, **kwargs):
+            return _bound(*await tool(*args, **kwargs))
+
+        return async_wrapper
+
+    @functools.wraps(tool)
+    def wrapper(*args, **kwargs):
+        return _bound(*tool(*args, **kwargs))
+
+    return wrapper
@@ -1,7 +1,7 @@
 import logging
-from pathlib import Path
 
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import change_directory as chdir
 
 logger = logging.getLogger(__name__)
 
@@ -31,15 +31,9 @@ def change_directory(path: str) -> tuple[bool, str]:
     )
     tool_call.stream()
     try:
-        p = Path(path)
-        p.resolve(strict=True)
-        # Cannot use os.chdir with pathlib, so we keep it for now,
-        # but the check is with pathlib
-        import os
-
-        os.chdir(p)
-        return True, f"Switched to directory: {Path.cwd()}"
-    except FileNotFoundError:
+        directory = chdir(path)
+        return True, f"Switched to directory: {directory}"
+    except (FileNotFoundError, NotADirectoryError):
         return False, f"Error: Directory '{path}' does not exist."
     except PermissionError:
         return False, f"Error: No permission to access directory '{path}'."
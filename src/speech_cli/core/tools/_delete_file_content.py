@@ -1,13 +1,18 @@
 # ruff: noqa: PLR0912 PLR0911
 
 import logging
-from pathlib import Path
 
+from speech_cli.config import app_config
+from speech_cli.core.file_cache import get_file_cache
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import resolve_path
+
+from ._file_lock import locks_file
 
 logger = logging.getLogger(__name__)
 
 
+@locks_file
 def delete_file_content(
     path: str,
     row: int | None = None,
@@ -47,11 +52,12 @@ def delete_file_content(
     )
     tool_call.stream()
     try:
-        p = Path(path)
+        p = resolve_path(path)
         if not p.is_file():
             return False, f"Error: File '{path}' does not exist."
 
-        lines = p.read_text(encoding="utf-8").splitlines(True)
+        cache = get_file_cache(app_config.file_cache_mb)
+        lines = cache.read(p)
         total_lines = len(lines)
 
         if substring is not None:
@@ -70,7 +76,7 @@ def delete_file_content(
             if not modified_rows:
                 return True, f"No occurrences of '{substring}' found to delete."
 
-            p.write_text("".join(lines), encoding="utf-8")
+            cache.write(p, lines)
             return (
                 True,
                 "Successfully removed "
@@ -83,18 +89,18 @@ def delete_file_content(
                 return True, "No rows were within range to delete."
             for r in rows_to_delete:
                 del lines[r]
-            p.write_text("".join(lines), encoding="utf-8")
+            cache.write(p, lines)
             return True, f"Successfully deleted rows {rows_to_delete} from '{path}'."
 
         elif row is not None:
             if row >= total_lines:
                 return False, f"Error: Row {row} is out of range."
             del lines[row]
-            p.write_text("".join(lines), encoding="utf-8")
+            cache.write(p, lines)
             return True, f"Successfully deleted row {row} from '{path}'."
 
         else:
-            p.write_text("")
+            cache.write(p, [])
             return True, f"Successfully cleared all content from '{path}'."
 
     except PermissionError:
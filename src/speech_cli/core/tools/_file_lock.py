@@ -0,0 +1,42 @@
+import functools
+import inspect
+import logging
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from speech_cli.core.workdir import resolve_path
+
+logger = logging.getLogger(__name__)
+
+_locks: dict[Path, threading.RLock] = {}
+_locks_guard = threading.Lock()
+
+
+@contextmanager
+def file_lock(path: str | Path) -> Iterator[None]:
+    """Hold the lock of a file, while it's being read, modified and written.
+
+    Agents working concurrently may edit the same file, so every file tool runs
+    its read-modify-write cycle under the file's lock.
+    """
+    key = resolve_path(path).resolve()
+    with _locks_guard:
+        lock = _locks.setdefault(key, threading.RLock())
+
+    with lock:
+        yield
+
+
+def locks_file(tool: Callable) -> Callable:
+    """Run a file tool under the lock of its `path` argument."""
+    signature = inspect.signature(tool)
+
+    @functools.wraps(tool)
+    def wrapper(*args, **kwargs):
+        path = signature.bind(*args, **kwargs).arguments["path"]
+        with file_lock(path):
+            return tool(*args, **kwargs)
+
+    return wrapper
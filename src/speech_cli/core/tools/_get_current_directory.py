@@ -1,7 +1,7 @@
 import logging
-from pathlib import Path
 
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import current_directory
 
 logger = logging.getLogger(__name__)
 
@@ -23,7 +23,7 @@ def get_current_directory() -> tuple[bool, str]:
         action_in_progress="Retrieving current directory",
         action_success="Retrieved current directory",
         action_failed="Couldn't retrieve current directory",
-        message=f"The current directory: {Path.cwd()}",
+        message=f"The current directory: {current_directory()}",
     )
     tool_call.stream()
-    return True, str(Path.cwd())
+    return True, str(current_directory())
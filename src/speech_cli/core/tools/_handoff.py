@@ -46,8 +46,9 @@ def transfer_to_generator(
         tool_call_id=tool_call_id,
     )
 
+    # The Translator runs alongside the Generator, translating the HLC as it streams.
     return Command(
         graph=Command.PARENT,
-        goto="Generator",
+        goto=["Generator", "Translator"],
         update={"messages": state.messages + [tool_message], "summary": summary},
     )
@@ -1,12 +1,17 @@
 import json
 import logging
-from pathlib import Path
 
+from speech_cli.config import app_config
+from speech_cli.core.file_cache import get_file_cache, split_lines
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import resolve_path
+
+from ._file_lock import locks_file
 
 logger = logging.getLogger(__name__)
 
 
+@locks_file
 def insert_file_content(
     path: str, content: str, row: int = None, rows: list[int] = None
 ) -> tuple[bool, str]:
@@ -35,7 +40,7 @@ def insert_file_content(
     )
     tool_call.stream()
     try:
-        p = Path(path)
+        p = resolve_path(path)
         p.parent.mkdir(parents=True, exist_ok=True)
         if not p.exists():
             p.touch()
@@ -49,8 +54,9 @@ def insert_file_content(
         if content and not content.endswith("\n"):
             content += "\n"
 
-        lines = p.read_text(encoding="utf-8").splitlines(True)
-        content_lines = content.splitlines(True)
+        cache = get_file_cache(app_config.file_cache_mb)
+        lines = cache.read(p)
+        content_lines = split_lines(content)
 
         if rows is not None:
             rows = sorted(set(rows), reverse=True)
@@ -58,19 +64,20 @@ def insert_file_content(
                 if r > len(lines):
                     lines.extend(["\n"] * (r - len(lines)))
                 lines[r:r] = content_lines
-            p.write_text("".join(lines), encoding="utf-8")
+            cache.write(p, lines)
             return True, f"Successfully inserted content at rows {rows} in '{path}'."
 
         elif row is not None:
             if row > len(lines):
                 lines.extend(["\n"] * (row - len(lines)))
             lines[row:row] = content_lines
-            p.write_text("".join(lines), encoding="utf-8")
+            cache.write(p, lines)
             return True, f"Successfully inserted content at row {row} in '{path}'."
 
         else:
             with p.open("a", encoding="utf-8") as file:
                 file.write(content)
+            cache.discard(p)
             return True, f"Successfully appended content to '{path}'."
 
     except PermissionError:
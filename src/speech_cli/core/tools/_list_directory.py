@@ -1,11 +1,14 @@
 import logging
-from pathlib import Path
 
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import current_directory, resolve_path
+
+from ._bounded_output import bounds_output
 
 logger = logging.getLogger(__name__)
 
 
+@bounds_output
 def list_directory(path: str | None = None) -> tuple[bool, str]:
     """List the files and subdirectories in a specified directory.
 
@@ -33,7 +36,7 @@ def list_directory(path: str | None = None) -> tuple[bool, str]:
     )
     tool_call.stream()
     try:
-        target_path = Path(path) if path else Path.cwd()
+        target_path = resolve_path(path) if path else current_directory()
         if not target_path.is_dir():
             return False, f"Error: '{target_path}' is not a valid directory."
 
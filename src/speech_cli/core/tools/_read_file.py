@@ -1,20 +1,124 @@
-# ruff: noqa: PLR0911 PLR0912
+import itertools
 import json
 import logging
 from pathlib import Path
 
+from speech_cli.config import app_config
+from speech_cli.core.file_cache import get_file_cache, split_lines
+from speech_cli.core.line_index import get_line_index_store
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import resolve_path
+
+from ._bounded_output import bounds_output
 
 logger = logging.getLogger(__name__)
 
+# Larger files are read through their line index, and paged when read whole.
+_LARGE_FILE = 1024 * 1024
+# The most a single line range read returns, the model reads on from there.
+_MAX_READ_BYTES = 1024 * 1024
+
+
+def _read_lines(
+    path: Path, size: int, start: int, count: int
+) -> tuple[list[str], bool]:
+    """Read a range of lines, seeking to it in large files, with their line index.
+
+    Returns:
+        tuple[list[str], bool]: The lines, and whether they were cut short.
+
+    """
+    if size > _LARGE_FILE:
+        return (
+            get_line_index_store().get(path).read(path, start, count, _MAX_READ_BYTES)
+        )
+
+    lines, read = [], 0
+    for line in itertools.islice(_cached_lines(path), start, start + count):
+        if lines and read + len(line) > _MAX_READ_BYTES:
+            return lines, True
+        lines.append(line)
+        read += len(line)
+    return lines, False
+
+
+def _cached_lines(path: Path) -> list[str]:
+    """Return the lines of a file, from the file cache, unless it isn't UTF-8 text."""
+    try:
+        return get_file_cache(app_config.file_cache_mb).read(path)
+    except UnicodeDecodeError:
+        return split_lines(
+            path.read_text(encoding="utf-8", errors="replace", newline="")
+        )
+
+
+def _read_range(
+    path: Path, size: int, start_row: int, end_row: int | None, as_json: bool
+) -> tuple[bool, str]:
+    """Read a line range of a file, every line after its number."""
+    if as_json:
+        return False, "Error: Cannot parse as JSON when displaying line numbers."
+    if start_row < 0:
+        return False, "Error: start_row must be non-negative."
+    if end_row is not None and end_row < start_row:
+        return False, "Error: end_row must be greater than or equal to start_row."
+
+    count = 1 if end_row is None else end_row - start_row + 1
+    selected_lines, cut = _read_lines(path, size, start_row, count)
+    if not selected_lines:
+        return False, f"Error: start_row {start_row} is out of range."
+    content = "".join(
+        f"Line {start_row + i}: {line}" for i, line in enumerate(selected_lines)
+    )
+    if cut:
+        next_row = start_row + len(selected_lines)
+        content += (
+            f"\n[... stopped at {_MAX_READ_BYTES // 1024} KB, read on from"
+            f" start_row={next_row} ...]"
+        )
+    return True, content
+
+
+def _read_page(path: Path, size: int, as_json: bool) -> tuple[bool, str]:
+    """Read the first page of a large file, rather than loading it whole."""
+    if as_json:
+        return False, (
+            f"Error: The file is too large ({size / 1024 / 1024:.2f} MB) to parse as"
+            " JSON, read it by line ranges instead."
+        )
+
+    index = get_line_index_store().get(path)
+    # Leaving room for the note, within the tool output budget.
+    page_bytes = max(1, app_config.tool_output_max_chars - 256)
+    page, _ = index.read(path, 0, index.lines, page_bytes)
+    return True, (
+        f"The file is large ({size / 1024 / 1024:.2f} MB, {index.lines}"
+        f" lines), showing lines 0 - {len(page) - 1}. Read more with"
+        f" start_row and end_row.\n{''.join(page)}"
+    )
 
+
+def _parse_json(content: str) -> tuple[bool, str]:
+    """Parse a file's content as JSON, returning it indented."""
+    try:
+        parsed_json = json.loads(content)
+        return True, json.dumps(parsed_json, indent=4)
+    except json.JSONDecodeError as e:
+        return (
+            False,
+            f"Error: File content is not valid JSON. {e}\n\nRaw content:\n{content}",
+        )
+
+
+@bounds_output
 def read_file(
     path: str, start_row: int = None, end_row: int = None, as_json: bool = False
 ) -> tuple[bool, str]:
     """Read content from a file.
 
-    This function can read an entire file or specific lines. It also includes
-    a safeguard against reading very large files. It can optionally parse the
+    This function can read an entire file or specific lines. Line ranges are
+    read without loading the file, so they can be read anywhere in very large
+    files, which are paged rather than read whole. It can optionally parse the
     file content as JSON.
 
     Args:
@@ -38,60 +142,21 @@ def read_file(
     )
     tool_call.stream()
     try:
-        p = Path(path)
+        p = resolve_path(path)
         if not p.exists():
             return False, f"Error: File '{path}' does not exist."
         if not p.is_file():
             return False, f"Error: '{path}' is not a file."
 
-        if p.stat().st_size > 10 * 1024 * 1024:  # 10 MB limit
-            return (
-                False,
-                "Warning: File is very large "
-                f"({p.stat().st_size / 1024 / 1024:.2f} MB).",
-            )
-
-        with p.open(encoding="utf-8", errors="replace") as file:
-            lines = file.readlines()
-
+        size = p.stat().st_size
         if start_row is not None:
-            if start_row < 0:
-                return False, "Error: start_row must be non-negative."
-            if end_row is None:
-                if start_row >= len(lines):
-                    return False, f"Error: start_row {start_row} is out of range."
-                content = f"Line {start_row}: {lines[start_row]}"
-            else:
-                if end_row < start_row:
-                    return (
-                        False,
-                        "Error: end_row must be greater than or equal to start_row.",
-                    )
-                selected_lines = lines[start_row : end_row + 1]
-                content = "".join(
-                    f"Line {start_row + i}: {line}"
-                    for i, line in enumerate(selected_lines)
-                )
+            result = _read_range(p, size, start_row, end_row, as_json)
+        elif size > _LARGE_FILE:
+            result = _read_page(p, size, as_json)
         else:
-            content = "".join(lines)
-
-        if as_json:
-            if start_row is not None:
-                return (
-                    False,
-                    "Error: Cannot parse as JSON when displaying line numbers.",
-                )
-            try:
-                parsed_json = json.loads(content)
-                return True, json.dumps(parsed_json, indent=4)
-            except json.JSONDecodeError as e:
-                return (
-                    False,
-                    "Error: File content is not valid JSON. "
-                    f"{e}\n\nRaw content:\n{content}",
-                )
-
-        return True, content
+            content = "".join(_cached_lines(p))
+            result = _parse_json(content) if as_json else (True, content)
+        return result
 
     except PermissionError:
         return False, f"Error: No permission to read file '{path}'."
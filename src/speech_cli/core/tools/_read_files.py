@@ -0,0 +1,258 @@
+import asyncio
+import logging
+import re
+from pathlib import Path
+
+from speech_cli.config import app_config
+from speech_cli.core.line_index import get_line_index_store
+from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import current_directory, resolve_path
+
+from ._async import async_variant, run_tool_io
+from ._bounded_output import bounds_output
+from ._read_file import _LARGE_FILE, _cached_lines, _read_lines
+
+logger = logging.getLogger(__name__)
+
+# A path ending with a line range, e.g. `app.py:10-40`, or a single line.
+_RANGE = re.compile(r"^(?P<path>.+):(?P<start>\d+)(?:-(?P<end>\d+))?$")
+_GLOB_CHARS = re.compile(r"[*?\[]")
+_MAX_FILES = 50
+
+
+def is_glob(path: str) -> bool:
+    """Whether a path is a glob pattern, rather than a single file."""
+    return bool(_GLOB_CHARS.search(path))
+
+
+def split_range(path: str) -> tuple[str, int | None, int | None]:
+    """Split a path into its file and its line range, if any."""
+    match = _RANGE.match(path)
+    if not match:
+        return path, None, None
+
+    start = int(match["start"])
+    return match["path"], start, int(match["end"]) if match["end"] else start
+
+
+def strip_range(path: str) -> str:
+    """Return a path without its line range, if any."""
+    return split_range(path)[0]
+
+
+def _glob(pattern: str) -> list[str]:
+    """Return the files a glob pattern matches, relative to the current directory."""
+    pattern_path = Path(pattern).expanduser()
+    if pattern_path.is_absolute():
+        root = Path(pattern_path.anchor)
+        matches = root.glob(str(pattern_path.relative_to(root)))
+        return sorted(str(match) for match in matches if match.is_file())
+
+    root = current_directory()
+    return sorted(
+        str(match.relative_to(root)) for match in root.glob(pattern) if match.is_file()
+    )
+
+
+def _expand(paths: list[str]) -> list[tuple[str, int | None, int | None]]:
+    """Expand the globs and split the line ranges off the paths, in order."""
+    files, seen = [], set()
+    for entry in paths:
+        path, start, end = split_range(entry)
+        for name in _glob(path) if is_glob(path) else [path]:
+            if (name, start, end) not in seen:
+                seen.add((name, start, end))
+                files.append((name, start, end))
+    return files
+
+
+def _read_range(path: Path, start: int, end: int) -> str:
+    """Read a line range of a file, every line after its number."""
+    if end < start:
+        return f"Error: The line range {start}-{end} ends before it starts."
+    lines, _ = _read_lines(path, path.stat().st_size, start, end - start + 1)
+    if not lines:
+        return f"Error: Line {start} is out of range."
+    return "".join(f"Line {start + i}: {line}" for i, line in enumerate(lines))
+
+
+def _read_whole(path: Path, name: str, max_chars: int) -> str:
+    """Read a file, the start of it up to `max_chars` if it's large."""
+    if path.stat().st_size <= _LARGE_FILE:
+        return "".join(_cached_lines(path))
+
+    index = get_line_index_store().get(path)
+    lines, _ = index.read(path, 0, index.lines, max_chars)
+    return "".join(lines) + (
+        f"[... the file has {index.lines} lines, read on with"
+        f" read_file('{name}', start_row={len(lines)}) ...]\n"
+    )
+
+
+def _read_one(path: str, start: int | None, end: int | None, max_chars: int) -> str:
+    """Read a file, or its line range, up to `max_chars`, or the error reading it."""
+    try:
+        p = resolve_path(path)
+        if not p.is_file():
+            return f"Error: File '{path}' does not exist."
+        if start is not None:
+            return _read_range(p, start, end)
+        return _read_whole(p, path, max_chars)
+
+    except PermissionError:
+        return f"Error: No permission to read file '{path}'."
+    except Exception as e:
+        return f"Error reading file: {e}"
+
+
+def _tool_call(paths: list[str]) -> ToolCall:
+    return ToolCall(
+        name="read_files",
+        action_in_progress=f"Reading {len(paths)} files or patterns",
+        action_success=f"Read {len(paths)} files or patterns",
+        action_failed=f"Couldn't read {len(paths)} files or patterns",
+        message="\n".join(paths),
+    )
+
+
+def _cut_note(path: str, row: int) -> str:
+    return (
+        f"[... cut to the budget, read on with read_file('{path}', start_row={row})"
+        " ...]\n"
+    )
+
+
+def _skipped_note(files: list[tuple[str, int | None, int | None]]) -> str:
+    if not files:
+        return ""
+    paths = ", ".join(path for path, _, _ in files)
+    return f"[... over the budget, not read: {paths} ...]"
+
+
+def _cut(content: str, size: int, path: str, start: int | None) -> str:
+    """Cut a file's content down to the whole lines within `size` characters.
+
+    The note on where to read on counts in `size` too. It's empty if no line fits.
+    """
+    # The note is sized for the last row, so the cut lines fit with it.
+    room = size - len(_cut_note(path, content.count("\n") + (start or 0)))
+    content = content[: max(room, 0)]
+    content = content[: content.rfind("\n") + 1]
+    if not content:
+        return ""
+    return content + _cut_note(path, content.count("\n") + (start or 0))
+
+
+def _budget(max_chars: int | None) -> int:
+    """Return the character budget of a call, at most the tool output budget."""
+    limit = app_config.tool_output_max_chars
+    return min(max_chars or limit, limit)
+
+
+def _combine(
+    files: list[tuple[str, int | None, int | None]],
+    contents: list[str],
+    budget: int,
+) -> str:
+    """Delimit the files' contents, cutting them down to the budget, in order.
+
+    The budget counts the characters of the delimiting headers, and of the notes
+    on the cut and left out files too, so the output is never cut again to the
+    tool output budget. The files beyond the read contents, over the file limit,
+    are counted.
+    """
+    parts = []
+    read = files[: len(contents)]
+    left_out = ""
+    if len(files) > len(read):
+        left_out = (
+            f"[... {len(files) - len(read)} more matching files left out, over the"
+            f" {_MAX_FILES} files of a call, read them with narrower patterns ...]"
+        )
+        budget -= len(left_out) + 1
+
+    # Room is kept for the note on the files after the current one, in case the
+    # next one doesn't fit, and for the blank line between the files.
+    left = budget
+    for index, ((path, start, end), content) in enumerate(
+        zip(read, contents, strict=True)
+    ):
+        header = f"=== {path} ===\n"
+        if start is not None:
+            header = f"=== {path}:{start}-{end} ===\n"
+        text = content if content.endswith("\n") else f"{content}\n"
+        skipped = _skipped_note(read[index + 1 :])
+        room = left - len(header) - (len(skipped) + 1 if skipped else 0)
+        if len(text) <= room:
+            parts.append(header + text)
+            left -= len(header) + len(text) + 1
+            continue
+
+        if text := _cut(text, room, path, start):
+            parts.append(header + text)
+            if skipped:
+                parts.append(skipped)
+        else:
+            parts.append(_skipped_note(read[index:]))
+        break
+
+    if left_out:
+        parts.append(left_out)
+    return "\n".join(parts)
+
+
+@bounds_output
+def read_files(paths: list[str], max_chars: int = None) -> tuple[bool, str]:
+    """Read several files in a single call, e.g. to look around a project.
+
+    Every path is a file, optionally with a line range, e.g. `app.py:10-40`
+    (0-based, inclusive), or a glob pattern, e.g. `src/**/*.py`. The files are
+    returned in order, each after a `=== path ===` line, the lines of a range
+    after their numbers, and cut down to the total character budget, which is at
+    most the tool output budget. At most 50 files are read in a call.
+
+    Args:
+        paths (list[str]): The files, files with a line range, or glob patterns.
+        max_chars (int, optional): The total character budget of the returned
+            files, with their `=== path ===` lines.
+
+    Returns:
+        tuple[bool, str]: A tuple indicating success or failure and the
+                          delimited files or an error message.
+
+    """
+    _tool_call(paths).stream()
+    if not paths:
+        return False, "Error: No paths to read."
+
+    budget = _budget(max_chars)
+    files = _expand(paths)
+    if not files:
+        return False, "Error: No file matches the paths."
+
+    contents = [
+        _read_one(path, start, end, budget) for path, start, end in files[:_MAX_FILES]
+    ]
+    return True, _combine(files, contents, budget)
+
+
+@async_variant(read_files)
+@bounds_output
+async def aread_files(paths: list[str], max_chars: int = None) -> tuple[bool, str]:
+    """Read several files in a single call, the files concurrently."""
+    _tool_call(paths).stream()
+    if not paths:
+        return False, "Error: No paths to read."
+
+    budget = _budget(max_chars)
+    files = await run_tool_io(_expand, paths)
+    if not files:
+        return False, "Error: No file matches the paths."
+
+    contents = await asyncio.gather(
+        *(
+            run_tool_io(_read_one, path, start, end, budget)
+            for path, start, end in files[:_MAX_FILES]
+        )
+    )
+    return True, _combine(files, contents, budget)
@@ -0,0 +1,72 @@
+import itertools
+import logging
+import re
+
+from speech_cli.config import app_config
+from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.tool_output import get_tool_output_store
+
+logger = logging.getLogger(__name__)
+
+
+def read_tool_output(
+    handle: str, start_line: int = 0, line_count: int = 200, pattern: str = None
+) -> tuple[bool, str]:
+    """Read more of a long tool output, that was cut down to its head and tail.
+
+    Reads a range of lines of the stored output, or with a pattern, the lines
+    matching it.
+
+    Args:
+        handle (str): The handle of the stored output, e.g. out-1a2b3c4d5e6f.
+        start_line (int, optional): The line to start reading, or searching, from
+                                    (0-based).
+        line_count (int, optional): The maximum number of lines to return.
+        pattern (str, optional): A regular expression, to only return the lines
+                                 matching it.
+
+    Returns:
+        tuple[bool, str]: A tuple indicating success or failure and the numbered
+                          lines or an error message.
+
+    """
+    tool_call = ToolCall(
+        name="read_tool_output",
+        action_in_progress=f"Reading the tool output {handle}",
+        action_success=f"Read the tool output {handle}",
+        action_failed=f"Couldn't read the tool output {handle}",
+        message=pattern or f"Lines {start_line} - {start_line + line_count - 1}",
+    )
+    tool_call.stream()
+    if start_line < 0 or line_count < 1:
+        return False, "Error: start_line must be non-negative, line_count positive."
+
+    try:
+        regex = re.compile(pattern) if pattern else None
+    except re.error as e:
+        return False, f"Error: Invalid pattern: {e}"
+
+    store = get_tool_output_store(app_config.tool_output_store_mb)
+    try:
+        numbered = itertools.islice(enumerate(store.lines(handle)), start_line, None)
+        if regex:
+            numbered = (
+                (number, line) for number, line in numbered if regex.search(line)
+            )
+        selected = list(itertools.islice(numbered, line_count))
+    except KeyError:
+        return False, f"Error: No stored tool output {handle}, it may have expired."
+    except Exception as e:
+        return False, f"Error reading the tool output: {e}"
+
+    if not selected:
+        return True, "No matching lines." if regex else "No lines in this range."
+
+    content = "".join(f"Line {number}: {line}" for number, line in selected)
+    max_chars = app_config.tool_output_max_chars
+    if len(content) > max_chars:
+        content = (
+            f"{content[:max_chars]}\n[... cut to {max_chars} characters, read fewer"
+            " lines ...]"
+        )
+    return True, content
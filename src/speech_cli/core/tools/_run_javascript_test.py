@@ -2,10 +2,24 @@ import logging
 import subprocess
 
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import current_directory
+
+from ._async import async_variant, run_process
+from ._terminal import COMMAND_TIMEOUT
 
 logger = logging.getLogger(__name__)
 
 
+def _test_tool_call(file_path: str) -> ToolCall:
+    return ToolCall(
+        name="run_javascript_test",
+        action_in_progress="Running javascript test",
+        action_success="Javascript test passed",
+        action_failed="Javascript test failed",
+        message=file_path,
+    )
+
+
 def run_javascript_test(file_path: str) -> dict:
     """Run a javascript test file and returns the result.
 
@@ -16,18 +30,33 @@ def run_javascript_test(file_path: str) -> dict:
         A dictionary with the test result.
 
     """
-    tool_call = ToolCall(
-        name="run_javascript_test",
-        action_in_progress="Running javascript test",
-        action_success="Javascript test passed",
-        action_failed="Javascript test failed",
-        message=file_path,
-    )
-    tool_call.stream()
+    _test_tool_call(file_path).stream()
     command = ["jest", file_path]
 
     try:
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
+        result = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=current_directory(),
+            timeout=COMMAND_TIMEOUT,
+        )
         return True, result.stdout
     except subprocess.CalledProcessError as e:
         return False, e.stderr
+    except subprocess.TimeoutExpired:
+        return False, "Test timed out after 10 minutes"
+
+
+@async_variant(run_javascript_test)
+async def arun_javascript_test(file_path: str) -> dict:
+    """Run a javascript test file without blocking, see `run_javascript_test`."""
+    _test_tool_call(file_path).stream()
+    try:
+        returncode, stdout, stderr = await run_process(
+            ["jest", file_path], current_directory(), COMMAND_TIMEOUT
+        )
+    except TimeoutError:
+        return False, "Test timed out after 10 minutes"
+    return (True, stdout) if returncode == 0 else (False, stderr)
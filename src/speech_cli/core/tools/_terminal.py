@@ -1,18 +1,60 @@
 import logging
 import subprocess
 from datetime import datetime
-from pathlib import Path
+from weakref import WeakKeyDictionary
 
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import Workspace, current_directory, current_workspace
+
+from ._async import async_variant, run_process
+from ._bounded_output import bounds_output
 
 logger = logging.getLogger(__name__)
-# List to store command history
-command_history = []
+# The command history of every workspace, like its current directory, so the
+# builds running concurrently don't see each other's commands.
+_workspace_histories: WeakKeyDictionary[Workspace, list[dict]] = WeakKeyDictionary()
+# The command history outside of a workspace.
+_process_history: list[dict] = []
 
 # Maximum history size
 MAX_HISTORY_SIZE = 50
 
+COMMAND_TIMEOUT = 600  # 10 minutes timeout
+
+
+def _command_history() -> list[dict]:
+    """Return the command history of the current workspace, or of the process."""
+    current = current_workspace()
+    if current is None:
+        return _process_history
+    return _workspace_histories.setdefault(current, [])
+
+
+def _record_command(command: str, success: bool):
+    """Add a command to the history."""
+    command_history = _command_history()
+    command_history.append(
+        {
+            "timestamp": datetime.now().isoformat(),
+            "command": command,
+            "success": success,
+        }
+    )
+    if len(command_history) > MAX_HISTORY_SIZE:
+        command_history.pop(0)
+
 
+def _terminal_tool_call(command: str) -> ToolCall:
+    return ToolCall(
+        name="terminal_use",
+        action_in_progress="Executing command",
+        action_success="Executed command",
+        action_failed="Couldn't execute command",
+        message=command,
+    )
+
+
+@bounds_output
 def terminal_use(command: str) -> tuple[bool, str]:
     """Execute a command in the terminal and returns the output.
 
@@ -33,17 +75,10 @@ def terminal_use(command: str) -> tuple[bool, str]:
                           error message if not.
 
     """
-    tool_call = ToolCall(
-        name="terminal_use",
-        action_in_progress="Executing command",
-        action_success="Executed command",
-        action_failed="Couldn't execute command",
-        message=command,
-    )
-    tool_call.stream()
+    _terminal_tool_call(command).stream()
 
     try:
-        working_dir = Path.cwd()
+        working_dir = current_directory()
         if not working_dir.exists():
             return False, f"Directory does not exist: {working_dir}"
 
@@ -54,26 +89,42 @@ def terminal_use(command: str) -> tuple[bool, str]:
             cwd=working_dir,
             capture_output=True,
             text=True,
-            timeout=600,  # 10 minutes timeout
+            timeout=COMMAND_TIMEOUT,
         )
 
         success = result.returncode == 0
-        output = result.stdout if success else result.stderr
-
-        # Add to command history
-        command_history.append(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "command": command,
-                "success": success,
-            }
+        _record_command(command, success)
+        return success, result.stdout if success else result.stderr
+
+    except subprocess.TimeoutExpired:
+        return False, "Command timed out after 10 minutes"
+    except Exception as e:
+        return False, f"Error executing command: {e}"
+
+
+@async_variant(terminal_use)
+@bounds_output
+async def aterminal_use(command: str) -> tuple[bool, str]:
+    """Execute a command in the terminal without blocking, see `terminal_use`.
+
+    The command is killed when the awaiting task is cancelled.
+    """
+    _terminal_tool_call(command).stream()
+
+    try:
+        working_dir = current_directory()
+        if not working_dir.exists():
+            return False, f"Directory does not exist: {working_dir}"
+
+        returncode, stdout, stderr = await run_process(
+            command, working_dir, COMMAND_TIMEOUT
         )
-        if len(command_history) > MAX_HISTORY_SIZE:
-            command_history.pop(0)
 
-        return success, output
+        success = returncode == 0
+        _record_command(command, success)
+        return success, stdout if success else stderr
 
-    except subprocess.TimeoutExpired:
+    except TimeoutError:
         return False, "Command timed out after 10 minutes"
     except Exception as e:
         return False, f"Error executing command: {e}"
@@ -105,6 +156,7 @@ def get_command_history(count: int = 10) -> tuple[bool, str]:
         message=f"Retrieved the last {count} executed commands.",
     )
     tool_call.stream()
+    command_history = _command_history()
     if len(command_history) == 0:
         return True, "No command execution history."
 
@@ -1,13 +1,18 @@
 # ruff: noqa: PLR0911 PLR0912
 import json
 import logging
-from pathlib import Path
 
+from speech_cli.config import app_config
+from speech_cli.core.file_cache import get_file_cache
 from speech_cli.core.tool_call import ToolCall
+from speech_cli.core.workdir import resolve_path
+
+from ._file_lock import locks_file
 
 logger = logging.getLogger(__name__)
 
 
+@locks_file
 def update_file_content(
     path: str,
     content: str,
@@ -42,11 +47,12 @@ def update_file_content(
     )
     tool_call.stream()
     try:
-        p = Path(path)
+        p = resolve_path(path)
         if not p.is_file():
             return False, f"Error: File '{path}' does not exist."
 
-        lines = p.read_text(encoding="utf-8").splitlines(True)
+        cache = get_file_cache(app_config.file_cache_mb)
+        lines = cache.read(p)
         total_lines = len(lines)
 
         if not isinstance(content, str):
@@ -81,7 +87,7 @@ def update_file_content(
         if not updated_rows:
             return True, "No content was updated."
 
-        p.write_text("".join(lines), encoding="utf-8")
+        cache.write(p, lines)
         if substring:
             return (
                 True,
@@ -1,11 +1,17 @@
 import json
 import logging
-from pathlib import Path
 from typing import Literal
 
+from speech_cli.config import app_config
+from speech_cli.core.file_cache import get_file_cache, split_lines
+from speech_cli.core.workdir import resolve_path
+
+from ._file_lock import locks_file
+
 logger = logging.getLogger(__name__)
 
 
+@locks_file
 def write_file(
     path: str, content: str, mode: Literal["overwrite", "append"] = "overwrite"
 ) -> tuple[bool, str]:
@@ -27,7 +33,7 @@ def write_file(
 
     """
     try:
-        p = Path(path)
+        p = resolve_path(path)
         p.parent.mkdir(parents=True, exist_ok=True)
 
         if not isinstance(content, str):
@@ -42,9 +48,13 @@ def write_file(
         if content and not content.endswith("\n"):
             content += "\n"
 
-        file_mode = "w" if mode.lower() == "overwrite" else "a"
-        with p.open(file_mode, encoding="utf-8") as file:
-            file.write(content)
+        cache = get_file_cache(app_config.file_cache_mb)
+        if mode.lower() == "overwrite":
+            cache.write(p, split_lines(content))
+        else:
+            with p.open("a", encoding="utf-8") as file:
+                file.write(content)
+            cache.discard(p)
 
         if p.exists():
             return (
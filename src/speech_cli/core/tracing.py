@@ -0,0 +1,259 @@
+# ruff: noqa: ARG002
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langgraph.errors import GraphBubbleUp
+
+from speech_cli.core.workdir import START_DIRECTORY
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from uuid import UUID
+
+    from langchain_core.outputs import LLMResult
+
+logger = logging.getLogger(__name__)
+
+TRACES_FILE = START_DIRECTORY / ".speech" / "traces.jsonl"
+
+
+@dataclass
+class Span:
+    """A timed operation of a build: a graph run, a node, an llm call or a tool."""
+
+    trace_id: str
+    """The build's checkpoint thread id, shared by its runs across interrupts."""
+
+    name: str
+    kind: str
+    """`run`, `node`, `llm` or `tool`."""
+
+    parent_id: str | None = None
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    start: float = field(default_factory=time.time)
+    """The start time, as a unix timestamp."""
+
+    duration: float = 0.0
+    """The duration, in seconds."""
+
+    status: str = "ok"
+    """`ok`, `error`, or `interrupted` when waiting on a human."""
+
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+class TraceExporter:
+    """Append finished spans to a JSONL file, a span per line.
+
+    The file is rotated once, to `<name>.1`, when it outgrows `max_bytes` on open.
+
+    Args:
+        path (Path): The traces file.
+        max_bytes (int): The size the file is rotated at.
+
+    """
+
+    def __init__(self, path: Path, max_bytes: int):
+        self.path = path
+        self._lock = threading.Lock()
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size > max_bytes:
+            path.replace(path.with_suffix(path.suffix + ".1"))
+
+    def export(self, span: Span):
+        """Write a finished span."""
+        line = json.dumps(asdict(span), separators=(",", ":"), default=str)
+        with self._lock, self.path.open("a", encoding="utf-8") as file:
+            file.write(line + "\n")
+
+
+_registry: dict[Path, TraceExporter] = {}
+
+
+def get_trace_exporter(max_mb: int, path: Path = TRACES_FILE) -> TraceExporter:
+    """Return the shared exporter of a traces file."""
+    if path not in _registry:
+        _registry[path] = TraceExporter(path, max_mb * 1024 * 1024)
+
+    return _registry[path]
+
+
+class TraceHandler(BaseCallbackHandler):
+    """Trace a graph run into spans, from its LangChain callbacks.
+
+    The callbacks of the graph config reach every node, subgraph, llm call and tool
+    of the run, so they're traced without instrumenting each one. A span records
+    the graph run, every graph node, every chat model call, with its time to first
+    token and token usage, and every tool call, with the bytes in and out. Other
+    runnables, e.g. the chains within a node, are skipped, and their children are
+    parented to the closest traced ancestor.
+
+    Args:
+        trace_id (str): The trace id of the spans, the build's thread id.
+        exporter (TraceExporter): Where finished spans are written.
+
+    """
+
+    run_inline = True
+
+    def __init__(self, trace_id: str, exporter: TraceExporter):
+        self.trace_id = trace_id
+        self.exporter = exporter
+        self._spans: dict[UUID, tuple[Span, float]] = {}
+        self._parents: dict[UUID, UUID | None] = {}
+        self._lock = threading.Lock()
+
+    def _start(
+        self,
+        run_id: UUID,
+        parent_run_id: UUID | None,
+        name: str,
+        kind: str,
+        **attributes: Any,
+    ):
+        with self._lock:
+            self._parents[run_id] = parent_run_id
+            while parent_run_id is not None and parent_run_id not in self._spans:
+                parent_run_id = self._parents.get(parent_run_id)
+
+            parent = self._spans.get(parent_run_id)
+            span = Span(
+                self.trace_id,
+                name,
+                kind,
+                parent_id=parent[0].span_id if parent else None,
+                attributes=attributes,
+            )
+            self._spans[run_id] = (span, time.monotonic())
+
+    def _end(self, run_id: UUID, error: BaseException | None = None) -> Span | None:
+        with self._lock:
+            self._parents.pop(run_id, None)
+            span, start = self._spans.pop(run_id, (None, 0.0))
+        if span is None:
+            return None
+
+        span.duration = round(time.monotonic() - start, 6)
+        if isinstance(error, GraphBubbleUp):
+            span.status = "interrupted"
+        elif error is not None:
+            span.status = "error"
+            span.attributes["error"] = repr(error)
+        return span
+
+    def _export(self, span: Span | None):
+        if span is not None:
+            self.exporter.export(span)
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any],
+        inputs: dict[str, Any],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ):
+        """Start a span for the graph run, or for a graph node."""
+        name = kwargs.get("name")
+        if parent_run_id is None:
+            self._start(run_id, None, "run", "run")
+        elif name and name == (metadata or {}).get("langgraph_node"):
+            self._start(run_id, parent_run_id, name, "node")
+        else:
+            with self._lock:
+                self._parents[run_id] = parent_run_id
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any):
+        """End a graph run or node span."""
+        self._export(self._end(run_id))
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """End a graph run or node span, as failed or interrupted."""
+        self._export(self._end(run_id, error))
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ):
+        """Start an llm call span."""
+        metadata = metadata or {}
+        self._start(
+            run_id,
+            parent_run_id,
+            metadata.get("agent", "llm"),
+            "llm",
+            model=metadata.get("ls_model_name"),
+            route=metadata.get("route"),
+            step=metadata.get("step"),
+            messages=len(messages[0]) if messages else 0,
+        )
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any):
+        """Record the time to first token of an llm call."""
+        with self._lock:
+            span, start = self._spans.get(run_id, (None, 0.0))
+        if span is not None and "ttft" not in span.attributes:
+            span.attributes["ttft"] = round(time.monotonic() - start, 6)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        """End an llm call span, with its token usage."""
+        span = self._end(run_id)
+        if span is None:
+            return
+
+        message = getattr(response.generations[0][0], "message", None)
+        usage = getattr(message, "usage_metadata", None) or {}
+        span.attributes.update(
+            input_tokens=usage.get("input_tokens", 0),
+            output_tokens=usage.get("output_tokens", 0),
+            cached_tokens=(usage.get("input_token_details") or {}).get("cache_read", 0),
+        )
+        self._export(span)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """End an llm call span, as failed."""
+        self._export(self._end(run_id, error))
+
+    def on_tool_start(
+        self,
+        serialized: dict[str, Any],
+        input_str: str,
+        *,
+        run_id: UUID,
+        parent_run_id: UUID | None = None,
+        **kwargs: Any,
+    ):
+        """Start a tool call span."""
+        name = kwargs.get("name") or serialized.get("name", "tool")
+        self._start(
+            run_id, parent_run_id, name, "tool", bytes_in=len(input_str.encode())
+        )
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any):
+        """End a tool call span, with the size of its output."""
+        span = self._end(run_id)
+        if span is not None:
+            content = getattr(output, "content", output)
+            span.attributes["bytes_out"] = len(str(content).encode())
+            self._export(span)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        """End a tool call span, as failed or interrupted."""
+        self._export(self._end(run_id, error))
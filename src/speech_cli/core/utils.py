@@ -6,9 +6,10 @@ import platform
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-import requests
 from langchain_core.prompts import ChatPromptTemplate
 
+from speech_cli.core.workdir import project_root
+
 if TYPE_CHECKING:
     from typing import Any
 
@@ -62,26 +63,20 @@ def get_system_info():
     return markdown
 
 
+def hlc_file() -> Path:
+    """Return the HLC.json file of the project.
+
+    It lives in the project root, like the .speech directory, so agents changing
+    the working directory still share it.
+    """
+    return project_root() / "HLC.json"
+
+
 def read_hlc_file():
     """Read the HLC.json file."""
-    file = Path.cwd() / "HLC.json"
-
+    file = hlc_file()
     if file.exists():
         with file.open(encoding="utf-8") as f:
             content = f.read()
 
         return content
-
-
-def connected_to_internet() -> bool:
-    """Check if user has internet connectivity."""
-    url = "https://google.com"
-    status_code = 200
-
-    try:
-        response = requests.get(url, timeout=15)
-        logger.debug("The response: %r", response)
-        return response.status_code == status_code
-    except Exception as _err:
-        logger.debug("The response: %r", _err)
-        return False
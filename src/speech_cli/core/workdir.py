@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+# The directory speech was started from, the project root outside of a workspace.
+START_DIRECTORY = Path.cwd()
+
+
+class Workspace:
+    """The project directory of a build, and the build's current directory.
+
+    Builds running concurrently in the same process can't share the process working
+    directory, so each one runs in its own workspace. Tasks and tool threads copy
+    the context, and share the workspace object itself, so changing directory in
+    a tool is seen by the rest of the build.
+
+    Args:
+        root (Path): The project directory.
+
+    """
+
+    def __init__(self, root: Path):
+        self.root = root.resolve()
+        self.path = self.root
+
+
+_workspace: ContextVar[Workspace | None] = ContextVar("workspace", default=None)
+
+
+@contextlib.contextmanager
+def workspace(root: Path | Workspace) -> Iterator[Workspace]:
+    """Run the enclosed code, and the tasks it starts, in a workspace.
+
+    A workspace object is entered as is, so its current directory is kept from one
+    run to the next, e.g. across the turns of a chat session.
+    """
+    token = _workspace.set(root if isinstance(root, Workspace) else Workspace(root))
+    try:
+        yield _workspace.get()
+    finally:
+        _workspace.reset(token)
+
+
+def current_workspace() -> Workspace | None:
+    """Return the workspace of the running build, if it runs in one."""
+    return _workspace.get()
+
+
+def project_root() -> Path:
+    """Return the project directory, storing the HLC and the build manifest."""
+    current = _workspace.get()
+    return current.root if current else START_DIRECTORY
+
+
+def current_directory() -> Path:
+    """Return the current directory of the build, or of the process."""
+    current = _workspace.get()
+    return current.path if current else Path.cwd()
+
+
+def resolve_path(path: str | Path) -> Path:
+    """Resolve a path against the current directory."""
+    path = Path(path).expanduser()
+    return path if path.is_absolute() else current_directory() / path
+
+
+def change_directory(path: str | Path) -> Path:
+    """Change the current directory of the build, or of the process.
+
+    Raises:
+        FileNotFoundError: If the directory doesn't exist.
+        NotADirectoryError: If the path isn't a directory.
+
+    """
+    directory = resolve_path(path).resolve(strict=True)
+    if not directory.is_dir():
+        raise NotADirectoryError(f"'{path}' is not a directory.")
+
+    if current := _workspace.get():
+        current.path = directory
+    else:
+        os.chdir(directory)
+    return directory
@@ -0,0 +1,23 @@
+import asyncio
+
+import pytest
+from fake_provider import FakeClock
+
+from speech_cli.core import retry
+from speech_cli.core.workdir import workspace
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Run the retry scheduler and its buckets on a clock moved by their sleeps."""
+    clock = FakeClock()
+    monkeypatch.setattr(retry, "time", clock)
+    monkeypatch.setattr(asyncio, "sleep", clock.sleep)
+    return clock
+
+
+@pytest.fixture
+def project(tmp_path):
+    """Run the tools in the workspace of an empty project."""
+    with workspace(tmp_path):
+        yield tmp_path
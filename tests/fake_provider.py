@@ -0,0 +1,74 @@
+"""A local fake llm provider, failing the way real providers do."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class ProviderError(Exception):
+    """An http error answered by the provider, like the provider SDKs raise."""
+
+    def __init__(self, status_code: int, headers: dict[str, str] | None = None):
+        super().__init__(f"{status_code} error from the fake provider")
+        self.status_code = status_code
+        self.response = SimpleNamespace(status_code=status_code, headers=headers or {})
+
+
+class RateLimitError(ProviderError):
+    """A 429 answer, optionally with the `Retry-After` seconds to wait."""
+
+    def __init__(self, retry_after: float | None = None):
+        headers = {} if retry_after is None else {"retry-after": str(retry_after)}
+        super().__init__(429, headers)
+
+
+class FakeProvider(BaseChatModel):
+    """A chat model answering every call with the next outcome of its script.
+
+    An outcome is either the text of the reply, or the error to raise, e.g. a
+    `RateLimitError` or a `TimeoutError`.
+    """
+
+    script: list[Any]
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-provider"
+
+    def _generate(self, *args, **kwargs) -> ChatResult:  # noqa: ARG002
+        self.calls += 1
+        outcome = self.script.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(outcome))])
+
+
+class FakeClock:
+    """A monotonic clock, moved forward by the sleeps instead of waiting them."""
+
+    def __init__(self):
+        self.now = 1_000.0
+        self.sleeps: list[float] = []
+        self._sleep = asyncio.sleep
+
+    def monotonic(self) -> float:
+        """Return the time, in seconds, slept so far."""
+        return self.now
+
+    def time(self) -> float:
+        """Return the wall clock time, for the `Retry-After` dates."""
+        return time.time()
+
+    async def sleep(self, delay: float):
+        """Move the clock forward by `delay`, only yielding to the event loop."""
+        self.sleeps.append(delay)
+        self.now += delay
+        await self._sleep(0)
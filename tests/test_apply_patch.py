@@ -0,0 +1,96 @@
+from pathlib import Path
+
+from speech_cli.core.tools import apply_patch
+
+
+def _names(directory: Path) -> list[str]:
+    return sorted(path.name for path in directory.iterdir())
+
+
+def _lines(count: int) -> str:
+    return "".join(f"line{number}\n" for number in range(1, count + 1))
+
+
+def test_hunks_apply_at_their_lines_despite_stale_numbers(project):
+    (project / "a.py").write_text(_lines(20))
+    patch = (
+        "--- a/a.py\n+++ b/a.py\n"
+        "@@ -1,3 +1,3 @@\n line3\n-line4\n+LINE4\n line5\n"
+        "@@ -15,3 +15,4 @@\n line17\n+inserted\n line18\n"
+    )
+
+    assert apply_patch(patch)[0]
+    lines = (project / "a.py").read_text().splitlines()
+    assert lines[2:5] == ["line3", "LINE4", "line5"]
+    assert lines[16:19] == ["line17", "inserted", "line18"]
+
+
+def test_sections_on_the_same_file_apply_in_turn(project):
+    (project / "a.py").write_bytes(b"one\r\ntwo\r\nthree\r\n")
+    patch = (
+        "--- a/a.py\n+++ b/a.py\n@@ -1 +1 @@\n-one\n+ONE\n"
+        "--- a/a.py\n+++ b/a.py\n@@ -2 +2 @@\n-two\n+TWO\n"
+    )
+
+    assert apply_patch(patch)[0]
+    # The line endings of the file are kept.
+    assert (project / "a.py").read_bytes() == b"ONE\r\nTWO\r\nthree\r\n"
+    assert _names(project) == ["a.py"]
+
+
+def test_file_created_then_deleted_by_the_same_patch(project):
+    patch = (
+        "--- /dev/null\n+++ b/c.py\n@@ -0,0 +1 @@\n+c\n"
+        "--- a/c.py\n+++ /dev/null\n@@ -1 +0,0 @@\n-c\n"
+    )
+
+    assert apply_patch(patch)[0]
+    assert _names(project) == []
+
+
+def test_ambiguous_search_block_changes_nothing(project):
+    (project / "a.py").write_text("x = 1\nx = 1\n")
+    patch = "a.py\n<<<<<<< SEARCH\nx = 1\n=======\nx = 2\n>>>>>>> REPLACE\n"
+
+    success, message = apply_patch(patch)
+    assert not success
+    assert "match 2 places" in message
+    assert (project / "a.py").read_text() == "x = 1\nx = 1\n"
+
+
+def test_no_file_is_changed_when_a_hunk_does_not_apply(project):
+    (project / "a.py").write_text(_lines(3))
+    patch = (
+        "a.py\n<<<<<<< SEARCH\nline1\n=======\nONE\n>>>>>>> REPLACE\n"
+        "a.py\n<<<<<<< SEARCH\nmissing\n=======\nx\n>>>>>>> REPLACE\n"
+    )
+
+    assert not apply_patch(patch)[0]
+    assert (project / "a.py").read_text() == _lines(3)
+
+
+def test_written_files_are_restored_when_a_rename_fails(project, monkeypatch):
+    (project / "a.py").write_text("a\n")
+    (project / "b.py").write_text("b\n")
+    patch = (
+        "--- a/a.py\n+++ b/a.py\n@@ -1 +1 @@\n-a\n+A\n"
+        "--- a/b.py\n+++ b/b.py\n@@ -1 +1 @@\n-b\n+B\n"
+    )
+    replace = Path.replace
+
+    def failing_replace(path, target):
+        if Path(target).name == "b.py":
+            raise PermissionError(13, "Permission denied", str(target))
+        return replace(path, target)
+
+    monkeypatch.setattr(Path, "replace", failing_replace)
+    success, message = apply_patch(patch)
+    monkeypatch.undo()
+
+    assert not success
+    assert "No permission" in message
+
+    assert (project / "a.py").read_text() == "a\n"
+    assert (project / "b.py").read_text() == "b\n"
+    # Without the staged files left behind.
+    assert _names(project) == ["a.py", "b.py"]
@@ -0,0 +1,39 @@
+from langgraph.checkpoint.base import empty_checkpoint
+
+from speech_cli.core.checkpoint import SQLiteSaver
+
+
+def _put_messages(saver, messages, version):
+    checkpoint = empty_checkpoint()
+    checkpoint["channel_values"] = {"messages": messages}
+    checkpoint["channel_versions"] = {"messages": version}
+    config = {"configurable": {"thread_id": "t", "checkpoint_ns": ""}}
+    return saver.put(config, checkpoint, {}, {"messages": version})
+
+
+def test_grown_list_channel_is_stored_as_delta_and_restored(tmp_path):
+    saver = SQLiteSaver(tmp_path / "checkpoints.db")
+    _put_messages(saver, ["a"], "1")
+    config = _put_messages(saver, ["a", "b", "c"], "2")
+
+    base_version = saver._conn.execute(
+        "SELECT base_version FROM blobs WHERE version = '2'"
+    ).fetchone()[0]
+    assert base_version == "1"
+    assert saver.get_tuple(config).checkpoint["channel_values"]["messages"] == [
+        "a",
+        "b",
+        "c",
+    ]
+    saver.close()
+
+
+def test_delta_without_its_base_is_a_miss(tmp_path):
+    saver = SQLiteSaver(tmp_path / "checkpoints.db")
+    _put_messages(saver, ["a"], "1")
+    config = _put_messages(saver, ["a", "b"], "2")
+    saver._conn.execute("DELETE FROM blobs WHERE version = '1'")
+
+    # Never the delta alone, as if it were the whole history.
+    assert "messages" not in saver.get_tuple(config).checkpoint["channel_values"]
+    saver.close()
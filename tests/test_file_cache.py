@@ -0,0 +1,19 @@
+from speech_cli.core.file_cache import split_lines
+from speech_cli.core.tools import delete_file_content, read_file, update_file_content
+
+
+def test_lines_keep_their_endings():
+    assert split_lines("a\r\nb\fc\rd\ne") == ["a\r\n", "b\fc\rd\n", "e"]
+    assert split_lines("a\n") == ["a\n"]
+    assert split_lines("") == []
+
+
+def test_edits_through_the_cache_keep_crlf_line_endings(project):
+    path = project / "w.txt"
+    path.write_bytes(b"a\r\nb\r\nc\r\n")
+
+    assert read_file("w.txt") == (True, "a\r\nb\r\nc\r\n")
+    assert update_file_content("w.txt", "B", row=1, substring="b")[0]
+    assert delete_file_content("w.txt", row=0)[0]
+    assert path.read_bytes() == b"B\r\nc\r\n"
+    assert read_file("w.txt") == (True, "B\r\nc\r\n")
@@ -0,0 +1,13 @@
+import pytest
+
+from speech_cli.core.tools import _read_file, read_file
+
+
+@pytest.mark.parametrize("large", [False, True])
+def test_rows_are_split_at_line_feeds_only(project, monkeypatch, large):
+    if large:
+        # Read through the line index, like the files over the size threshold.
+        monkeypatch.setattr(_read_file, "_LARGE_FILE", 0)
+    (project / "s.txt").write_bytes(b"a\fb\nc\rd\ne\n")
+
+    assert read_file("s.txt", 1, 2) == (True, "Line 1: c\rd\nLine 2: e\n")
@@ -0,0 +1,56 @@
+from speech_cli.config import app_config
+from speech_cli.core.tools import read_files
+
+
+def _project(project):
+    (project / "src" / "pkg").mkdir(parents=True)
+    (project / "src" / "a.py").write_text("".join(f"a{i}\n" for i in range(10)))
+    (project / "src" / "pkg" / "b.py").write_text("b\n")
+    (project / "README.md").write_text("readme\n")
+
+
+def test_files_ranges_and_errors_are_read_in_order(project):
+    _project(project)
+
+    assert read_files(["README.md", "src/a.py:2-4", "missing.txt"]) == (
+        True,
+        (
+            "=== README.md ===\nreadme\n\n"
+            "=== src/a.py:2-4 ===\nLine 2: a2\nLine 3: a3\nLine 4: a4\n\n"
+            "=== missing.txt ===\nError: File 'missing.txt' does not exist.\n"
+        ),
+    )
+
+
+def test_budget_counts_the_headers_and_notes(project):
+    _project(project)
+    (project / "src" / "a.py").write_text("".join(f"a{i}\n" for i in range(100)))
+
+    success, output = read_files(["src/a.py", "src/pkg/b.py", "README.md"], 250)
+    assert success
+    assert len(output) <= 250
+    lines = output.splitlines()
+    assert lines[0] == "=== src/a.py ==="
+    # The cut file is read on from its first left out line.
+    assert lines[-3] == (
+        f"[... cut to the budget, read on with read_file('src/a.py',"
+        f" start_row={len(lines) - 4}) ...]"
+    )
+    assert lines[-1] == "[... over the budget, not read: src/pkg/b.py, README.md ...]"
+
+
+def test_files_over_the_budget_are_left_out_whole(project):
+    _project(project)
+
+    success, output = read_files(["src/a.py", "README.md"], 60)
+    assert success
+    assert output == "[... over the budget, not read: src/a.py, README.md ...]"
+
+
+def test_output_stays_under_the_tool_output_limit(project):
+    _project(project)
+    for number in range(200):
+        (project / "src" / "pkg" / f"m{number:03}.py").write_text("m\n" * 200)
+
+    _success, output = read_files(["src/**/*.py"], max_chars=10**9)
+    assert len(output) <= app_config.tool_output_max_chars
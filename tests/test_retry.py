@@ -0,0 +1,129 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime
+
+import pytest
+from fake_provider import FakeProvider, ProviderError, RateLimitError
+
+from speech_cli.core.health import ProviderHealth
+from speech_cli.core.retry import (
+    ErrorKind,
+    RetryPolicy,
+    RetryScheduler,
+    classify_error,
+    get_retry_scheduler,
+    retry_after,
+)
+
+
+def _scheduler(**policy) -> RetryScheduler:
+    # No host, so the connectivity probe never leaves the machine.
+    return RetryScheduler(ProviderHealth("fake"), policy=RetryPolicy(**policy))
+
+
+def _run(scheduler: RetryScheduler, provider: FakeProvider):
+    return asyncio.run(scheduler.call(lambda: provider.ainvoke("hi")))
+
+
+class ResourceExhausted(Exception):  # noqa: N818
+    """Named like the Gemini SDK's rate limit error, without a status code."""
+
+
+@pytest.mark.parametrize(
+    ("err", "kind"),
+    [
+        (RateLimitError(), ErrorKind.RATE_LIMITED),
+        (ResourceExhausted(), ErrorKind.RATE_LIMITED),
+        (TimeoutError(), ErrorKind.RETRYABLE),
+        (ConnectionError(), ErrorKind.RETRYABLE),
+        (ProviderError(408), ErrorKind.RETRYABLE),
+        (ProviderError(503), ErrorKind.RETRYABLE),
+        (ProviderError(400), ErrorKind.FATAL),
+        (ProviderError(401), ErrorKind.FATAL),
+        (ValueError(), ErrorKind.FATAL),
+    ],
+)
+def test_classify_error(err, kind):
+    assert classify_error(err) is kind
+
+
+def test_retry_after_headers():
+    in_30s = format_datetime(datetime.now(UTC) + timedelta(seconds=30), usegmt=True)
+
+    assert retry_after(RateLimitError(7)) == 7.0
+    assert retry_after(ProviderError(429, {"retry-after-ms": "1500"})) == 1.5
+    assert 28 < retry_after(ProviderError(429, {"retry-after": in_30s})) <= 30
+    assert retry_after(ProviderError(429, {"retry-after": "soon"})) is None
+    assert retry_after(RateLimitError()) is None
+    assert retry_after(TimeoutError()) is None
+
+
+def test_backoff_is_jittered_under_its_exponential_ceiling():
+    policy = RetryPolicy(base_delay=1.0, max_delay=10.0)
+    for attempt in range(1, 8):
+        ceiling = min(10.0, 2.0 ** (attempt - 1))
+        delays = [policy.backoff(attempt) for _ in range(200)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        # Full jitter spreads the retries of concurrent callers.
+        assert len(set(delays)) > 1
+
+
+def test_rate_limited_call_honors_retry_after(fake_clock):
+    provider = FakeProvider(script=[RateLimitError(7), RateLimitError(), "ok"])
+    scheduler = _scheduler(base_delay=0.5)
+
+    assert _run(scheduler, provider).content == "ok"
+    assert provider.calls == 3
+    # The requested delay, over the backoff, then the backoff without the header.
+    assert len(fake_clock.sleeps) == 2
+    assert fake_clock.sleeps[0] == 7.0
+    assert fake_clock.sleeps[1] <= 1.0
+
+
+def test_timeouts_are_retried_with_backoff(fake_clock):
+    provider = FakeProvider(script=[TimeoutError(), TimeoutError(), "ok"])
+
+    assert _run(_scheduler(base_delay=0.5), provider).content == "ok"
+    assert provider.calls == 3
+    assert len(fake_clock.sleeps) == 2
+    assert fake_clock.sleeps[0] <= 0.5
+    assert fake_clock.sleeps[1] <= 1.0
+
+
+def test_fatal_errors_are_not_retried(fake_clock):
+    provider = FakeProvider(script=[ProviderError(400), "ok"])
+
+    with pytest.raises(ProviderError):
+        _run(_scheduler(), provider)
+    assert provider.calls == 1
+    assert fake_clock.sleeps == []
+
+
+@pytest.mark.usefixtures("fake_clock")
+def test_retries_stop_after_max_attempts():
+    provider = FakeProvider(script=[RateLimitError(1), RateLimitError(1), "ok"])
+
+    with pytest.raises(RateLimitError):
+        _run(_scheduler(max_attempts=2), provider)
+    assert provider.calls == 2
+
+
+def test_models_of_a_provider_share_its_token_buckets(fake_clock):
+    health = ProviderHealth("fake")
+    scheduler = get_retry_scheduler(health, {"requests_per_minute": 60})
+    bucket = scheduler.limiter.requests
+
+    assert get_retry_scheduler(health, {"requests_per_minute": 120}) is scheduler
+    # Reconfigured in place, so the waiting calls keep their place in line.
+    assert scheduler.limiter.requests is bucket
+    assert bucket.rate == 2
+
+    async def calls():
+        provider = FakeProvider(script=["ok"] * 150)
+        await asyncio.gather(
+            *(scheduler.call(lambda: provider.ainvoke("hi")) for _ in range(150))
+        )
+
+    asyncio.run(calls())
+    # The 60 tokens left in the bucket, then 90 more calls at 2 per second.
+    assert 44 < sum(fake_clock.sleeps) < 46
@@ -0,0 +1,17 @@
+from speech_cli.core.tools import get_command_history, terminal_use
+from speech_cli.core.workdir import workspace
+
+
+def test_command_history_is_kept_per_workspace(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    with workspace(tmp_path / "a"):
+        assert terminal_use("echo a") == (True, "a\n")
+    with workspace(tmp_path / "b") as other:
+        assert get_command_history() == (True, "No command execution history.")
+        terminal_use("echo b")
+    with workspace(other):
+        _success, history = get_command_history()
+
+    assert "echo b" in history
+    assert "echo a" not in history